@@ -0,0 +1,232 @@
+# Offline scale benchmark of the scheduler, listing commands, tips and storage:
+#     python bot/benchmark.py --guilds 10000 --events 200 --out bench.json
+# Synthetic guilds, events, tips and user timezones are generated from --seed into a
+# scratch data directory, and the cogs are driven with stub bots, channels and
+# contexts, so no token or Discord connection is needed. Results are written as
+# JSON (seconds per run, plus per-operation medians) to compare between releases.
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import argparse
+import asyncio
+import calendar
+import datetime
+import json
+import logging
+import random
+import shutil
+import statistics
+import time
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the bot's hot paths against synthetic state.")
+    parser.add_argument("--guilds", type=int, default=1000, help="guilds to generate (production scale: 10000)")
+    parser.add_argument("--events", type=int, default=200, help="events per guild")
+    parser.add_argument("--tips", type=int, default=20, help="tips per guild")
+    parser.add_argument("--users", type=int, default=1000, help="users issuing commands; half have a timezone")
+    parser.add_argument("--backend", choices=("json", "sqlite"), default="json")
+    parser.add_argument("--cache-size", type=int, default=256, help="GUILD_CACHE_SIZE for the cogs")
+    parser.add_argument("--samples", type=int, default=200, help="guilds sampled per command benchmark")
+    parser.add_argument("--ticks", type=int, default=20, help="scheduler ticks to time")
+    parser.add_argument("--due-guilds", type=int, default=200, help="guilds due in each tick")
+    parser.add_argument("--due-events", type=int, default=3, help="events fired per due guild")
+    parser.add_argument("--roundtrips", type=int, default=3, help="save_all/load_all_events round-trips")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    parser.add_argument("--keep-data", action="store_true", help="keep the scratch data directory")
+    return parser.parse_args()
+
+# ─── Scratch Environment ─────────────────────────────────────────────────────
+ARGS = parse_args()
+if ARGS.out:
+    ARGS.out = os.path.abspath(ARGS.out)
+START_DIR = os.getcwd()
+
+from bot.utils.synthetic import (
+    use_scratch_environment, StubBot, StubContext, guild_ids, generate_state, run_metadata, FIRST_USER_ID,
+)
+SCRATCH_DIR = use_scratch_environment(ARGS.backend, ARGS.cache_size)
+
+import pytz
+from bot.utils.helpers import next_event_datetime, parse_duration_string
+from bot.utils.storage import load_guild_events, load_all_events, save_all_events, save_event, get_guild_events
+from bot.utils.persistence import flush_all
+from bot.cogs.events import EventsCog
+from bot.cogs.tips import TipsCog
+
+# Only failures are worth seeing; the cogs log every fire and save at INFO
+logging.disable(logging.WARNING)
+
+results = {}
+
+# ─── Measurement ─────────────────────────────────────────────────────────────
+def record(name, samples, ops=1, **extra):
+    """Summarise per-run wall times (seconds); `ops` is how many operations each run covered."""
+    samples = sorted(samples)
+    median = statistics.median(samples)
+    results[name] = {
+        "runs": len(samples),
+        "ops_per_run": ops,
+        "min": samples[0],
+        "median": median,
+        "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "max": samples[-1],
+        "mean": statistics.fmean(samples),
+        "per_op_median": median / ops,
+        **extra,
+    }
+    print(f"{name:<34} median {median * 1000:10.3f} ms  ({median / ops * 1e6:10.2f} µs/op)", file=sys.stderr)
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+async def timed_async(coro):
+    started = time.perf_counter()
+    await coro
+    return time.perf_counter() - started
+
+# ─── Benchmarks ──────────────────────────────────────────────────────────────
+def arm_due_events(cog, gids, now_ts):
+    """Move a few weekly events of each guild to the current minute so the next tick fires them."""
+    for gid in gids:
+        events = get_guild_events(cog.all_events, gid)
+        server_now = datetime.datetime.fromtimestamp(now_ts, pytz.utc) + datetime.timedelta(
+            minutes=cog.config.server_offset(gid))
+        for e in list(events.weekly[:ARGS.due_events]):
+            events.set_weekly(e, calendar.day_name[server_now.weekday()], server_now.hour, server_now.minute)
+            e.last_fired = None
+            save_event(cog.all_events, gid, e)
+        cog.queue.schedule(gid, now_ts)
+
+async def bench_scheduler(bot, cog, rng, gids):
+    ticks, drains, flushes = [], [], []
+    fired = 0
+    for _ in range(ARGS.ticks):
+        arm_due_events(cog, rng.sample(gids, min(ARGS.due_guilds, len(gids))), time.time())
+        await flush_all()
+        embeds = bot.embeds
+        ticks.append(await timed_async(cog.check_events()))
+        drains.append(await timed_async(cog.announcer.drain()))
+        flushes.append(await timed_async(flush_all()))
+        fired += bot.embeds - embeds
+    due = min(ARGS.due_guilds, len(gids))
+    record("scheduler.check_events_tick", ticks, ops=due, fired_per_tick=fired / ARGS.ticks)
+    record("scheduler.announce_drain", drains, ops=due)
+    record("storage.flush_after_tick", flushes, ops=due)
+
+async def bench_commands(events_cog, tips_cog, rng, gids):
+    sample = rng.sample(gids, min(ARGS.samples, len(gids)))
+    users = [FIRST_USER_ID + rng.randrange(ARGS.users) for _ in sample]
+    record("storage.load_guild_events", [timed(load_guild_events, gid) for gid in sample])
+
+    commands = {
+        "command.listevents": (events_cog, events_cog.listevents),
+        "command.todaysevents": (events_cog, events_cog.todaysevents),
+        "command.nextevent": (events_cog, events_cog.nextevent),
+        "command.listalltips": (tips_cog, tips_cog.listalltips),
+    }
+    for name, (cog, command) in commands.items():
+        samples = []
+        for gid, user_id in zip(sample, users):
+            # Page the guild in first so only the rendering is timed
+            get_guild_events(events_cog.all_events, gid)
+            tips_cog.all_tips[gid]
+            samples.append(await timed_async(command.callback(cog, StubContext(int(gid), user_id))))
+        record(name, samples)
+
+    now_ts = time.time()
+    samples = []
+    for gid in sample:
+        tips_cog.all_tips[gid]
+        samples.append(timed(tips_cog.deliver, gid, now_ts))
+    record("tips.deliver", samples)
+    await tips_cog.announcer.drain()
+    await flush_all()
+
+def bench_helpers(events_cog, rng, gids):
+    events = list(get_guild_events(events_cog.all_events, rng.choice(gids)).weekly)
+    server_now = datetime.datetime.now(pytz.utc)
+    record("helpers.next_event_datetime",
+           [timed(lambda: [next_event_datetime(e, server_now) for e in events]) for _ in range(20)],
+           ops=len(events))
+
+    durations = [f"{rng.randrange(30)}d {rng.randrange(24):02d}:{rng.randrange(60):02d}" for _ in range(1000)]
+    record("helpers.parse_duration_string",
+           [timed(lambda: [parse_duration_string(d) for d in durations]) for _ in range(20)],
+           ops=len(durations))
+
+async def bench_roundtrip(expected: int):
+    loads, saves = [], []
+    for _ in range(ARGS.roundtrips):
+        started = time.perf_counter()
+        events = load_all_events()
+        loads.append(time.perf_counter() - started)
+        loaded = sum(map(len, events.values()))
+        if loaded != expected:
+            raise RuntimeError(f"round-trip loaded {loaded} events, expected {expected}")
+
+        started = time.perf_counter()
+        save_all_events(events)
+        await flush_all()
+        saves.append(time.perf_counter() - started)
+    record("storage.load_all_events", loads, ops=expected)
+    record("storage.save_all_events", saves, ops=expected)
+
+async def run(rng, counts):
+    bot = StubBot()
+    gids = guild_ids(ARGS.guilds)
+
+    started = time.perf_counter()
+    events_cog = EventsCog(bot)  # builds the due index, paging in every guild once
+    record("startup.events_cog", [time.perf_counter() - started], ops=len(gids))
+    started = time.perf_counter()
+    tips_cog = TipsCog(bot)
+    record("startup.tips_cog", [time.perf_counter() - started], ops=len(gids))
+
+    try:
+        await bench_scheduler(bot, events_cog, rng, gids)
+        await bench_commands(events_cog, tips_cog, rng, gids)
+        bench_helpers(events_cog, rng, gids)
+        await bench_roundtrip(counts["events"])
+    finally:
+        events_cog.cog_unload()
+        tips_cog.cog_unload()
+        await bot.announcer.drain()
+        await flush_all()
+
+# ─── Entry ───────────────────────────────────────────────────────────────────
+def main():
+    random.seed(ARGS.seed)  # tip rotations shuffle with the module-level generator
+    rng = random.Random(ARGS.seed)
+    try:
+        started = time.perf_counter()
+        _, events, tips = generate_state(rng, ARGS.guilds, ARGS.events, ARGS.tips, ARGS.users, time.time())
+        counts = {"events": sum(map(len, events.values())), "tips": sum(map(len, tips.values()))}
+        del events, tips  # the cogs page guilds back in from storage, as in production
+        record("setup.generate_state", [time.perf_counter() - started], ops=counts["events"])
+        asyncio.run(run(rng, counts))
+    finally:
+        os.chdir(START_DIR)
+        if ARGS.keep_data:
+            print(f"Scratch data kept in {SCRATCH_DIR}", file=sys.stderr)
+        else:
+            shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
+
+    report = {
+        **run_metadata(),
+        "params": {k: v for k, v in vars(ARGS).items() if k not in ("out", "keep_data")},
+        "state": counts,
+        "unit": "seconds",
+        "results": results,
+    }
+    if ARGS.out:
+        with open(ARGS.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# Runs the bot as several worker processes, each owning a contiguous range of shards:
+#     SHARD_COUNT=8 CLUSTER_WORKERS=4 python bot/cluster.py
+# Every worker is a plain bot/main.py with SHARD_IDS set, so it only connects,
+# schedules and caches the guilds on its own shards. The launcher serves PORT;
+# worker i serves its own /metrics and /health on PORT + 1 + i.
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import asyncio
+import signal
+import subprocess
+import time
+
+from keep_alive import keep_alive, PORT
+from bot.config_loader import SHARD_COUNT, CLUSTER_WORKERS
+from bot.utils.storage import prepare_storage
+from bot.logger import setup_logging
+
+logger = setup_logging("cluster")
+
+MAIN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+# Discord allows one IDENTIFY per 5 s, so later workers wait for earlier ones' shards
+IDENTIFY_INTERVAL = 5
+# Pause before restarting a worker that exited
+RESTART_DELAY = 10
+
+# ─── Shard Partitioning ──────────────────────────────────────────────────────
+def shard_ranges(shard_count: int, workers: int) -> list[tuple[int, int]]:
+    """Split shards 0..shard_count-1 into `workers` contiguous, near-equal (first, last) ranges."""
+    workers = max(1, min(workers, shard_count))
+    base, extra = divmod(shard_count, workers)
+    ranges = []
+    first = 0
+    for i in range(workers):
+        size = base + (i < extra)
+        ranges.append((first, first + size - 1))
+        first += size
+    return ranges
+
+# ─── Worker Processes ────────────────────────────────────────────────────────
+def worker_port(index: int) -> int:
+    """Port worker `index` serves /metrics and /health on: the ones after the launcher's PORT."""
+    return PORT + 1 + index
+
+def spawn(shard_count: int, shard_range: tuple[int, int], port: int) -> subprocess.Popen:
+    first, last = shard_range
+    env = dict(os.environ, SHARD_COUNT=str(shard_count), SHARD_IDS=f"{first}-{last}", WORKER_PORT=str(port))
+    logger.info("🚀 Starting worker for shards %s-%s of %s, metrics on port %s", first, last, shard_count, port)
+    return subprocess.Popen([sys.executable, MAIN_PATH], env=env)
+
+def health_check(workers: dict):
+    alive = {f"{first}-{last}": proc.poll() is None for (first, last), proc in workers.items()}
+    return bool(alive) and all(alive.values()), {"workers": alive}
+
+async def supervise():
+    shard_count = SHARD_COUNT or CLUSTER_WORKERS
+    ranges = shard_ranges(shard_count, CLUSTER_WORKERS)
+    prepare_storage()
+
+    workers = {}
+    server = await keep_alive(lambda: health_check(workers))
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(signum, stopping.set)
+        except NotImplementedError:  # Windows
+            signal.signal(signum, lambda *_: loop.call_soon_threadsafe(stopping.set))
+
+    async def pause(seconds) -> bool:
+        """Sleep up to `seconds`; True if a stop was requested meanwhile."""
+        try:
+            await asyncio.wait_for(stopping.wait(), timeout=seconds)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    ports = {shard_range: worker_port(i) for i, shard_range in enumerate(ranges)}
+    for shard_range in ranges:
+        workers[shard_range] = spawn(shard_count, shard_range, ports[shard_range])
+        if await pause(IDENTIFY_INTERVAL * (shard_range[1] - shard_range[0] + 1)):
+            break
+
+    restart_at = {}
+    while not await pause(1):
+        for shard_range, proc in workers.items():
+            if proc.poll() is None:
+                continue
+            if shard_range not in restart_at:
+                logger.error("❌ Worker for shards %s-%s exited (%s)", shard_range[0], shard_range[1], proc.returncode)
+                restart_at[shard_range] = time.monotonic() + RESTART_DELAY
+            elif time.monotonic() >= restart_at[shard_range]:
+                del restart_at[shard_range]
+                workers[shard_range] = spawn(shard_count, shard_range, ports[shard_range])
+
+    logger.info("🛑 Stopping workers")
+    for proc in workers.values():
+        if proc.poll() is None:
+            proc.terminate()
+    for proc in workers.values():
+        await asyncio.to_thread(proc.wait)
+    await server.cleanup()
+
+def main():
+    asyncio.run(supervise())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+﻿import discord
+from discord.ext import commands
+import io
+import time
+
+from bot.utils.helpers import make_embed
+from bot.utils.profiler import profile_loop
+from bot.utils.extensions import setup_cog, cog_extensions, reload_extension, describe, COG_PACKAGE
+from bot.logger import setup_logging
+
+logger = setup_logging("admin")
+
+# Bounds for /profile; longer windows mostly add idle samples
+DEFAULT_PROFILE_SECONDS = 10
+MAX_PROFILE_SECONDS = 60
+
+class AdminCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.profiling = False
+
+    # ─── Command: Profile Event Loop ─────────────────────────────────────────
+    # Owner-only: the profile covers the whole process, every guild included
+    @commands.hybrid_command(name="profile", description="Sample the bot's event loop and upload the profile.")
+    @commands.is_owner()
+    async def profile(self, ctx, seconds: int = DEFAULT_PROFILE_SECONDS):
+        if self.profiling:
+            await ctx.send(embed=make_embed(
+                title="⏳ Already Profiling",
+                description="Wait for the running profile to finish.",
+                color=discord.Color.orange()
+            ))
+            return
+
+        seconds = max(1, min(seconds, MAX_PROFILE_SECONDS))
+        await ctx.defer()
+        logger.info("🔬 Profiling the event loop for %ss for %s (%s)", seconds, ctx.author, ctx.author.id)
+        self.profiling = True
+        try:
+            result = await profile_loop(seconds)
+        finally:
+            self.profiling = False
+
+        top = "\n".join(
+            f"`{n * 100 / result.samples:5.1f}%` {function}" for function, n in result.top_functions(5)
+        ) or "The loop was idle for the whole window."
+        data = io.BytesIO(result.collapsed().encode())
+        await ctx.send(
+            embed=make_embed(
+                title="🔬 Event Loop Profile",
+                description=f"{result.samples} samples over {seconds}s, loop busy {result.busy_ratio:.1%}.",
+                fields=[("Hottest functions", top, False)],
+                footer="Folded stacks: open in speedscope or flamegraph.pl",
+                color=discord.Color.blue()
+            ),
+            file=discord.File(data, filename=f"profile-{int(time.time())}.txt")
+        )
+
+    # ─── Command: Reload Cog ─────────────────────────────────────────────────
+    # Ships a fix to one cog without a restart; schedulers hand their state to the new instance,
+    # and announcements already queued go out from the shared announcer
+    @commands.hybrid_command(name="reload", description="Reload a cog's code, keeping its in-memory state.")
+    @commands.is_owner()
+    async def reload(self, ctx, cog: str):
+        extension = f"{COG_PACKAGE}.{cog.lower().removeprefix(COG_PACKAGE + '.')}"
+        known = cog_extensions()
+        if extension not in known:
+            names = ", ".join(f"`{name.rsplit('.', 1)[1]}`" for name in known)
+            await ctx.send(embed=make_embed(
+                title="❌ Unknown Cog",
+                description=f"Choose one of {names}.",
+                color=discord.Color.red()
+            ))
+            return
+
+        try:
+            times, handed_over = await reload_extension(self.bot, extension)
+        except commands.ExtensionError as e:
+            logger.error("❌ Reload of %s by %s (%s) failed: %s", extension, ctx.author, ctx.author.id, e)
+            await ctx.send(embed=make_embed(
+                title="❌ Reload Failed",
+                description=f"`{extension}` keeps running its previous code, if it was loaded.\n```{e}```",
+                color=discord.Color.red()
+            ))
+            return
+
+        logger.info("♻️ Reloaded %s in %s for %s (%s)", extension, describe(times), ctx.author, ctx.author.id)
+        state = ", ".join(handed_over) if handed_over else "nothing to carry over"
+        await ctx.send(embed=make_embed(
+            title="♻️ Cog Reloaded",
+            description=f"`{extension}` reloaded in {describe(times)}.",
+            fields=[("State handed over", state, False)],
+            footer="Changed slash command options apply after the next command sync",
+            color=discord.Color.green()
+        ))
+
+# ─── Cog Setup ───────────────────────────────────────────────────────────────
+async def setup(bot):
+    await setup_cog(bot, AdminCog)
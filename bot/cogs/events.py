@@ -1,177 +1,435 @@
 ﻿import discord
 from discord.ext import commands, tasks
 import datetime
-import calendar
 import pytz
 import humanize
 import asyncio
+import csv
+import heapq
+import io
+import itertools
+from typing import Literal
 
 from bot.utils.helpers import (
     make_embed,
+    make_choices,
+    get_zone,
+    local_datetimes,
     parse_duration_string,
-    next_event_datetime,
     validate_event_day,
 )
 from bot.utils.storage import (
-    load_all_events,
-    save_all_events,
+    load_guild_events,
+    list_event_guilds,
+    events_pending,
+    save_event,
+    add_events,
+    delete_events,
+    record_fires,
     get_guild_events,
-    cleanup_invalid_event_days,
+    load_due_index,
+    save_due_index,
+    set_guild_due,
 )
-from bot.config_loader import load_config
+from bot.utils.models import Event, DAY_INDEX, MINUTES_PER_DAY, server_week_minute
+from bot.utils.scheduler import DueQueue
+from bot.utils.guild_cache import GuildCache
+from bot.utils.dispatcher import get_announcer
+from bot.utils.clock import get_clock
+from bot.utils.sharding import owns_guild
+from bot.utils.paginator import Paginator, PAGE_SIZE
+from bot.utils.event_files import parse_event_file, export_events, exportable_events
+from bot.utils.metrics import SCHEDULER_TICK_SECONDS, SCHEDULER_LAG_SECONDS, EVENTS_RESIDENT, SCHEDULED_GUILDS
+from bot.config_loader import get_config, GUILD_CACHE_SIZE, FIRE_GRACE
+from bot.utils.extensions import setup_cog, take_over
 from bot.logger import setup_logging
 
 logger = setup_logging("events")
 
+# Longest the scheduler sleeps before re-reading the wall clock
+MAX_SCHEDULER_SLEEP = 300
+# Auto-delete events are removed this long after they fire
+AUTO_DELETE_AFTER = 24 * 60 * 60
+# /importevents limits, and how many row errors its reply lists
+MAX_IMPORT_BYTES = 256 * 1024
+MAX_IMPORT_ROWS = 500
+MAX_REPORTED_ERRORS = 15
+
+# ─── Static Replies ──────────────────────────────────────────────────────────
+# Built once when the cog loads and reused for every reply
+ADDEVENT_USAGE = make_embed(
+    title="❌ Missing Parameters",
+    description="Correct usage: `/addevent Day HH:MM Name|Info [--autodelete]`",
+    color=discord.Color.red()
+)
+INVALID_DAY = make_embed(
+    title="❌ Invalid Day",
+    description="Use a weekday name like `Monday`, `Tuesday`, etc.",
+    color=discord.Color.red()
+)
+INVALID_TIME_FORMAT = make_embed(
+    title="❌ Invalid Time Format",
+    description="Time must be in 24h `HH:MM` format.",
+    color=discord.Color.red()
+)
+MISSING_SEPARATOR = make_embed(
+    title="❌ Missing Separator",
+    description="Use `Name|Info` to separate the event name and its details.",
+    color=discord.Color.red()
+)
+TIME_ALREADY_PASSED = make_embed(
+    title="⚠️ Time Already Passed",
+    description="This time has already passed today.",
+    color=discord.Color.orange()
+)
+COUNTDOWN_USAGE = make_embed(
+    title="❌ Missing Parameters",
+    description="Correct usage: `/schedulecountdown 1d 04:30 Name|Info [--autodelete]` or `DD:HH:MM` format.",
+    color=discord.Color.red()
+)
+INVALID_DURATION_FORMAT = make_embed(
+    title="❌ Invalid Duration Format",
+    description="Use format like `1d 03:30` or `DD:HH:MM`.",
+    color=discord.Color.red()
+)
+COUNTDOWN_MISSING_SEPARATOR = make_embed(
+    title="❌ Missing Separator",
+    description="Use `Name|Info [--autodelete]` format.",
+    color=discord.Color.red()
+)
+COUNTDOWN_IN_PAST = make_embed(
+    title="⚠️ Invalid Countdown Time",
+    description="This countdown would trigger in the past. Use a future duration.",
+    color=discord.Color.orange()
+)
+EDITWEEKLYBYID_USAGE = make_embed(
+    title="❌ Missing Parameters",
+    description="Usage: `/editweeklybyid ID Day HH:MM`",
+    color=discord.Color.red()
+)
+NOT_A_WEEKLY_ID = make_embed(
+    title="❌ Invalid ID",
+    description="That ID does not correspond to a weekly event.",
+    color=discord.Color.red()
+)
+INVALID_TIME_24H = make_embed(
+    title="❌ Invalid Time",
+    description="Time must be in `HH:MM` 24-hour format.",
+    color=discord.Color.red()
+)
+EDITWEEKLYBYNAME_USAGE = make_embed(
+    title="❌ Missing Parameters",
+    description="Usage: `/editweeklybyname EventName HH:MM` or `EventName Day HH:MM`",
+    color=discord.Color.red()
+)
+INVALID_TIME = make_embed(
+    title="❌ Invalid Time",
+    description="Time must be in `HH:MM` format.",
+    color=discord.Color.red()
+)
+EDITCOUNTDOWNBYID_USAGE = make_embed(
+    title="❌ Missing Parameters",
+    description="Usage: `/editcountdownbyid [ID] duration`",
+    color=discord.Color.red()
+)
+NOT_A_COUNTDOWN_ID = make_embed(
+    title="❌ Invalid ID",
+    description="That ID does not correspond to a countdown event.",
+    color=discord.Color.red()
+)
+INVALID_DURATION = make_embed(
+    title="❌ Invalid Duration",
+    description="Use format like `1d 02:30` or `DD:HH:MM`.",
+    color=discord.Color.red()
+)
+EDITCOUNTDOWNBYNAME_USAGE = make_embed(
+    title="❌ Missing Parameters",
+    description="Usage: `/editcountdownbyname EventName duration`",
+    color=discord.Color.red()
+)
+DELETEEVENTBYNAME_USAGE = make_embed(
+    title="❌ Missing Parameter",
+    description="Usage: `/deleteeventbyname Event Name`",
+    color=discord.Color.red()
+)
+DELETEEVENT_USAGE = make_embed(
+    title="❌ Missing Parameter",
+    description="Usage: `/deleteevent [event_id]`",
+    color=discord.Color.red()
+)
+NO_EVENTS_FOUND = make_embed(
+    title="📭 No Events Found",
+    description="No countdown or weekly events scheduled.",
+    color=discord.Color.red()
+)
+NO_EVENTS_TODAY = make_embed(
+    title="📭 No Events Today",
+    color=discord.Color.blue()
+)
+NO_UPCOMING_EVENTS = make_embed(
+    title="📭 No Upcoming Events",
+    color=discord.Color.blue()
+)
+
+# ─── Input Parsing ───────────────────────────────────────────────────────────
+# Shared by the add commands and /importevents, so a file row passes exactly when the command would
+def parse_hhmm(value: str) -> tuple[int, int]:
+    h, m = map(int, value.strip().split(":"))
+    if not (0 <= h < 24 and 0 <= m < 60):
+        raise ValueError(f"{value} is not a 24-hour time")
+    return h, m
+
+def parse_countdown(duration: str) -> datetime.timedelta:
+    if any(c.isalpha() for c in duration):  # "1d 02:30"
+        return parse_duration_string(duration)
+    d, h, m = map(int, duration.strip().split(":"))  # "00:02:00"
+    return datetime.timedelta(days=d, hours=h, minutes=m)
+
+def passed_today(server_now: datetime.datetime, day: str, h: int, m: int) -> bool:
+    """True if `day` is today in server time and HH:MM has already gone by."""
+    start = server_now.replace(hour=h, minute=m, second=0, microsecond=0)
+    return DAY_INDEX[day] == server_now.weekday() and start < server_now
+
 class EventsCog(commands.Cog):
+    # Taken over by the new instance on /reload instead of being rebuilt from storage
+    HANDOVER = ("all_events", "queue", "wakeup", "due_index")
+
     def __init__(self, bot):
         self.bot = bot
-        self.config = load_config()
-        self.all_events = load_all_events()
-        cleanup_invalid_event_days(self.all_events)
+        self.config = get_config(bot)
+        self.clock = get_clock(bot)
+        self.config.subscribe(self.on_config_changed)
+        self.announcer = get_announcer(bot)
+        if not take_over(self):
+            self.load_schedule()
+
+        EVENTS_RESIDENT.set_function(lambda: sum(len(events) for _, events in self.all_events.resident()))
+        SCHEDULED_GUILDS.set_function(lambda: len(self.queue))
         self.check_events.start()
-        self.cleanup_events.start()
+
+    def load_schedule(self):
+        """Cold start: an empty guild cache and the schedule read back from the due index."""
+        self.all_events = GuildCache(load_guild_events, GUILD_CACHE_SIZE, is_pinned=events_pending)
+
+        # Scheduler state: one heap entry per guild, keyed by gid, at its earliest due instant.
+        # due_index mirrors the heap on disk so startup never pages guilds in just to find it.
+        # In cluster mode both only ever hold guilds on this worker's shards.
+        self.queue = DueQueue()
+        self.wakeup = asyncio.Event()
+        due_index = load_due_index()
+        if due_index is None:
+            self.due_index = {}
+            self.rebuild_due_index()
+        else:
+            self.due_index = {gid: due for gid, due in due_index.items() if owns_guild(gid)}
+        for gid, due in self.due_index.items():
+            self.queue.schedule(gid, due)
+
+    def cog_unload(self):
+        # The loop only awaits while sleeping, so cancelling never interrupts a tick halfway
+        self.check_events.cancel()
+        self.config.unsubscribe(self.on_config_changed)
+
+    def on_config_changed(self, section, key, value):
+        # Weekly fire instants shift with the guild's server clock
+        if section == "server_offsets":
+            self.schedule_guild(key)
+
+    def user_zone(self, user_id):
+        """The caller's saved timezone as a cached zone object, or None."""
+        tz = self.config.user_timezone(str(user_id))
+        return get_zone(tz) if tz else None
+
+    # ─── Scheduling Helpers ──────────────────────────────────────────────────
+    def rebuild_due_index(self):
+        """Compute every guild's next due instant once, e.g. after upgrading storage."""
+        now_ts = self.clock.time()
+        guilds = [gid for gid in list_event_guilds() if owns_guild(gid)]
+        for gid in guilds:
+            self.schedule_guild(gid, now_ts - FIRE_GRACE)
+        save_due_index(self.due_index)
+        logger.info("🗂️ Built due index for %s guild(s)", len(guilds))
+
+    def next_fire_at(self, gid, e, now_ts):
+        """Return the UTC epoch second `e` next fires strictly after `now_ts`, or None."""
+        if e.is_countdown:
+            return e.fire_epoch if e.fire_epoch is not None and e.fire_epoch > now_ts else None
+        if e.kind == "normal":
+            return e.next_fire_epoch(now_ts, self.config.server_offset(gid))
+        return None
+
+    def expires_at(self, e):
+        if e.auto_delete and e.last_trigger:
+            last = datetime.datetime.fromisoformat(e.last_trigger).replace(tzinfo=pytz.utc)
+            return last.timestamp() + AUTO_DELETE_AFTER
+        return None
+
+    def schedule_guild(self, gid, now_ts=None):
+        """Recompute when `gid` next needs attention and update the heap and due index."""
+        now_ts = self.clock.time() if now_ts is None else now_ts
+        due = None
+        for e in get_guild_events(self.all_events, gid):
+            try:
+                for t in (self.next_fire_at(gid, e, now_ts), self.expires_at(e)):
+                    if t is not None and (due is None or t < due):
+                        due = t
+            except Exception as ex:
+                logger.error("❌ Failed to schedule event: %s — %s", e.name, ex)
+
+        if due is None:
+            self.queue.cancel(gid)
+        else:
+            earliest = self.queue.peek()
+            self.queue.schedule(gid, due)
+            if earliest is None or due < earliest:
+                self.wakeup.set()
+        if self.due_index.get(gid) != due:
+            set_guild_due(self.due_index, gid, due)
 
     # ─── Background: Check and Trigger Events ────────────────────────────────
-    @tasks.loop(minutes=1)
+    @tasks.loop()
     async def check_events(self):
-        now_utc = datetime.datetime.utcnow().replace(tzinfo=pytz.utc)
-        for guild in self.bot.guilds:
-            gid = str(guild.id)
-            events = get_guild_events(self.all_events, gid)
-            offset = self.config["server_offsets"].get(gid, 0)
-            server_now = now_utc + datetime.timedelta(minutes=offset)
-            channel_id = self.config["channels"].get(gid)
-            channel = self.bot.get_channel(channel_id)
-
-            for e in events:
+        self.wakeup.clear()
+        next_at = self.queue.peek()
+        delay = MAX_SCHEDULER_SLEEP if next_at is None else min(next_at - self.clock.time(), MAX_SCHEDULER_SLEEP)
+        if delay > 0:
+            # Woken early whenever a command schedules something sooner
+            await self.clock.wait(self.wakeup, delay)
+
+        now_ts = self.clock.time()
+        due = self.queue.pop_due(now_ts)
+        if not due:
+            return
+        with SCHEDULER_TICK_SECONDS.time():
+            for gid, due_at in due:
+                SCHEDULER_LAG_SECONDS.observe(max(now_ts - due_at, 0.0))
                 try:
-                    if e.get("type") == "countdown":
-                        target = datetime.datetime.fromisoformat(e["timestamp"])
-                        target = target.replace(tzinfo=pytz.utc)
-                        if abs((server_now - target).total_seconds()) < 60 and channel:
-                            await channel.send(content="@everyone", embed=make_embed(
-                                title=f"📢 {e['name']} is Live!", description=e["info"], color=discord.Color.red()
-                            ))
-                            logger.info(f"[COUNTDOWN FIRED] {e['name']} for guild {gid}")
-                            if e.get("auto_delete"):
-                                e["last_trigger"] = now_utc.isoformat()
-                                save_all_events(self.all_events)
-
-                    elif e.get("type", "normal") == "normal" and e["day"] == server_now.strftime("%A"):
-                        h, m = map(int, e["time"].split(":"))
-                        event_dt = server_now.replace(hour=h, minute=m, second=0, microsecond=0)
-                        if abs((server_now - event_dt).total_seconds()) < 60 and channel:
-                            await channel.send(content="@everyone", embed=make_embed(
-                                title=f"📢 {e['name']} is Live!", description=e["info"], color=discord.Color.red()
-                            ))
-                            logger.info(f"[WEEKLY FIRED] {e['name']} for guild {gid}")
-                            if e.get("auto_delete"):
-                                e["last_trigger"] = now_utc.isoformat()
-                                save_all_events(self.all_events)
-
+                    self.run_guild(gid, now_ts)
                 except Exception as ex:
-                    logger.error(f"❌ Failed to check or fire event: {e.get('name', '?')} — {ex}")
-
-    # ─── Background: Auto-Delete Fired Events ────────────────────────────────
-    @tasks.loop(hours=1)
-    async def cleanup_events(self):
-        now_utc = datetime.datetime.utcnow()
-        changed = False
-        for gid, events in self.all_events.items():
-            for e in events[:]:
-                if e.get("auto_delete") and e.get("last_trigger"):
-                    last = datetime.datetime.fromisoformat(e["last_trigger"])
-                    if now_utc >= last + datetime.timedelta(hours=24):
-                        events.remove(e)
-                        changed = True
-                        logger.info(f"🗑️ Auto-deleted event '{e['name']}' from guild {gid}")
-        if changed:
-            save_all_events(self.all_events)
+                    logger.error("❌ Failed to check events for guild %s: %s", gid, ex)
+                self.schedule_guild(gid, now_ts)
+
+    def run_guild(self, gid, now_ts):
+        """Fire each event's latest occurrence not yet in the fire ledger and drop expired auto-deletes.
+
+        Only the ledger decides what is new, so a late or repeated tick can
+        neither skip nor repeat an occurrence; on startup this also catches
+        up on whatever came due while the bot was down, within FIRE_GRACE.
+        """
+        events = get_guild_events(self.all_events, gid)
+        channel = self.bot.get_channel(self.config.channel_id(gid))
+        offset = self.config.server_offset(gid)
+
+        expired = [e for e in events if (t := self.expires_at(e)) is not None and t <= now_ts]
+        if expired:
+            for e in expired:
+                events.remove(e)
+            delete_events(self.all_events, gid, expired)
+            for e in expired:
+                logger.info("🗑️ Auto-deleted event '%s' from guild %s", e.name, gid, extra={"guild": gid})
+
+        fired = []
+        for e in events:
+            try:
+                fire_at = e.last_fire_epoch(now_ts, offset)
+                if fire_at is None or (e.last_fired is not None and fire_at <= e.last_fired):
+                    continue
+                # Into the ledger before sending, so no later tick can pick it up again
+                e.last_fired = fire_at
+                fired.append(e)
+                if now_ts - fire_at > FIRE_GRACE:
+                    logger.warning("⏭️ Skipped %s for guild %s, %.0fs late", e.name, gid, now_ts - fire_at,
+                                   extra={"guild": gid})
+                    continue
+                if channel:
+                    # Sent in the background, together with anything else due here within the window
+                    self.announcer.announce(
+                        channel,
+                        make_embed(title=f"📢 {e.name} is Live!", description=e.info, color=discord.Color.red()),
+                        due_at=fire_at, mention="@everyone", on_sent=lambda e=e: self.on_event_fired(gid, e)
+                    )
+            except Exception as ex:
+                logger.error("❌ Failed to check or fire event: %s — %s", e.name, ex)
+        record_fires(self.all_events, gid, fired)
+
+    def on_event_fired(self, gid, e):
+        kind = "COUNTDOWN" if e.is_countdown else "WEEKLY"
+        logger.info("[%s FIRED] %s for guild %s", kind, e.name, gid, extra={"guild": gid})
+        if e.auto_delete:
+            # Delivery trails the fire by the coalesce window, and the guild may have been paged out
+            # and back in since; `e` could be an orphaned copy, so stamp the resident one
+            e = get_guild_events(self.all_events, gid).get(e.id)
+            if e is None:
+                return  # deleted while the announcement was queued
+            e.last_trigger = self.clock.utcnow().isoformat()
+            save_event(self.all_events, gid, e)
+            self.schedule_guild(gid)
+
+    @check_events.before_loop
+    async def before_check_events(self):
+        await self.bot.wait_until_ready()
+
+    # ─── Autocomplete: Event Names ───────────────────────────────────────────
+    async def event_name_autocomplete(self, interaction: discord.Interaction, current: str):
+        if interaction.guild_id is None:
+            return []
+        events = get_guild_events(self.all_events, str(interaction.guild_id))
+        return make_choices(events.names.search(current))
 
     # ─── Command: Add Weekly Event ───────────────────────────────────────────
-    @commands.command(name="addevent")
+    @commands.hybrid_command(name="addevent", description="Add a weekly event: Day HH:MM Name|Info [--autodelete].")
     async def addevent(self, ctx, day: str = None, time: str = None, *, rest: str = None):
         if not day or not time or not rest:
-            return await ctx.send(embed=make_embed(
-                title="❌ Missing Parameters",
-                description="Correct usage: `!addevent Day HH:MM Name|Info [--autodelete]`",
-                color=discord.Color.red()
-            ))
+            return await ctx.send(embed=ADDEVENT_USAGE)
 
         day_clean = day.strip().capitalize()
         if not validate_event_day(day_clean):
-            return await ctx.send(embed=make_embed(
-                title="❌ Invalid Day",
-                description="Use a weekday name like `Monday`, `Tuesday`, etc.",
-                color=discord.Color.red()
-            ))
+            return await ctx.send(embed=INVALID_DAY)
 
         try:
-            h, m = map(int, time.strip().split(":"))
-            assert 0 <= h < 24 and 0 <= m < 60
-        except:
-            return await ctx.send(embed=make_embed(
-                title="❌ Invalid Time Format",
-                description="Time must be in 24h `HH:MM` format.",
-                color=discord.Color.red()
-            ))
+            h, m = parse_hhmm(time)
+        except ValueError:
+            return await ctx.send(embed=INVALID_TIME_FORMAT)
 
         parts = rest.rsplit("--autodelete", 1)
         raw = parts[0].strip()
         auto = len(parts) == 2
 
         if "|" not in raw:
-            return await ctx.send(embed=make_embed(
-                title="❌ Missing Separator",
-                description="Use `Name|Info` to separate the event name and its details.",
-                color=discord.Color.red()
-            ))
+            return await ctx.send(embed=MISSING_SEPARATOR)
 
         name, info = map(str.strip, raw.split("|", 1))
         gid = str(ctx.guild.id)
-        offset = self.config["server_offsets"].get(gid, 0)
-        now_utc = datetime.datetime.utcnow().replace(tzinfo=pytz.utc)
+        offset = self.config.server_offset(gid)
+        now_utc = self.clock.utcnow().replace(tzinfo=pytz.utc)
         server_now = now_utc + datetime.timedelta(minutes=offset)
 
         # Check for duplicates
-        for e in get_guild_events(self.all_events, gid):
-            if e['name'].lower() == name.lower():
-                return await ctx.send(embed=make_embed(
-                    title="⚠️ Duplicate Event",
-                    description=f"An event named `{name}` already exists.",
-                    color=discord.Color.orange()
-                ))
-
-        target_day = list(calendar.day_name).index(day_clean)
-        days_ahead = (target_day - server_now.weekday()) % 7
-
-        # First move to the correct day
-        event_date = server_now.date() + datetime.timedelta(days=days_ahead)
-
-        # Then assign the correct time
-        event_time = datetime.datetime.combine(event_date, datetime.time(hour=h, minute=m))
-
-        # Now check
-        if days_ahead == 0 and event_time < server_now:
+        if get_guild_events(self.all_events, gid).named(name):
             return await ctx.send(embed=make_embed(
-                title="⚠️ Time Already Passed",
-                description="This time has already passed today.",
+                title="⚠️ Duplicate Event",
+                description=f"An event named `{name}` already exists.",
                 color=discord.Color.orange()
             ))
 
-        entry = {
-            "guild_id": gid,
-            "type": "normal",
-            "day": day_clean,
-            "time": f"{h:02d}:{m:02d}",
-            "name": name,
-            "info": info,
-            "auto_delete": auto
-        }
-        get_guild_events(self.all_events, gid).append(entry)
-        save_all_events(self.all_events)
-        logger.info(f"[ADD EVENT] {name} scheduled on {day_clean} {h:02d}:{m:02d} server time (offset {offset:+} min, UTC: {now_utc})")
+        if passed_today(server_now, day_clean, h, m):
+            return await ctx.send(embed=TIME_ALREADY_PASSED)
+
+        entry = Event(
+            guild_id=gid,
+            type="normal",
+            day=day_clean,
+            time=f"{h:02d}:{m:02d}",
+            name=name,
+            info=info,
+            auto_delete=auto,
+            last_fired=now_utc.timestamp()  # nothing before creation counts as missed
+        )
+        get_guild_events(self.all_events, gid).add(entry)
+        save_event(self.all_events, gid, entry)
+        self.schedule_guild(gid)
+        logger.info("[ADD EVENT] %s scheduled on %s %02d:%02d server time (offset %+d min, UTC: %s)",
+                    name, day_clean, h, m, offset, now_utc)
 
         await ctx.send(embed=make_embed(
             title="✅ Weekly Event Added",
@@ -181,67 +439,49 @@ class EventsCog(commands.Cog):
         ))
 
     # ─── Command: Schedule Countdown ─────────────────────────────────────────
-    @commands.command(name="schedulecountdown")
+    @commands.hybrid_command(name="schedulecountdown", description="Schedule a one-off countdown: duration Name|Info [--autodelete].")
     async def schedulecountdown(self, ctx, duration: str = None, *, rest: str = None):
         if not duration or not rest:
-            return await ctx.send(embed=make_embed(
-                title="❌ Missing Parameters",
-                description="Correct usage: `!schedulecountdown 1d 04:30 Name|Info [--autodelete]` or `DD:HH:MM` format.",
-                color=discord.Color.red()
-            ))
+            return await ctx.send(embed=COUNTDOWN_USAGE)
 
         try:
-            if any(c.isalpha() for c in duration):  # "1d 02:30"
-                delta = parse_duration_string(duration)
-            else:  # "00:02:00"
-                d, h, m = map(int, duration.strip().split(":"))
-                delta = datetime.timedelta(days=d, hours=h, minutes=m)
+            delta = parse_countdown(duration)
         except Exception as e:
-            logger.warning(f"Invalid duration: {duration} — {e}")
-            return await ctx.send(embed=make_embed(
-                title="❌ Invalid Duration Format",
-                description="Use format like `1d 03:30` or `DD:HH:MM`.",
-                color=discord.Color.red()
-            ))
+            logger.warning("Invalid duration: %s — %s", duration, e)
+            return await ctx.send(embed=INVALID_DURATION_FORMAT)
 
         parts = rest.rsplit("--autodelete", 1)
         raw = parts[0].strip()
         auto = len(parts) == 2
 
         if "|" not in raw:
-            return await ctx.send(embed=make_embed(
-                title="❌ Missing Separator",
-                description="Use `Name|Info [--autodelete]` format.",
-                color=discord.Color.red()
-            ))
+            return await ctx.send(embed=COUNTDOWN_MISSING_SEPARATOR)
 
         name, info = map(str.strip, raw.split("|", 1))
         gid = str(ctx.guild.id)
-        offset = self.config["server_offsets"].get(gid, 0)
+        offset = self.config.server_offset(gid)
 
-        now_utc = datetime.datetime.utcnow().replace(tzinfo=pytz.utc)
+        now_utc = self.clock.utcnow().replace(tzinfo=pytz.utc)
         server_now = now_utc + datetime.timedelta(minutes=offset)
         fire_at_server = server_now + delta
         fire_at_utc = fire_at_server - datetime.timedelta(minutes=offset)
 
         if fire_at_server < server_now:
-            return await ctx.send(embed=make_embed(
-                title="⚠️ Invalid Countdown Time",
-                description="This countdown would trigger in the past. Use a future duration.",
-                color=discord.Color.orange()
-            ))
-
-        entry = {
-            "type": "countdown",
-            "timestamp": fire_at_utc.isoformat(),
-            "name": name,
-            "info": info,
-            "auto_delete": auto,
-            "guild_id": gid
-        }
-        get_guild_events(self.all_events, gid).append(entry)
-        save_all_events(self.all_events)
-        logger.info(f"[COUNTDOWN] {name} scheduled for {fire_at_server} server time (offset {offset:+} min, UTC: {now_utc})")
+            return await ctx.send(embed=COUNTDOWN_IN_PAST)
+
+        entry = Event(
+            type="countdown",
+            timestamp=fire_at_utc.isoformat(),
+            name=name,
+            info=info,
+            auto_delete=auto,
+            guild_id=gid
+        )
+        get_guild_events(self.all_events, gid).add(entry)
+        save_event(self.all_events, gid, entry)
+        self.schedule_guild(gid)
+        logger.info("[COUNTDOWN] %s scheduled for %s server time (offset %+d min, UTC: %s)",
+                    name, fire_at_server, offset, now_utc)
 
         desc = f"**{name}** will go live in `{duration}` at **{fire_at_server.strftime('%A %H:%M')}** server time."
         if auto:
@@ -253,93 +493,223 @@ class EventsCog(commands.Cog):
         ))
 
 
-    # ─── EDITING EVENTS DATE AND TIME────────────────────────────────────
-    # ─── Command: Edit Weekly Event by ID ────────────────────────────────────
-    @commands.command(name="editweeklybyid")
-    async def editweeklybyid(self, ctx, event_id: int = None, new_day_time: str = None):
-        gid = str(ctx.guild.id)
-        events = get_guild_events(self.all_events, gid)
+    # ─── Command: Import Events ──────────────────────────────────────────────
+    def import_row(self, row: dict, gid: str, offset: int, now_utc, names: set) -> Event:
+        """Build the event a file row describes, by the rules of /addevent and /schedulecountdown.
 
-        if event_id is None or new_day_time is None:
+        The one exception is a weekly time that already passed today, which
+        /importevents reports as starting next week instead of rejecting.
+
+        Raises ValueError with the reason the row was rejected. `names`
+        holds the names this file's earlier rows took.
+        """
+        if row.get("error"):
+            raise ValueError(row["error"])
+        name = row["name"]
+        if not name:
+            raise ValueError("Missing name")
+        if name.casefold() in names or get_guild_events(self.all_events, gid).named(name):
+            raise ValueError(f"An event named `{name}` already exists")
+        server_now = now_utc + datetime.timedelta(minutes=offset)
+        at = row["at"]
+        if isinstance(at, str):
+            try:
+                at = datetime.datetime.fromisoformat(at)
+            except ValueError:
+                raise ValueError(f"`{at}` is not an ISO 8601 date and time")
+        if at is not None:
+            # Times without a zone are server time, like every time the commands take
+            at = at - datetime.timedelta(minutes=offset) if at.tzinfo is None else at.astimezone(pytz.utc)
+            at = at.replace(tzinfo=pytz.utc)
+
+        kind = row["type"] or ("countdown" if (row["duration"] or at) and not row["day"] else "weekly")
+        if kind in ("weekly", "normal"):
+            if at is not None and not row["day"]:
+                server_at = at + datetime.timedelta(minutes=offset)
+                day, time = server_at.strftime("%A"), server_at.strftime("%H:%M")
+            else:
+                day, time = (row["day"] or "").capitalize(), row["time"] or ""
+            if not validate_event_day(day):
+                raise ValueError(f"Invalid day `{row['day'] or ''}`: use a weekday name like `Monday`")
+            try:
+                h, m = parse_hhmm(time)
+            except ValueError:
+                raise ValueError(f"Invalid time `{time}`: use 24h `HH:MM`")
+            names.add(name.casefold())
+            # Unlike /addevent, a time already gone by today is no error: a rotation or an export
+            # always has some, and last_fired=now makes such an event start next week
+            return Event(guild_id=gid, type="normal", day=day, time=f"{h:02d}:{m:02d}", name=name, info=row["info"],
+                         auto_delete=row["autodelete"], last_fired=now_utc.timestamp())
+
+        if kind != "countdown":
+            raise ValueError(f"Unknown type `{row['type']}`: use `weekly` or `countdown`")
+        if row["duration"]:
+            try:
+                fire_at_utc = now_utc + parse_countdown(row["duration"])
+            except Exception:
+                raise ValueError(f"Invalid duration `{row['duration']}`: use `1d 03:30` or `DD:HH:MM`")
+        elif at is not None:
+            fire_at_utc = at
+        else:
+            raise ValueError("A countdown needs a `duration` or an `at` time")
+        if fire_at_utc < now_utc:
+            raise ValueError("This countdown would trigger in the past")
+        names.add(name.casefold())
+        return Event(type="countdown", timestamp=fire_at_utc.isoformat(), name=name, info=row["info"],
+                     auto_delete=row["autodelete"], guild_id=gid)
+
+    @commands.hybrid_command(name="importevents", description="Add events in bulk from a JSON, CSV or ICS file.")
+    async def importevents(self, ctx, file: discord.Attachment):
+        if file.size > MAX_IMPORT_BYTES:
+            return await ctx.send(embed=make_embed(
+                title="❌ File Too Large",
+                description=f"Import files can be up to {MAX_IMPORT_BYTES // 1024} KB.",
+                color=discord.Color.red()
+            ))
+        await ctx.defer()
+        try:
+            fmt, rows = parse_event_file(file.filename, (await file.read()).decode("utf-8-sig"))
+        except (UnicodeDecodeError, ValueError, csv.Error) as e:
+            return await ctx.send(embed=make_embed(
+                title="❌ Unreadable File",
+                description=f"Could not read `{file.filename}`: {e}\nUse a `.json`, `.csv` or `.ics` file; "
+                            f"`/exportevents` shows the layout.",
+                color=discord.Color.red()
+            ))
+        if not rows or len(rows) > MAX_IMPORT_ROWS:
             return await ctx.send(embed=make_embed(
-                title="❌ Missing Parameters",
-                description="Usage: `!editweeklybyid [ID] Day HH:MM`",
+                title="❌ Nothing Imported",
+                description=f"`{file.filename}` has {len(rows)} event(s); import 1 to {MAX_IMPORT_ROWS} at a time.",
                 color=discord.Color.red()
             ))
 
-        idx = event_id - 1
-        if idx < 0 or idx >= len(events) or events[idx].get("type") != "normal":
+        gid = str(ctx.guild.id)
+        offset = self.config.server_offset(gid)
+        now_utc = self.clock.utcnow().replace(tzinfo=pytz.utc)
+        events = get_guild_events(self.all_events, gid)
+        names = set()
+        added, errors = [], []
+        for row in rows:
+            try:
+                added.append(self.import_row(row, gid, offset, now_utc, names))
+            except ValueError as e:
+                errors.append(f"Row {row['row']}: {e}")
+
+        # All or nothing, so fixing the file and importing it again can't duplicate the rows that passed
+        if errors:
+            shown = "\n".join(errors[:MAX_REPORTED_ERRORS])
+            if len(errors) > MAX_REPORTED_ERRORS:
+                shown += f"\n…and {len(errors) - MAX_REPORTED_ERRORS} more"
             return await ctx.send(embed=make_embed(
-                title="❌ Invalid ID",
-                description="That ID does not correspond to a weekly event.",
+                title="❌ Import Rejected",
+                description=f"{len(errors)} of {len(rows)} row(s) in `{file.filename}` failed, so nothing was "
+                            f"imported. Fix them and import the file again.",
+                fields=[("Errors", shown[:1024], False)],
                 color=discord.Color.red()
             ))
 
+        for e in added:
+            events.add(e)
+        add_events(self.all_events, gid, added)
+        self.schedule_guild(gid)
+        countdowns = sum(e.is_countdown for e in added)
+        server_now = now_utc + datetime.timedelta(minutes=offset)
+        next_week = sum(not e.is_countdown and passed_today(server_now, e.day, e.hour, e.minute) for e in added)
+        logger.info("[IMPORT] %s event(s) from %s file %s for guild %s by %s (%s)",
+                    len(added), fmt.upper(), file.filename, gid, ctx.author, ctx.author.id)
+        desc = f"**{len(added) - countdowns}** weekly event(s) and **{countdowns}** countdown(s) from `{file.filename}`."
+        if next_week:
+            desc += f"\n{next_week} weekly event(s) already passed today and start next week."
+        await ctx.send(embed=make_embed(title="✅ Events Imported", description=desc, color=discord.Color.green()))
+
+    # ─── Command: Export Events ──────────────────────────────────────────────
+    @commands.hybrid_command(name="exportevents", description="Download this server's events as a JSON, CSV or ICS file.")
+    async def exportevents(self, ctx, file_type: Literal["json", "csv", "ics"] = "json"):
+        gid = str(ctx.guild.id)
+        now_ts = self.clock.time()
+        events = exportable_events(get_guild_events(self.all_events, gid), now_ts)
+        if not events:
+            return await ctx.send(embed=NO_EVENTS_FOUND)
+
+        data = export_events(events, file_type, gid, self.config.server_offset(gid), now_ts)
+        await ctx.send(
+            embed=make_embed(
+                title="📤 Events Exported",
+                description=f"{len(events)} event(s). Edit the file and `/importevents` it into another server.",
+                color=discord.Color.blue()
+            ),
+            file=discord.File(io.BytesIO(data), filename=f"events-{gid}.{file_type}")
+        )
+
+    # ─── EDITING EVENTS DATE AND TIME────────────────────────────────────
+    # ─── Command: Edit Weekly Event by ID ────────────────────────────────────
+    @commands.hybrid_command(name="editweeklybyid", description="Move a weekly event, by ID, to a new Day HH:MM.")
+    async def editweeklybyid(self, ctx, event_id: int = None, *, new_day_time: str = None):
+        gid = str(ctx.guild.id)
+        events = get_guild_events(self.all_events, gid)
+
+        if event_id is None or new_day_time is None:
+            return await ctx.send(embed=EDITWEEKLYBYID_USAGE)
+
+        e = events.get(event_id)
+        if e is None or e.type != "normal":
+            return await ctx.send(embed=NOT_A_WEEKLY_ID)
+
         try:
             parts = new_day_time.strip().split()
             if len(parts) != 2:
                 raise ValueError("Must provide Day and HH:MM.")
             new_day, new_time = parts
             new_day = new_day.capitalize()
-            if new_day not in calendar.day_name:
+            if new_day not in DAY_INDEX:
                 raise ValueError("Invalid day name.")
             h, m = map(int, new_time.split(":"))
             assert 0 <= h < 24 and 0 <= m < 60
         except:
-            return await ctx.send(embed=make_embed(
-                title="❌ Invalid Time",
-                description="Time must be in `HH:MM` 24-hour format.",
-                color=discord.Color.red()
-            ))
+            return await ctx.send(embed=INVALID_TIME_24H)
 
-        events[idx]["time"] = f"{h:02d}:{m:02d}"
-        events[idx]["day"] = new_day
-        save_all_events(self.all_events)
+        events.set_weekly(e, new_day, h, m)
+        e.last_fired = self.clock.time()  # a new time that just passed isn't a missed occurrence
+        save_event(self.all_events, gid, e)
+        self.schedule_guild(gid)
         await ctx.send(embed=make_embed(
             title="✏️ Weekly Event Updated",
-            description=f"Updated `{events[idx]['name']}` to `{new_day} {h:02d}:{m:02d}`.",
+            description=f"Updated `{e.name}` to `{new_day} {h:02d}:{m:02d}`.",
             color=discord.Color.green()
         ))
 
     # ─── Command: Edit Weekly Event by Name ─────────────────────────────────
-    @commands.command(name="editweeklybyname")
-    async def editweeklybyname(self, ctx, name: str = None, new_day_time: str = None):
+    @commands.hybrid_command(name="editweeklybyname", description="Move weekly events, by name, to a new [Day] HH:MM.")
+    async def editweeklybyname(self, ctx, name: str = None, *, new_day_time: str = None):
         gid = str(ctx.guild.id)
         if not name or not new_day_time:
-            return await ctx.send(embed=make_embed(
-                title="❌ Missing Parameters",
-                description="Usage: `!editweeklybyname EventName HH:MM` or `EventName Day HH:MM`",
-                color=discord.Color.red()
-            ))
+            return await ctx.send(embed=EDITWEEKLYBYNAME_USAGE)
 
         events = get_guild_events(self.all_events, gid)
         updated = 0
-        for e in events:
-            if e.get("type") == "normal" and e['name'].lower() == name.lower():
+        for e in events.named(name):
+            if e.type == "normal":
                 try:
                     parts = new_day_time.strip().split()
                     if len(parts) == 1:
+                        new_day = e.day
                         h, m = map(int, parts[0].split(":"))
-                        e['time'] = f"{h:02d}:{m:02d}"
                     elif len(parts) == 2:
                         new_day, new_time = parts
                         new_day = new_day.capitalize()
-                        if new_day not in calendar.day_name:
+                        if new_day not in DAY_INDEX:
                             raise ValueError("Invalid day name.")
                         h, m = map(int, new_time.split(":"))
-                        e['time'] = f"{h:02d}:{m:02d}"
-                        e['day'] = new_day
                     else:
                         raise ValueError("Invalid format.")
                     assert 0 <= h < 24 and 0 <= m < 60
-                    e['time'] = f"{h:02d}:{m:02d}"
+                    events.set_weekly(e, new_day, h, m)
+                    e.last_fired = self.clock.time()
+                    save_event(self.all_events, gid, e)
                     updated += 1
                 except:
-                    return await ctx.send(embed=make_embed(
-                        title="❌ Invalid Time",
-                        description="Time must be in `HH:MM` format.",
-                        color=discord.Color.red()
-                    ))
+                    self.schedule_guild(gid)
+                    return await ctx.send(embed=INVALID_TIME)
 
         if updated == 0:
             return await ctx.send(embed=make_embed(
@@ -348,91 +718,64 @@ class EventsCog(commands.Cog):
                 color=discord.Color.red()
             ))
 
-        save_all_events(self.all_events)
+        self.schedule_guild(gid)
         await ctx.send(embed=make_embed(
             title="✏️ Weekly Event(s) Updated",
             description=f"Updated `{updated}` event(s) named `{name}`.",
             color=discord.Color.green()
         ))
 
+    editweeklybyname.autocomplete("name")(event_name_autocomplete)
+
     # ─── Command: Edit Countdown by ID ──────────────────────────────────────
-    @commands.command(name="editcountdownbyid")
-    async def editcountdownbyid(self, ctx, event_id: int = None, duration: str = None):
+    @commands.hybrid_command(name="editcountdownbyid", description="Reschedule a countdown, by ID, to a new duration from now.")
+    async def editcountdownbyid(self, ctx, event_id: int = None, *, duration: str = None):
         gid = str(ctx.guild.id)
         events = get_guild_events(self.all_events, gid)
 
         if event_id is None or duration is None:
-            return await ctx.send(embed=make_embed(
-                title="❌ Missing Parameters",
-                description="Usage: `!editcountdownbyid [ID] duration`",
-                color=discord.Color.red()
-            ))
+            return await ctx.send(embed=EDITCOUNTDOWNBYID_USAGE)
 
-        idx = event_id - 1
-        if idx < 0 or idx >= len(events) or events[idx].get("type") != "countdown":
-            return await ctx.send(embed=make_embed(
-                title="❌ Invalid ID",
-                description="That ID does not correspond to a countdown event.",
-                color=discord.Color.red()
-            ))
+        e = events.get(event_id)
+        if e is None or not e.is_countdown:
+            return await ctx.send(embed=NOT_A_COUNTDOWN_ID)
 
         try:
-            if any(c.isalpha() for c in duration):
-                delta = parse_duration_string(duration)
-            else:
-                d, h, m = map(int, duration.strip().split(":"))
-                delta = datetime.timedelta(days=d, hours=h, minutes=m)
-        except:
-            return await ctx.send(embed=make_embed(
-                title="❌ Invalid Duration",
-                description="Use format like `1d 02:30` or `DD:HH:MM`.",
-                color=discord.Color.red()
-            ))
+            delta = parse_countdown(duration)
+        except Exception:
+            return await ctx.send(embed=INVALID_DURATION)
 
-        offset = self.config["server_offsets"].get(gid, 0)
-        now_utc = datetime.datetime.utcnow().replace(tzinfo=pytz.utc)
-        server_now = now_utc + datetime.timedelta(minutes=offset)
-        events[idx]['timestamp'] = (server_now + delta).isoformat()
-        save_all_events(self.all_events)
+        now_utc = self.clock.utcnow().replace(tzinfo=pytz.utc)
+        events.set_timestamp(e, now_utc + delta)
+        save_event(self.all_events, gid, e)
+        self.schedule_guild(gid)
 
         await ctx.send(embed=make_embed(
             title="✏️ Countdown Updated",
-            description=f"Updated `{events[idx]['name']}` to trigger at `{events[idx]['timestamp']}`.",
+            description=f"Updated `{e.name}` to trigger at `{e.timestamp}`.",
             color=discord.Color.green()
         ))
 
     # ─── Command: Edit Countdown by Name ────────────────────────────────────
-    @commands.command(name="editcountdownbyname")
-    async def editcountdownbyname(self, ctx, name: str = None, duration: str = None):
+    @commands.hybrid_command(name="editcountdownbyname", description="Reschedule countdowns, by name, to a new duration from now.")
+    async def editcountdownbyname(self, ctx, name: str = None, *, duration: str = None):
         gid = str(ctx.guild.id)
         if not name or not duration:
-            return await ctx.send(embed=make_embed(
-                title="❌ Missing Parameters",
-                description="Usage: `!editcountdownbyname EventName duration`",
-                color=discord.Color.red()
-            ))
+            return await ctx.send(embed=EDITCOUNTDOWNBYNAME_USAGE)
 
         try:
-            if any(c.isalpha() for c in duration):
-                delta = parse_duration_string(duration)
-            else:
-                d, h, m = map(int, duration.strip().split(":"))
-                delta = datetime.timedelta(days=d, hours=h, minutes=m)
-        except:
-            return await ctx.send(embed=make_embed(
-                title="❌ Invalid Duration",
-                description="Use format like `1d 02:30` or `DD:HH:MM`.",
-                color=discord.Color.red()
-            ))
+            delta = parse_countdown(duration)
+        except Exception:
+            return await ctx.send(embed=INVALID_DURATION)
 
         updated = 0
-        offset = self.config["server_offsets"].get(gid, 0)
-        now_utc = datetime.datetime.utcnow().replace(tzinfo=pytz.utc)
-        server_now = now_utc + datetime.timedelta(minutes=offset)
+        now_utc = self.clock.utcnow().replace(tzinfo=pytz.utc)
 
-        for e in get_guild_events(self.all_events, gid):
-            if e.get("type") == "countdown" and e['name'].lower() == name.lower():
-                e['timestamp'] = (server_now + delta).isoformat()
+        events = get_guild_events(self.all_events, gid)
+        for e in events.named(name):
+            if e.is_countdown:
+                events.set_timestamp(e, now_utc + delta)
+                save_event(self.all_events, gid, e)
                 updated += 1
 
         if updated == 0:
@@ -442,7 +785,7 @@ class EventsCog(commands.Cog):
                 color=discord.Color.red()
             ))
 
-        save_all_events(self.all_events)
+        self.schedule_guild(gid)
         await ctx.send(embed=make_embed(
             title="✏️ Countdown(s) Updated",
             description=f"Updated `{updated}` countdown(s) named `{name}`.",
@@ -450,20 +793,18 @@ class EventsCog(commands.Cog):
         ))
 
 
+    editcountdownbyname.autocomplete("name")(event_name_autocomplete)
+
     # ─── Delete Events ─────────────────────────────────────────
     # ─── Command: Delete Event By Name ───────────────────────────────────────
-    @commands.command(name="deleteeventbyname")
+    @commands.hybrid_command(name="deleteeventbyname", description="Delete every event with a matching name.")
     async def deleteeventbyname(self, ctx, *, name: str = None):
         gid = str(ctx.guild.id)
         if not name:
-            return await ctx.send(embed=make_embed(
-                title="❌ Missing Parameter",
-                description="Usage: `!deleteeventbyname Event Name`",
-                color=discord.Color.red()
-            ))
+            return await ctx.send(embed=DELETEEVENTBYNAME_USAGE)
 
         events = get_guild_events(self.all_events, gid)
-        filtered = [e for e in events if e['name'].lower() == name.lower()]
+        filtered = list(events.named(name))
         if not filtered:
             return await ctx.send(embed=make_embed(
                 title="❌ Event Not Found",
@@ -471,8 +812,10 @@ class EventsCog(commands.Cog):
                 color=discord.Color.red()
             ))
 
-        self.all_events[gid] = [e for e in events if e['name'].lower() != name.lower()]
-        save_all_events(self.all_events)
+        for e in filtered:
+            events.remove(e)
+        delete_events(self.all_events, gid, filtered)
+        self.schedule_guild(gid)
         await ctx.send(embed=make_embed(
             title="🗑️ Event Deleted",
             description=f"Deleted event(s) named `{name}`.",
@@ -480,72 +823,72 @@ class EventsCog(commands.Cog):
         ))
 
 
+    deleteeventbyname.autocomplete("name")(event_name_autocomplete)
+
     # ─── Command: Delete Event By ID ─────────────────────────────────────────
-    @commands.command(name="deleteevent")
+    @commands.hybrid_command(name="deleteevent", description="Delete one event by ID.")
     async def deleteevent(self, ctx, event_id: int = None):
         gid = str(ctx.guild.id)
         if event_id is None:
-            return await ctx.send(embed=make_embed(
-                title="❌ Missing Parameter",
-                description="Usage: `!deleteevent [event_id]`",
-                color=discord.Color.red()
-            ))
+            return await ctx.send(embed=DELETEEVENT_USAGE)
 
         events = get_guild_events(self.all_events, gid)
-        idx = event_id - 1
-        if idx < 0 or idx >= len(events):
+        removed = events.get(event_id)
+        if removed is None:
             return await ctx.send(embed=make_embed(
                 title="❌ Invalid Event ID",
                 description=f"No event found for ID `{event_id}`.",
                 color=discord.Color.red()
             ))
 
-        removed = events.pop(idx)
-        save_all_events(self.all_events)
+        events.remove(removed)
+        delete_events(self.all_events, gid, [removed])
+        self.schedule_guild(gid)
         await ctx.send(embed=make_embed(
             title="🗑️ Event Deleted",
-            description=f"Deleted event `{removed['name']}`.",
+            description=f"Deleted event `{removed.name}`.",
             color=discord.Color.green()
         ))
 
 
     # ─── Command: Delete All Countdown Events ───────────────────────────────
-    @commands.command(name="deleteallcountdowns")
+    @commands.hybrid_command(name="deleteallcountdowns", description="Delete all countdown events.")
     async def deleteallcountdowns(self, ctx):
         gid = str(ctx.guild.id)
-        before = len(get_guild_events(self.all_events, gid))
-        self.all_events[gid] = [e for e in get_guild_events(self.all_events, gid) if e.get("type") != "countdown"]
-        after = len(self.all_events[gid])
-        save_all_events(self.all_events)
+        events = get_guild_events(self.all_events, gid)
+        removed = events.remove_where(lambda e: e.is_countdown)
+        delete_events(self.all_events, gid, removed)
+        self.schedule_guild(gid)
 
         await ctx.send(embed=make_embed(
             title="💣 Countdown Events Deleted",
-            description=f"Removed `{before - after}` countdown event(s).",
+            description=f"Removed `{len(removed)}` countdown event(s).",
             color=discord.Color.orange()
         ))
 
     # ─── Command: Delete All Weekly Events ───────────────────────────────────
-    @commands.command(name="deleteallweekly")
+    @commands.hybrid_command(name="deleteallweekly", description="Delete all weekly events.")
     async def deleteallweekly(self, ctx):
         gid = str(ctx.guild.id)
-        before = len(get_guild_events(self.all_events, gid))
-        self.all_events[gid] = [e for e in get_guild_events(self.all_events, gid) if e.get("type") == "countdown"]
-        after = len(self.all_events[gid])
-        save_all_events(self.all_events)
+        events = get_guild_events(self.all_events, gid)
+        removed = events.remove_where(lambda e: not e.is_countdown)
+        delete_events(self.all_events, gid, removed)
+        self.schedule_guild(gid)
 
         await ctx.send(embed=make_embed(
             title="🧹 Weekly Events Deleted",
-            description=f"Removed `{before - after}` weekly event(s).",
+            description=f"Removed `{len(removed)}` weekly event(s).",
             color=discord.Color.orange()
         ))
 
     # ─── Command: Delete All Events ─────────────────────────────────────────
-    @commands.command(name="deleteallevents")
+    @commands.hybrid_command(name="deleteallevents", description="Delete every event in this server.")
     async def deleteallevents(self, ctx):
         gid = str(ctx.guild.id)
-        count = len(get_guild_events(self.all_events, gid))
-        self.all_events[gid] = []
-        save_all_events(self.all_events)
+        removed = get_guild_events(self.all_events, gid).remove_where(lambda e: True)
+        count = len(removed)
+        delete_events(self.all_events, gid, removed)
+        self.schedule_guild(gid)
 
         await ctx.send(embed=make_embed(
             title="🗑️ All Events Deleted",
@@ -554,81 +897,83 @@ class EventsCog(commands.Cog):
         ))
 
     # ─── Command: List All Events ─────────────────────────────────────────
-    @commands.command(name="listevents")
+    @commands.hybrid_command(name="listevents", description="Show all events with their IDs.")
     async def listevents(self, ctx):
         gid = str(ctx.guild.id)
         events = get_guild_events(self.all_events, gid)
-        offset = self.config["server_offsets"].get(gid, 0)
-        now_utc = datetime.datetime.utcnow()
-        server_now = now_utc + datetime.timedelta(minutes=offset)
-
-        weekly = []
-        countdowns = []
-
-        for e in events:
-            try:
-                if e.get("type") == "countdown":
-                    fire_time = datetime.datetime.fromisoformat(e["timestamp"])
-                    if fire_time > now_utc:
-                        server_fire = fire_time + datetime.timedelta(minutes=offset)
-                        countdowns.append(f"⏳ **{e['name']}** — {server_fire.strftime('%A %H:%M')} | {e.get('info', '')}")
-                elif e.get("type") == "normal":
-                    next_dt = next_event_datetime(e, server_now)
-                    weekly.append(f"📆 **{e['name']}** — {e['day']} {e['time']} → {next_dt.strftime('%A %H:%M')}")
-            except Exception as err:
-                logger.warning(f"❌ Failed to parse event `{e.get('name')}`: {err}")
-
-        if not weekly and not countdowns:
-            return await ctx.send(embed=make_embed(
-                title="📭 No Events Found",
-                description="No countdown or weekly events scheduled.",
-                color=discord.Color.red()
-            ))
+        if not events.weekly and not events.countdowns_between(self.clock.time()):
+            return await ctx.send(embed=NO_EVENTS_FOUND)
+
+        def timeline(now_ts, offset):
+            # Both views are already in time order, so merging them gives the timeline
+            weekly = ((e.next_fire_epoch(now_ts, offset), e) for e in events.weekly_after(server_week_minute(now_ts, offset)))
+            countdowns = ((e.fire_epoch, e) for e in events.countdowns_between(now_ts))
+            return heapq.merge(weekly, countdowns, key=lambda x: x[0])
+
+        def render(page, total):
+            lines = []
+            start = page * PAGE_SIZE
+            offset = self.config.server_offset(gid)
+            page_items = list(itertools.islice(timeline(self.clock.time(), offset), start, start + PAGE_SIZE))
+            zone = self.user_zone(ctx.author.id)
+            local = local_datetimes([fire_ts for fire_ts, _ in page_items], zone) if zone else None
+            for i, (fire_ts, e) in enumerate(page_items):
+                server_fire = datetime.datetime.utcfromtimestamp(fire_ts + offset * 60)
+                if e.is_countdown:
+                    line = f"⏳ `#{e.id}` **{e.name}** — {server_fire.strftime('%A %H:%M')}"
+                else:
+                    line = f"📆 `#{e.id}` **{e.name}** — {e.day} {e.time} → {server_fire.strftime('%A %H:%M')}"
+                if local:
+                    line += f" | 🌐 {local[i].strftime('%a %H:%M %Z')}"
+                if e.is_countdown:
+                    line += f" | {e.info}"
+                lines.append(line)
+            title = "📋 Scheduled Events" if total == 1 else f"📋 Scheduled Events (Page {page + 1}/{total})"
+            return make_embed(title=title, description="\n".join(lines) or "—", color=discord.Color.blue())
 
-        description = ""
-        if weekly:
-            description += "**📆 Weekly Events:**\n" + "\n".join(weekly) + "\n\n"
-        if countdowns:
-            description += "**⏳ Countdown Events:**\n" + "\n".join(countdowns)
+        def count():
+            listed = len(events.weekly) + len(events.countdowns_between(self.clock.time()))
+            return -(-listed // PAGE_SIZE)
 
-        await ctx.send(embed=make_embed(
-            title="📋 Scheduled Events",
-            description=description.strip(),
-            color=discord.Color.blue()
-        ))
+        # The timeline shifts every minute as events pass, as well as on edits
+        version = lambda: (events.version, self.config.server_offset(gid), int(self.clock.time() // 60),
+                           self.config.user_timezone(str(ctx.author.id)))
+        await Paginator(ctx.author, render, count, version).send(ctx)
 
     # ─── Command: Today's Events ─────────────────────────────────────────────
-    @commands.command(name="todaysevents")
+    @commands.hybrid_command(name="todaysevents", description="Show events happening today.")
     async def todaysevents(self, ctx):
         gid = str(ctx.guild.id)
-        offset = self.config["server_offsets"].get(gid, 0)
-        server_now = datetime.datetime.utcnow().replace(tzinfo=pytz.utc) + datetime.timedelta(minutes=offset)
-        today = server_now.strftime("%A")
+        offset = self.config.server_offset(gid)
+        now_ts = self.clock.time()
+        server_now = datetime.datetime.fromtimestamp(now_ts + offset * 60, pytz.utc)
+        today = server_now.weekday()
+        # UTC epoch of the server's midnight today
+        day_start_ts = server_now.replace(hour=0, minute=0, second=0, microsecond=0).timestamp() - offset * 60
         events = get_guild_events(self.all_events, gid)
-
+        zone = self.user_zone(ctx.author.id)
+
+        weekly = ((day_start_ts + (e.minute_of_week - today * MINUTES_PER_DAY) * 60, e)
+                  for e in events.weekly_between(today * MINUTES_PER_DAY, (today + 1) * MINUTES_PER_DAY))
+        countdowns = ((e.fire_epoch, e) for e in events.countdowns_between(day_start_ts, day_start_ts + 86400))
+        todays = list(heapq.merge(weekly, countdowns, key=lambda x: x[0]))
+        # One batch conversion for the whole day instead of one zone lookup per event
+        local = local_datetimes([fire_ts for fire_ts, _ in todays], zone) if zone else None
         lines = []
-        for e in events:
-            if e.get("type") == "normal" and e["day"] == today:
-                h, m = map(int, e["time"].split(":"))
-                event_dt = server_now.replace(hour=h, minute=m)
-                utc_dt = event_dt - datetime.timedelta(minutes=offset)
-                tz = self.config["user_timezones"].get(str(ctx.author.id))
-                local = utc_dt.replace(tzinfo=pytz.utc).astimezone(pytz.timezone(tz)) if tz else None
-                line = f"🗓️ **{e['time']}** server | {utc_dt.strftime('%H:%M')} UTC"
-                if local:
-                    line += f" | {local.strftime('%H:%M %Z')}"
-                line += f" — **{e['name']}**"
-                lines.append(line)
-            elif e.get("type") == "countdown":
-                dt = datetime.datetime.fromisoformat(e["timestamp"]).replace(tzinfo=pytz.utc)
-                if dt.date() == server_now.date():
-                    lines.append(f"⏳ {dt.strftime('%H:%M')} server — **{e['name']}**")
+        for i, (fire_ts, e) in enumerate(todays):
+            utc_dt = datetime.datetime.fromtimestamp(fire_ts, pytz.utc)
+            if e.is_countdown:
+                server_dt = utc_dt + datetime.timedelta(minutes=offset)
+                line = f"⏳ {server_dt.strftime('%H:%M')} server"
+            else:
+                line = f"🗓️ **{e.time}** server | {utc_dt.strftime('%H:%M')} UTC"
+            if local:
+                line += f" | {local[i].strftime('%H:%M %Z')}"
+            line += f" — **{e.name}**"
+            lines.append(line)
 
         if not lines:
-            return await ctx.send(embed=make_embed(
-                title="📭 No Events Today",
-                color=discord.Color.blue()
-            ))
+            return await ctx.send(embed=NO_EVENTS_TODAY)
 
         await ctx.send(embed=make_embed(
             title="📅 Today's Events",
@@ -637,38 +982,33 @@ class EventsCog(commands.Cog):
         ))
 
     # ─── Command: Next Event ─────────────────────────────────────────────────
-    @commands.command(name="nextevent")
+    @commands.hybrid_command(name="nextevent", description="Show the next upcoming event.")
     async def nextevent(self, ctx):
         gid = str(ctx.guild.id)
-        offset = self.config["server_offsets"].get(gid, 0)
-        server_now = datetime.datetime.utcnow().replace(tzinfo=pytz.utc) + datetime.timedelta(minutes=offset)
+        offset = self.config.server_offset(gid)
+        now_ts = self.clock.time()
         events = get_guild_events(self.all_events, gid)
 
         upcoming = []
-        for e in events:
-            if e.get("type") == "normal":
-                dt = next_event_datetime(e, server_now)
-            else:
-                dt = datetime.datetime.fromisoformat(e["timestamp"]).replace(tzinfo=pytz.utc)
-            if dt > server_now:
-                upcoming.append((dt, e))
+        weekly = events.next_weekly(server_week_minute(now_ts, offset))
+        if weekly:
+            upcoming.append((weekly.next_fire_epoch(now_ts, offset), weekly))
+        countdown = events.next_countdown(now_ts)
+        if countdown:
+            upcoming.append((countdown.fire_epoch, countdown))
 
         if not upcoming:
-            return await ctx.send(embed=make_embed(
-                title="📭 No Upcoming Events",
-                color=discord.Color.blue()
-            ))
-
-        next_dt, next_e = min(upcoming, key=lambda x: x[0])
-        time_diff = next_dt - server_now
-        human = humanize.precisedelta(time_diff, minimum_unit="seconds")
+            return await ctx.send(embed=NO_UPCOMING_EVENTS)
 
-        utc_dt = next_dt.astimezone(pytz.utc)
-        tz = self.config["user_timezones"].get(str(ctx.author.id))
-        local_dt = utc_dt.astimezone(pytz.timezone(tz)) if tz else None
+        fire_ts, next_e = min(upcoming, key=lambda x: x[0])
+        utc_dt = datetime.datetime.fromtimestamp(fire_ts, pytz.utc)
+        next_dt = utc_dt + datetime.timedelta(minutes=offset)
+        human = humanize.precisedelta(datetime.timedelta(seconds=fire_ts - now_ts), minimum_unit="seconds")
+        zone = self.user_zone(ctx.author.id)
+        local_dt = utc_dt.astimezone(zone) if zone else None
 
         fields = [
-            ("Server Time", f"{next_e.get('day','')} {next_e.get('time', next_dt.strftime('%H:%M'))}", False),
+            ("Server Time", next_dt.strftime("%A %H:%M"), False),
             ("UTC Time", utc_dt.strftime("%a %H:%M UTC"), False),
             ("Starts In", human, False)
         ]
@@ -676,13 +1016,13 @@ class EventsCog(commands.Cog):
             fields.append(("Your Time", local_dt.strftime("%a %H:%M %Z"), False))
 
         await ctx.send(embed=make_embed(
-            title=f"➡️ Next Event: {next_e['name']}",
-            description=next_e["info"],
+            title=f"➡️ Next Event: {next_e.name}",
+            description=next_e.info,
             fields=fields,
             color=discord.Color.green()
         ))
 
 # ─── Setup ───────────────────────────────────────────────────────────────────
 async def setup(bot):
-    await bot.add_cog(EventsCog(bot))
+    await setup_cog(bot, EventsCog)
 
@@ -3,24 +3,94 @@ from discord.ext import commands
 from discord.utils import find
 
 from bot.utils.helpers import make_embed
-from bot.config_loader import load_config, save_config
+from bot.utils.metrics import COMMAND_ERRORS
+from bot.config_loader import get_config
+from bot.utils.extensions import setup_cog
 from bot.logger import setup_logging
 
 logger = setup_logging("misc")
 
+# ─── Static Replies ──────────────────────────────────────────────────────────
+# Built once when the cog loads and reused for every reply
+MISSING_ARGUMENTS = make_embed(
+    title="⚠️ Missing Parameters",
+    description="Correct usage: try `/help` to see how this command works.",
+    color=discord.Color.orange()
+)
+COMMAND_ERROR = make_embed(
+    title="❌ Error",
+    description="An error occurred while running that command.",
+    color=discord.Color.red()
+)
+UNKNOWN_ERROR = make_embed(
+    title="⚠️ Unknown Error",
+    description="Something unexpected happened.",
+    color=discord.Color.red()
+)
+
+# ─── Help Pages ──────────────────────────────────────────────────────────────
+HELP_SECTIONS = [
+    ("🕹️ Setup & Time Commands", [
+        "`/setchannel` - Set current channel for announcements.",
+        "`/setserverclock HH:MM` - Set current in-game server time.",
+        "`/setserverclock Day HH:MM` - Optional day setting too.",
+        "`/setserverday Day` - Force server day manually.",
+        "`/getservertime` - View current server time + offset.",
+        "`/settimezone Region/City` - Set your local timezone.",
+        "`/gettimezone` - View your current local timezone."
+    ]),
+    ("📅 Event Scheduling", [
+        "`/addevent Day HH:MM Name|Info [--autodelete]` - Weekly event.",
+        "`/schedulecountdown duration Name|Info [--autodelete]` - Countdown event.",
+        "`/listevents` - Show all events with their IDs.",
+        "`/todaysevents` - Events happening today.",
+        "`/nextevent` - The next upcoming event.",
+        "`/importevents file` - Add events from a JSON, CSV or ICS file.",
+        "`/exportevents [json|csv|ics]` - Download all events as a file."
+    ]),
+    ("✏️ Edit Events", [
+        "`/editweeklybyid ID Day HH:MM` - Edit by ID.",
+        "`/editweeklybyname Name [Day] HH:MM` - Edit by name.",
+        "`/editcountdownbyid ID duration` - Edit countdown by ID.",
+        "`/editcountdownbyname Name duration` - Edit countdown by name."
+    ]),
+    ("🗑️ Delete Events", [
+        "`/deleteevent ID` - Delete one event.",
+        "`/deleteeventbyname Name` - Delete all with matching name.",
+        "`/deleteallweekly` - Delete all weekly events.",
+        "`/deleteallcountdowns` - Delete all countdowns.",
+        "`/deleteallevents` - Nuke all events."
+    ]),
+    ("🧠 Tips", [
+        "`/addtip Text` - Add a new tip.",
+        "`/removetip Index` - Remove by number.",
+        "`/listalltips` - Show all saved tips.",
+        "`/settiptime HH:MM` - When the daily tip is posted (server time)."
+    ]),
+    ("🛠️ Owner Tools", [
+        "`/profile [seconds]` - Sample the event loop and upload the profile.",
+        "`/reload cog` - Reload a cog's code, keeping its state."
+    ])
+]
+
+# All six sections fit in one message (Discord allows ten embeds)
+HELP_EMBEDS = [
+    make_embed(title=title, description="\n".join(lines), color=discord.Color.blue())
+    for title, lines in HELP_SECTIONS
+]
+
 class MiscCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.config = load_config()
+        self.config = get_config(bot)
 
     # ─── Command: Set Default Channel ────────────────────────────────────────
-    @commands.command(name="setchannel")
+    @commands.hybrid_command(name="setchannel", description="Post announcements in this channel.")
     async def set_channel(self, ctx):
         gid = str(ctx.guild.id)
-        self.config["channels"][gid] = ctx.channel.id
-        save_config(self.config)
+        self.config.set_channel(gid, ctx.channel.id)
 
-        logger.info(f"✅ Channel set for guild {ctx.guild.name} to #{ctx.channel.name}")
+        logger.info("✅ Channel set for guild %s to #%s", ctx.guild.name, ctx.channel.name)
 
         await ctx.send(embed=make_embed(
             title="✅ Channel Set",
@@ -29,56 +99,10 @@ class MiscCog(commands.Cog):
         ))
 
     # ─── Command: Help ────────────────────────────────────────────────────────
-    @commands.command(name="help", help="Show all available bot commands.")
+    @commands.hybrid_command(name="help", description="Show all available bot commands.")
     async def help_cmd(self, ctx):
         try:
-            sections = [
-                ("🕹️ Setup & Time Commands", [
-                    "`!setchannel` - Set current channel for announcements.",
-                    "`!setserverclock HH:MM` - Set current in-game server time.",
-                    "`!setserverclock Day HH:MM` - Optional day setting too.",
-                    "`!setserverday Day` - Force server day manually.",
-                    "`!getservertime` - View current server time + offset.",
-                    "`!settimezone Region/City` - Set your local timezone.",
-                    "`!gettimezone` - View your current local timezone."
-                ]),
-                ("📅 Event Scheduling", [
-                    "`!addevent Day HH:MM Name|Info [--autodelete]` - Weekly event.",
-                    "`!schedulecountdown duration Name|Info [--autodelete]` - Countdown event.",
-                    "`!listevents` - Show all events.",
-                    "`!todaysevents` - Events happening today.",
-                    "`!nextevent` - The next upcoming event."
-                ]),
-                ("✏️ Edit Events", [
-                    "`!editweeklybyid ID [Day] HH:MM` - Edit by ID.",
-                    "`!editweeklybyname Name [Day] HH:MM` - Edit by name.",
-                    "`!editcountdownbyid ID duration` - Edit countdown by ID.",
-                    "`!editcountdownbyname Name duration` - Edit countdown by name."
-                ]),
-                ("🗑️ Delete Events", [
-                    "`!deleteevent ID` - Delete one event.",
-                    "`!deleteeventbyname Name` - Delete all with matching name.",
-                    "`!deleteallweekly` - Delete all weekly events.",
-                    "`!deleteallcountdowns` - Delete all countdowns.",
-                    "`!deleteallevents` - Nuke all events."
-                ]),
-                ("🔁 Auto-Delete Tools", [
-                    "`!toggleautodelete ID` - Toggle for event.",
-                    "`!checkautodelete ID` - Check auto-delete status."
-                ]),
-                ("🧠 Tips", [
-                    "`!addtip Text` - Add a new tip.",
-                    "`!removetip Index` - Remove by number.",
-                    "`!listalltips` - Show all saved tips."
-                ])
-            ]
-
-            for title, lines in sections:
-                await ctx.send(embed=make_embed(
-                    title=title,
-                    description="\n".join(lines),
-                    color=discord.Color.blue()
-                ))
+            await ctx.send(embeds=HELP_EMBEDS)
 
         except Exception as e:
             await ctx.send(embed=make_embed(
@@ -96,40 +120,30 @@ class MiscCog(commands.Cog):
             guild.text_channels
         )
         if default:
-            self.config["channels"][gid] = default.id
-            save_config(self.config)
-            logger.info(f"🔧 Auto-set default channel for {guild.name} to #{default.name}")
+            self.config.set_channel(gid, default.id)
+            logger.info("🔧 Auto-set default channel for %s to #%s", guild.name, default.name)
 
     # ─── Global Error Handler ────────────────────────────────────────────────
     @commands.Cog.listener()
     async def on_command_error(self, ctx, error):
+        if ctx.command is not None:
+            COMMAND_ERRORS.inc(ctx.command.qualified_name)
+
         if isinstance(error, commands.MissingRequiredArgument):
-            await ctx.send(embed=make_embed(
-                title="⚠️ Missing Parameters",
-                description=f"Correct usage: try `!help` to see how this command works.",
-                color=discord.Color.orange()
-            ))
-            logger.warning(f"[MISSING ARG] {ctx.command} used by {ctx.author}")
+            await ctx.send(embed=MISSING_ARGUMENTS)
+            logger.warning("[MISSING ARG] %s used by %s", ctx.command, ctx.author)
 
         elif isinstance(error, commands.CommandNotFound):
             return  # Silently ignore unknown commands
 
         elif isinstance(error, commands.CommandInvokeError):
-            await ctx.send(embed=make_embed(
-                title="❌ Error",
-                description="An error occurred while running that command.",
-                color=discord.Color.red()
-            ))
-            logger.error(f"[INVOKE ERROR] {error.original}")
+            await ctx.send(embed=COMMAND_ERROR)
+            logger.error("[INVOKE ERROR] %s", error.original)
 
         else:
-            await ctx.send(embed=make_embed(
-                title="⚠️ Unknown Error",
-                description="Something unexpected happened.",
-                color=discord.Color.red()
-            ))
-            logger.error(f"[UNKNOWN ERROR] {error}")
+            await ctx.send(embed=UNKNOWN_ERROR)
+            logger.error("[UNKNOWN ERROR] %s", error)
 
 # ─── Cog Setup ───────────────────────────────────────────────────────────────
 async def setup(bot):
-    await bot.add_cog(MiscCog(bot))
+    await setup_cog(bot, MiscCog)
@@ -2,22 +2,72 @@
 from discord.ext import commands
 import datetime
 import pytz
-import calendar
 
-from bot.utils.helpers import make_embed
-from bot.config_loader import load_config, save_config
+from bot.utils.helpers import make_embed, make_choices, get_zone
+from bot.utils.models import DAY_INDEX
+from bot.utils.prefix_index import PrefixIndex
+from bot.utils.clock import get_clock
+from bot.config_loader import get_config
+from bot.utils.extensions import setup_cog
 from bot.logger import setup_logging
 
 logger = setup_logging("time")
 
+# ─── Static Replies ──────────────────────────────────────────────────────────
+# Built once when the cog loads and reused for every reply
+SETSERVERCLOCK_USAGE = make_embed(
+    title="❌ Invalid Format",
+    description="Usage: `/setserverclock HH:MM` or `/setserverclock Day HH:MM` (24-hour).",
+    color=discord.Color.red()
+)
+SETSERVERDAY_USAGE = make_embed(
+    title="❌ Missing Parameter",
+    description="Usage: `/setserverday Monday`",
+    color=discord.Color.red()
+)
+INVALID_DAY = make_embed(
+    title="❌ Invalid Day",
+    description="Day must be a valid weekday name (e.g., Monday, Friday).",
+    color=discord.Color.red()
+)
+OFFSET_NOT_SET = make_embed(
+    title="❌ Not Set",
+    description="Use `/setserverclock HH:MM` first.",
+    color=discord.Color.red()
+)
+INVALID_TIMEZONE = make_embed(
+    title="❌ Invalid Timezone",
+    description="Use a valid tz string like `Asia/Kolkata`.",
+    color=discord.Color.red()
+)
+NO_TIMEZONE_SET = make_embed(
+    title="❌ No Timezone Set",
+    description="Use `/settimezone Region/City`.",
+    color=discord.Color.red()
+)
+
+# ─── Timezone Autocomplete ───────────────────────────────────────────────────
+def _zone_keys(zone):
+    # "America/Argentina/Buenos_Aires" is also found as "Argentina/...", "Buenos_Aires" and "buenos aires"
+    parts = zone.split("/")
+    for i in range(len(parts)):
+        key = "/".join(parts[i:])
+        yield key
+        if "_" in key:
+            yield key.replace("_", " ")
+
+ZONE_INDEX = PrefixIndex((key, zone) for zone in pytz.common_timezones for key in _zone_keys(zone))
+
 class TimeCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.config = load_config()
+        self.config = get_config(bot)
+        self.clock = get_clock(bot)
 
     # ─── Command: Set Server Clock (Day Optional) ─────────────────────────────
-    @commands.command(name="setserverclock")
-    async def set_server_clock(self, ctx, *args):
+    @commands.hybrid_command(name="setserverclock", description="Set the in-game server time: HH:MM or Day HH:MM.")
+    async def set_server_clock(self, ctx, day_or_time: str = None, time: str = None):
+        args = tuple(a for a in (day_or_time, time) if a)
         try:
             if len(args) == 1:
                 # Format: !setserverclock HH:MM
@@ -27,7 +77,7 @@ class TimeCog(commands.Cog):
                 # Format: !setserverclock Friday 00:00
                 day_name, time_str = args
                 day_name = day_name.capitalize()
-                if day_name not in calendar.day_name:
+                if day_name not in DAY_INDEX:
                     raise ValueError("Invalid day name.")
             else:
                 raise ValueError("Wrong number of arguments.")
@@ -35,11 +85,11 @@ class TimeCog(commands.Cog):
             h, m = map(int, time_str.split(":"))
             assert 0 <= h < 24 and 0 <= m < 60
 
-            now_utc = datetime.datetime.utcnow().replace(second=0, microsecond=0)
+            now_utc = self.clock.utcnow().replace(second=0, microsecond=0)
 
             # Calculate target datetime based on provided time and (optional) day
             if day_name:
-                target_weekday = list(calendar.day_name).index(day_name)
+                target_weekday = DAY_INDEX[day_name]
                 current_weekday = now_utc.weekday()
                 days_ahead = (target_weekday - current_weekday) % 7
             else:
@@ -51,10 +101,9 @@ class TimeCog(commands.Cog):
             # Final offset in minutes
             offset_minutes = int((target - now_utc).total_seconds() / 60)
 
-            self.config["server_offsets"][str(ctx.guild.id)] = offset_minutes
-            save_config(self.config)
+            self.config.set_server_offset(str(ctx.guild.id), offset_minutes)
 
-            logger.info(f"✅ Set server offset for {ctx.guild.name} to {offset_minutes:+} mins")
+            logger.info("✅ Set server offset for %s to %+d mins", ctx.guild.name, offset_minutes)
 
             embed = make_embed(
                 title="✅ Server Clock Set",
@@ -67,33 +116,21 @@ class TimeCog(commands.Cog):
             await ctx.send(embed=embed)
 
         except Exception as e:
-            logger.warning(f"❌ Error in setserverclock: {e}")
-            await ctx.send(embed=make_embed(
-                title="❌ Invalid Format",
-                description="Usage: `!setserverclock HH:MM` or `!setserverclock Day HH:MM` (24-hour).",
-                color=discord.Color.red()
-            ))
+            logger.warning("❌ Error in setserverclock: %s", e)
+            await ctx.send(embed=SETSERVERCLOCK_USAGE)
 
     # ─── Command: Set Server Day ─────────────────────────────
-    @commands.command(name="setserverday")
+    @commands.hybrid_command(name="setserverday", description="Force the in-game server day.")
     async def set_server_day(self, ctx, day: str = None):
         if not day:
-            return await ctx.send(embed=make_embed(
-                title="❌ Missing Parameter",
-                description="Usage: `!setserverday Monday`",
-                color=discord.Color.red()
-            ))
+            return await ctx.send(embed=SETSERVERDAY_USAGE)
 
         day = day.capitalize()
-        if day not in calendar.day_name:
-            return await ctx.send(embed=make_embed(
-                title="❌ Invalid Day",
-                description="Day must be a valid weekday name (e.g., Monday, Friday).",
-                color=discord.Color.red()
-            ))
-
-        now_utc = datetime.datetime.utcnow()
-        target_weekday = list(calendar.day_name).index(day)
+        if day not in DAY_INDEX:
+            return await ctx.send(embed=INVALID_DAY)
+
+        now_utc = self.clock.utcnow()
+        target_weekday = DAY_INDEX[day]
         current_weekday = now_utc.weekday()
 
         # Calculate how many days to shift to get to target weekday
@@ -104,37 +141,32 @@ class TimeCog(commands.Cog):
         new_offset = int((shifted_time - now_utc).total_seconds() / 60)
 
         gid = str(ctx.guild.id)
-        self.config["server_offsets"][gid] = self.config["server_offsets"].get(gid, 0) + new_offset
-        save_config(self.config)
+        self.config.set_server_offset(gid, self.config.server_offset(gid) + new_offset)
 
-        logger.info(f"✅ Set server day for guild {gid} to {day} (offset adjusted by {new_offset} mins)")
+        logger.info("✅ Set server day for guild %s to %s (offset adjusted by %s mins)", gid, day, new_offset)
 
         await ctx.send(embed=make_embed(
             title="📅 Server Day Adjusted",
             fields=[
                 ("Target Day", day, False),
                 ("Offset Change", f"{new_offset:+} minutes", False),
-                ("New Total Offset", f"{self.config['server_offsets'][gid]:+} minutes", False)
+                ("New Total Offset", f"{self.config.server_offset(gid):+} minutes", False)
             ],
             color=discord.Color.green()
         ))
 
     # ─── Command: Get Server Time ────────────────────────────────────────────
-    @commands.command(name="getservertime")
+    @commands.hybrid_command(name="getservertime", description="Show the current server time and offset.")
     async def get_server_time(self, ctx):
         gid = str(ctx.guild.id)
-        offset = self.config["server_offsets"].get(gid)
+        offset = self.config.server_offset(gid, None)
         if offset is None:
-            return await ctx.send(embed=make_embed(
-                title="❌ Not Set",
-                description="Use `!setserverclock HH:MM` first.",
-                color=discord.Color.red()
-            ))
+            return await ctx.send(embed=OFFSET_NOT_SET)
 
-        now_utc = datetime.datetime.utcnow()
+        now_utc = self.clock.utcnow()
         server_now = now_utc + datetime.timedelta(minutes=offset)
 
-        logger.debug(f"🕒 Server time checked by {ctx.author.name} in {ctx.guild.name}")
+        logger.debug("🕒 Server time checked by %s in %s", ctx.author.name, ctx.guild.name)
 
         embed = make_embed(
             title="🕒 Server Time",
@@ -147,39 +179,36 @@ class TimeCog(commands.Cog):
         await ctx.send(embed=embed)
 
     # ─── Command: Set User Timezone ──────────────────────────────────────────
-    @commands.command(name="settimezone")
+    @commands.hybrid_command(name="settimezone", description="Set your local timezone (Region/City).")
     async def set_timezone(self, ctx, tz: str):
-        try:
-            pytz.timezone(tz)  # Validate timezone
-            self.config["user_timezones"][str(ctx.author.id)] = tz
-            save_config(self.config)
-            logger.info(f"✅ {ctx.author.name} set their timezone to {tz}")
-            await ctx.send(embed=make_embed(
-                title="✅ Timezone Set",
-                description=f"Your timezone is now **{tz}**.",
-                color=discord.Color.green()
-            ))
+        zone = get_zone(tz)
+        if zone is None:
+            return await ctx.send(embed=INVALID_TIMEZONE)
+
+        # Stored under the canonical name so every later lookup hits the same cache entry
+        tz = zone.zone
+        self.config.set_user_timezone(str(ctx.author.id), tz)
+        logger.info("✅ %s set their timezone to %s", ctx.author.name, tz)
+        await ctx.send(embed=make_embed(
+            title="✅ Timezone Set",
+            description=f"Your timezone is now **{tz}**.",
+            color=discord.Color.green()
+        ))
 
-        except pytz.UnknownTimeZoneError:
-            await ctx.send(embed=make_embed(
-                title="❌ Invalid Timezone",
-                description="Use a valid tz string like `Asia/Kolkata`.",
-                color=discord.Color.red()
-            ))
+    @set_timezone.autocomplete("tz")
+    async def timezone_autocomplete(self, interaction: discord.Interaction, current: str):
+        return make_choices(ZONE_INDEX.search(current))
 
     # ─── Command: Get User Timezone ──────────────────────────────────────────
-    @commands.command(name="gettimezone")
+    @commands.hybrid_command(name="gettimezone", description="Show your current local timezone.")
     async def get_timezone(self, ctx):
         uid = str(ctx.author.id)
-        tz = self.config["user_timezones"].get(uid)
-        if not tz:
-            return await ctx.send(embed=make_embed(
-                title="❌ No Timezone Set",
-                description="Use `!settimezone Region/City`.",
-                color=discord.Color.red()
-            ))
-
-        now = datetime.datetime.now(pytz.timezone(tz))
+        tz = self.config.user_timezone(uid)
+        zone = get_zone(tz) if tz else None
+        if not zone:
+            return await ctx.send(embed=NO_TIMEZONE_SET)
+
+        now = datetime.datetime.fromtimestamp(self.clock.time(), zone)
         await ctx.send(embed=make_embed(
             title="🌐 Your Timezone",
             fields=[
@@ -191,4 +220,4 @@ class TimeCog(commands.Cog):
 
 # ─── Setup ───────────────────────────────────────────────────────────────────
 async def setup(bot):
-    await bot.add_cog(TimeCog(bot))
+    await setup_cog(bot, TimeCog)
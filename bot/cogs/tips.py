@@ -1,64 +1,179 @@
 ﻿import discord
 from discord.ext import commands, tasks
-import random
+import asyncio
+import zlib
 
 from bot.utils.helpers import make_embed
-from bot.utils.storage import load_all_tips, save_all_tips, get_guild_tips
-from bot.config_loader import load_config, save_config
+from bot.utils.storage import (
+    load_guild_tips, tips_pending, get_guild_tips, add_tip, remove_tip, next_daily_tip,
+)
+from bot.utils.models import MINUTES_PER_DAY, next_daily_epoch
+from bot.utils.scheduler import DueQueue
+from bot.utils.guild_cache import GuildCache
+from bot.utils.dispatcher import get_announcer
+from bot.utils.clock import get_clock
+from bot.utils.sharding import owns_guild
+from bot.utils.paginator import Paginator, PAGE_SIZE
+from bot.config_loader import get_config, GUILD_CACHE_SIZE
+from bot.utils.extensions import setup_cog, take_over
+from bot.logger import setup_logging
+
+logger = setup_logging("tips")
+
+# Longest the tip scheduler sleeps before re-reading the wall clock
+MAX_SCHEDULER_SLEEP = 300
+
+# ─── Static Replies ──────────────────────────────────────────────────────────
+# Built once when the cog loads and reused for every reply
+NO_TIPS = make_embed(
+    title="📝 No Tips Available",
+    description="There are currently no tips for this server.",
+    color=discord.Color.blue()
+)
+SETTIPTIME_USAGE = make_embed(
+    title="❌ Invalid Time",
+    description="Usage: `/settiptime HH:MM` (24-hour, server time).",
+    color=discord.Color.red()
+)
+
+def default_tip_minute(guild_id: str) -> int:
+    """A stable per-guild minute of the day, so guilds that never chose a time are spread out."""
+    return zlib.crc32(guild_id.encode()) % MINUTES_PER_DAY
 
 class TipsCog(commands.Cog):
+    # Taken over by the new instance on /reload instead of being rebuilt from storage
+    HANDOVER = ("all_tips", "tip_versions", "queue", "wakeup")
+
     def __init__(self, bot):
         self.bot = bot
-        self.config = load_config()
-        self.all_tips = load_all_tips()
-        self.send_daily_tip.start()
-
-    # ─── Background Task: Daily Tip ──────────────────────────────────────────
-    @tasks.loop(hours=24)
-    async def send_daily_tip(self):
-        for guild_id, channel_id in self.config.get("channels", {}).items():
-            channel = self.bot.get_channel(channel_id)
-            tips = get_guild_tips(self.all_tips, guild_id)
-            if channel and tips:
-                tip = random.choice(tips)
-                embed = make_embed(
-                    title="🧠 Daily Tip",
-                    description=tip,
-                    color=discord.Color.gold()
-                )
-                await channel.send(embed=embed)
+        self.config = get_config(bot)
+        self.clock = get_clock(bot)
+        self.config.subscribe(self.on_config_changed)
+        self.announcer = get_announcer(bot)
+        if not take_over(self):
+            self.all_tips = GuildCache(load_guild_tips, GUILD_CACHE_SIZE, is_pinned=tips_pending)
+            # Bumped on every tip change so open /listalltips pages re-render
+            self.tip_versions = {}
+
+            # One heap entry per guild with an announcement channel, at its next delivery instant
+            self.queue = DueQueue()
+            self.wakeup = asyncio.Event()
+            now_ts = self.clock.time()
+            for guild_id in self.config.channels:
+                self.schedule_guild(guild_id, now_ts)
+
+        self.send_daily_tips.start()
+
+    def cog_unload(self):
+        # The loop only awaits while sleeping, so cancelling never interrupts a delivery round
+        self.send_daily_tips.cancel()
+        self.config.unsubscribe(self.on_config_changed)
+
+    def on_config_changed(self, section, key, value):
+        if section in ("channels", "server_offsets", "tip_times"):
+            self.schedule_guild(key)
+
+    # ─── Scheduling Helpers ──────────────────────────────────────────────────
+    def tip_minute(self, guild_id: str) -> int:
+        minute = self.config.tip_time(guild_id)
+        return default_tip_minute(guild_id) if minute is None else minute
+
+    def schedule_guild(self, guild_id: str, now_ts=None):
+        """Queue the guild's next delivery, strictly after `now_ts`, in its server time."""
+        if not owns_guild(guild_id) or self.config.channel_id(guild_id) is None:
+            return self.queue.cancel(guild_id)  # no channel, or another cluster worker's guild
+        now_ts = self.clock.time() if now_ts is None else now_ts
+        due = next_daily_epoch(now_ts, self.tip_minute(guild_id), self.config.server_offset(guild_id))
+        earliest = self.queue.peek()
+        self.queue.schedule(guild_id, due)
+        if earliest is None or due < earliest:
+            self.wakeup.set()
+
+    # ─── Background Task: Daily Tips ─────────────────────────────────────────
+    @tasks.loop()
+    async def send_daily_tips(self):
+        self.wakeup.clear()
+        next_at = self.queue.peek()
+        delay = MAX_SCHEDULER_SLEEP if next_at is None else min(next_at - self.clock.time(), MAX_SCHEDULER_SLEEP)
+        if delay > 0:
+            await self.clock.wait(self.wakeup, delay)
+
+        now_ts = self.clock.time()
+        for guild_id, due_at in self.queue.pop_due(now_ts):
+            try:
+                self.deliver(guild_id, due_at)
+            except Exception as e:
+                logger.error("❌ Failed to send daily tip for guild %s: %s", guild_id, e)
+            self.schedule_guild(guild_id, now_ts)
+
+    def deliver(self, guild_id: str, due_at: float):
+        channel = self.bot.get_channel(self.config.channel_id(guild_id))
+        if not channel:
+            return
+        tip = next_daily_tip(self.all_tips, guild_id)
+        if tip is None:
+            return
+        # Coalesced with any event announcement due in the same channel
+        self.announcer.announce(
+            channel,
+            make_embed(title="🧠 Daily Tip", description=tip, color=discord.Color.gold()),
+            due_at=due_at,
+            on_sent=lambda: self.on_tip_sent(guild_id, due_at)
+        )
+
+    def on_tip_sent(self, guild_id: str, due_at: float):
+        logger.info("[TIP SENT] Daily tip for guild %s", guild_id, extra={"guild": guild_id})
+
+    @send_daily_tips.before_loop
+    async def before_send_daily_tips(self):
+        await self.bot.wait_until_ready()
 
     # ─── Tip Commands ────────────────────────────────────────────────────────
-    @commands.command(name="listalltips", help="List all tips for this server.")
+    @commands.hybrid_command(name="listalltips", description="List all tips for this server.")
     async def listalltips(self, ctx):
         guild_id = str(ctx.guild.id)
         tips = get_guild_tips(self.all_tips, guild_id)
         if not tips:
-            embed = make_embed(
-                title="📝 No Tips Available",
-                description="There are currently no tips for this server.",
-                color=discord.Color.blue()
-            )
-            return await ctx.send(embed=embed)
+            return await ctx.send(embed=NO_TIPS)
 
-        # Paginate if too many
-        pages = [tips[i:i+10] for i in range(0, len(tips), 10)]
-        for page_num, chunk in enumerate(pages, start=1):
-            lines = [f"**{i+1 + (page_num-1)*10}.** {tip}" for i, tip in enumerate(chunk)]
-            embed = make_embed(
-                title=f"📝 Tips (Page {page_num}/{len(pages)})",
-                description="\n".join(lines),
+        def render(page, total):
+            start = page * PAGE_SIZE
+            tips = get_guild_tips(self.all_tips, guild_id)
+            lines = [f"**{i}.** {tip}" for i, tip in enumerate(tips[start:start + PAGE_SIZE], start=start + 1)]
+            return make_embed(
+                title=f"📝 Tips (Page {page + 1}/{total})",
+                description="\n".join(lines) or "—",
                 color=discord.Color.blue()
             )
-            await ctx.send(embed=embed)
 
-    @commands.command(name="addtip", help="(Admin) Add a new daily tip.")
+        count = lambda: -(-len(get_guild_tips(self.all_tips, guild_id)) // PAGE_SIZE)
+        version = lambda: self.tip_versions.get(guild_id, 0)
+        await Paginator(ctx.author, render, count, version).send(ctx)
+
+    @commands.hybrid_command(name="settiptime", description="(Admin) Set when the daily tip is posted (HH:MM server time).")
+    @commands.has_permissions(administrator=True)
+    async def settiptime(self, ctx, time_of_day: str = None):
+        try:
+            h, m = map(int, time_of_day.strip().split(":"))
+            assert 0 <= h < 24 and 0 <= m < 60
+        except Exception:
+            return await ctx.send(embed=SETTIPTIME_USAGE)
+
+        guild_id = str(ctx.guild.id)
+        self.config.set_tip_time(guild_id, h * 60 + m)
+        logger.info("✅ Daily tip time for guild %s set to %02d:%02d server time", guild_id, h, m)
+        await ctx.send(embed=make_embed(
+            title="✅ Daily Tip Time Set",
+            description=f"The daily tip will be posted at **{h:02d}:{m:02d}** server time.",
+            color=discord.Color.green()
+        ))
+
+    @commands.hybrid_command(name="addtip", description="(Admin) Add a new daily tip.")
     @commands.has_permissions(administrator=True)
     async def addtip(self, ctx, *, tip: str):
         guild_id = str(ctx.guild.id)
-        tips = get_guild_tips(self.all_tips, guild_id)
-        tips.append(tip)
-        save_all_tips(self.all_tips)
+        add_tip(self.all_tips, guild_id, tip)
+        self.tip_versions[guild_id] = self.tip_versions.get(guild_id, 0) + 1
         embed = make_embed(
             title="✅ Tip Added",
             description=tip,
@@ -66,7 +181,7 @@ class TipsCog(commands.Cog):
         )
         await ctx.send(embed=embed)
 
-    @commands.command(name="removetip", help="(Admin) Remove a tip by its index.")
+    @commands.hybrid_command(name="removetip", description="(Admin) Remove a tip by its index.")
     @commands.has_permissions(administrator=True)
     async def removetip(self, ctx, index: int):
         guild_id = str(ctx.guild.id)
@@ -80,8 +195,8 @@ class TipsCog(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        removed = tips.pop(idx)
-        save_all_tips(self.all_tips)
+        removed = remove_tip(self.all_tips, guild_id, idx)
+        self.tip_versions[guild_id] = self.tip_versions.get(guild_id, 0) + 1
         embed = make_embed(
             title="🗑️ Tip Removed",
             description=removed,
@@ -91,4 +206,4 @@ class TipsCog(commands.Cog):
 
 # ─── Setup Function ─────────────────────────────────────────────────────────
 async def setup(bot):
-    await bot.add_cog(TipsCog(bot))
+    await setup_cog(bot, TipsCog)
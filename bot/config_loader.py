@@ -1,7 +1,12 @@
 ﻿import os
 import json
+import time
 from dotenv import load_dotenv
 from bot.logger import setup_logging
+from bot.utils.persistence import JsonWriter
+from bot.utils.metrics import PERSISTENCE_WRITE_SECONDS
+from bot.utils.tracing import storage_call
+from bot.utils.sqlite_store import get_store
 
 logger = setup_logging("config")
 
@@ -9,26 +14,243 @@ logger = setup_logging("config")
 load_dotenv()
 TOKEN = os.getenv("DISCORDBOT_TOKEN")
 
-# JSON file paths
+# Announcement fan-out: max sends in flight, and longest 429 wait discord.py absorbs itself
+ANNOUNCE_CONCURRENCY = int(os.getenv("ANNOUNCE_CONCURRENCY", "16"))
+MAX_RATELIMIT_TIMEOUT = float(os.getenv("MAX_RATELIMIT_TIMEOUT", "10"))
+# Announcements queued for one channel within this many seconds go out as a single message
+ANNOUNCE_COALESCE_WINDOW = float(os.getenv("ANNOUNCE_COALESCE_WINDOW", "2"))
+
+def _parse_shard_ids(value):
+    """Parse "0-3" or "0,2,5" into a sorted list of shard ids, or None for all shards."""
+    ids = set()
+    for part in filter(None, (p.strip() for p in value.split(","))):
+        lo, _, hi = part.partition("-")
+        ids.update(range(int(lo), int(hi or lo) + 1))
+    return sorted(ids) or None
+
+# Commands are slash commands. PREFIX_COMMANDS=1 also keeps the old "!" text commands,
+# which needs the privileged message-content intent; SYNC_COMMANDS=0 skips the start-up sync.
+PREFIX_COMMANDS = os.getenv("PREFIX_COMMANDS", "0").strip().lower() in ("1", "true", "yes")
+SYNC_COMMANDS = os.getenv("SYNC_COMMANDS", "1").strip().lower() in ("1", "true", "yes")
+
+# Sharding: SHARD_COUNT=auto or a number runs an AutoShardedBot. bot/cluster.py sets SHARD_IDS
+# per worker process, so each worker only connects, schedules and caches its own shards' guilds.
+_shard_count = os.getenv("SHARD_COUNT", "").strip().lower()
+SHARDED = bool(_shard_count)
+SHARD_COUNT = int(_shard_count) if _shard_count.isdigit() else None
+SHARD_IDS = _parse_shard_ids(os.getenv("SHARD_IDS", ""))
+CLUSTER_MODE = SHARD_IDS is not None
+SHARD_LABEL = f"{SHARD_IDS[0]}-{SHARD_IDS[-1]}of{SHARD_COUNT}" if CLUSTER_MODE else "all"
+CLUSTER_WORKERS = int(os.getenv("CLUSTER_WORKERS", str(os.cpu_count() or 1)))
+# Port a cluster worker serves its own /metrics and /health on; bot/cluster.py sets it, the launcher keeps PORT
+WORKER_PORT = int(os.getenv("WORKER_PORT", "0")) or None
+
+# JSON file paths (events.json and tips.json are split into per-guild shards on first run)
 CONFIG_PATH = "config.json"
 EVENTS_PATH = "events.json"
 TIPS_PATH = "tips.json"
+DATA_DIR = os.getenv("DATA_DIR", "data")
+EVENTS_DIR = os.path.join(DATA_DIR, "events")
+TIPS_DIR = os.path.join(DATA_DIR, "tips")
+# Each cluster worker keeps the due index of its own shards
+DUE_INDEX_PATH = os.path.join(DATA_DIR, "due_index.json" if not CLUSTER_MODE else f"due_index.{SHARD_LABEL}.json")
+
+# Guilds whose events/tips stay resident before the least recently used are evicted
+GUILD_CACHE_SIZE = int(os.getenv("GUILD_CACHE_SIZE", "256"))
+
+# Storage backend: "json" (default) or "sqlite"; see bot/utils/sqlite_store.py to migrate
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json").lower()
+SQLITE_PATH = os.getenv("SQLITE_PATH", "bot.db")
+
+# Seconds to coalesce saves before a background write
+SAVE_DELAY = float(os.getenv("SAVE_DELAY", "2"))
+
+# Commands taking longer than this many seconds are logged with a per-phase breakdown
+SLOW_COMMAND_SECONDS = float(os.getenv("SLOW_COMMAND_SECONDS", "2"))
+
+# Occurrences missed by up to this many seconds (stalled loop, reconnect, restart) are still announced
+FIRE_GRACE = float(os.getenv("FIRE_GRACE", "600"))
+
+# Cluster workers re-read config written by the others (e.g. a user's timezone) at most this often
+CONFIG_RELOAD_SECONDS = float(os.getenv("CONFIG_RELOAD_SECONDS", "5"))
+
+# Cluster workers share config.json, so each write merges only this process's changed entries
+_config_changes = {}
+
+def _take_config_changes() -> dict:
+    changes = dict(_config_changes)
+    _config_changes.clear()
+    return changes
+
+def _apply_config_changes(config, changes):
+    for (section, key), value in changes.items():
+        config.setdefault(section, {})[key] = value
+
+_config_writer = JsonWriter(CONFIG_PATH, SAVE_DELAY, merge=_apply_config_changes if CLUSTER_MODE else None)
+
+def get_db():
+    """Return the shared SqliteStore when the SQLite backend is enabled, else None."""
+    return get_store(SQLITE_PATH) if STORAGE_BACKEND == "sqlite" else None
 
 # ─── Config Loaders ─────────────────────────────────────────────────────────
 def load_config():
+    db = get_db()
+    if db:
+        return db.load_config()
     try:
         with open(CONFIG_PATH, "r") as f:
             config = json.load(f)
             logger.info("✅ Loaded config.json")
             return config
     except Exception as e:
-        logger.warning(f"⚠️ Failed to load config.json: {e}")
+        logger.warning("⚠️ Failed to load config.json: %s", e)
         return {"channels": {}, "server_offsets": {}, "user_timezones": {}}
 
-def save_config(config):
+def reload_config():
+    """Re-read config other processes may have changed, or None if it can't be read."""
+    db = get_db()
+    if db:
+        return db.load_config()
     try:
-        with open(CONFIG_PATH, "w") as f:
-            json.dump(config, f, indent=4)
-        logger.info("💾 Saved config.json")
+        with open(CONFIG_PATH, "r") as f:
+            return json.load(f)
     except Exception as e:
-        logger.error(f"❌ Failed to save config.json: {e}")
+        logger.warning("⚠️ Failed to reload config.json: %s", e)
+        return None
+
+def config_version():
+    """Changes whenever another process may have written config: SQLite's data_version, or the file's
+    inode and mtime (every write renames a new file into place)."""
+    db = get_db()
+    if db:
+        return db.data_version()
+    try:
+        stat = os.stat(CONFIG_PATH)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+def save_config(config):
+    db = get_db()
+    if db:
+        with PERSISTENCE_WRITE_SECONDS.time("config"):
+            return db.replace_config(config)
+    _config_writer.mark_dirty(
+        lambda: {k: dict(v) if isinstance(v, dict) else v for k, v in config.items()}
+    )
+
+@storage_call
+def set_config_value(config, section, key, value):
+    """Set one config entry and persist it (a single row on SQLite)."""
+    config.setdefault(section, {})[key] = value
+    db = get_db()
+    if db:
+        db.set_config_value(section, key, value)
+    elif CLUSTER_MODE:
+        _config_changes[(section, key)] = value
+        _config_writer.mark_dirty(_take_config_changes)
+    else:
+        save_config(config)
+
+# ─── Shared Config Service ──────────────────────────────────────────────────
+class BotConfig:
+    """The one in-memory copy of config, shared by every cog via `get_config(bot)`.
+
+    Writes go through the typed setters, which persist the single changed
+    entry and then call every subscriber with (section, key, value). In
+    cluster mode the getters also pick up entries other workers wrote.
+    """
+
+    def __init__(self):
+        self.version = config_version() if CLUSTER_MODE else None
+        self.checked_at = time.monotonic()
+        self.data = load_config()
+        for section in ("channels", "server_offsets", "user_timezones", "tip_times"):
+            self.data.setdefault(section, {})
+        self.listeners = []
+
+    # ─── Cluster Reload ──────────────────────────────────────────────────────
+    def _refresh(self):
+        """Reload config when another worker changed it, at most every CONFIG_RELOAD_SECONDS.
+
+        Subscribers aren't called: per-guild entries are only set by the
+        worker holding the guild's shard, and user timezones are read on use.
+        """
+        if not CLUSTER_MODE or time.monotonic() - self.checked_at < CONFIG_RELOAD_SECONDS:
+            return
+        if _config_changes or _config_writer.pending:
+            return  # our own entries aren't in the file yet; reloading now would drop them
+        self.checked_at = time.monotonic()
+        version = config_version()
+        if version == self.version:
+            return
+        fresh = reload_config()
+        if fresh is None:
+            return
+        self.version = version
+        for section, values in fresh.items():
+            if isinstance(values, dict):
+                # In place, so callers holding a section (e.g. `channels`) see the new entries
+                current = self.data.setdefault(section, {})
+                current.clear()
+                current.update(values)
+        logger.info("🔄 Reloaded config changed by another worker")
+
+    # ─── Getters ─────────────────────────────────────────────────────────────
+    @property
+    def channels(self) -> dict:
+        self._refresh()
+        return self.data["channels"]
+
+    def channel_id(self, guild_id: str):
+        self._refresh()
+        return self.data["channels"].get(guild_id)
+
+    def server_offset(self, guild_id: str, default=0):
+        self._refresh()
+        return self.data["server_offsets"].get(guild_id, default)
+
+    def user_timezone(self, user_id: str):
+        self._refresh()
+        return self.data["user_timezones"].get(user_id)
+
+    def tip_time(self, guild_id: str):
+        """Server-time minute of the day the guild's daily tip goes out, or None if never set."""
+        self._refresh()
+        return self.data["tip_times"].get(guild_id)
+
+    # ─── Setters ─────────────────────────────────────────────────────────────
+    def set_channel(self, guild_id: str, channel_id: int):
+        self._set("channels", guild_id, channel_id)
+
+    def set_server_offset(self, guild_id: str, minutes: int):
+        self._set("server_offsets", guild_id, minutes)
+
+    def set_user_timezone(self, user_id: str, tz: str):
+        self._set("user_timezones", user_id, tz)
+
+    def set_tip_time(self, guild_id: str, minute_of_day: int):
+        self._set("tip_times", guild_id, minute_of_day)
+
+    def _set(self, section, key, value):
+        set_config_value(self.data, section, key, value)
+        for listener in list(self.listeners):
+            try:
+                listener(section, key, value)
+            except Exception as e:
+                logger.error("❌ Config listener failed for %s.%s: %s", section, key, e)
+
+    # ─── Change Notifications ────────────────────────────────────────────────
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+
+def get_config(bot) -> BotConfig:
+    """Return the config service shared by every cog, loading it on first use."""
+    if getattr(bot, "settings", None) is None:
+        bot.settings = BotConfig()
+    return bot.settings
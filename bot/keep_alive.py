@@ -1,30 +1,54 @@
-﻿from flask import Flask, jsonify
-from threading import Thread
-import logging
-import datetime
+﻿import datetime
+import os
 
-app = Flask(__name__)
-logging.basicConfig(level=logging.INFO)
+from aiohttp import web
 
-@app.route("/")
-def home():
-    logging.info("✅ Ping received on root route.")
-    return "Bot is alive!", 200
+from bot.utils import metrics
+from bot.logger import setup_logging, sampled
 
-@app.route("/status")
-def status():
+logger = setup_logging("keep_alive")
+
+PORT = int(os.getenv("PORT", "8080"))
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Uptime monitors ping every few seconds; log their hits at most this often
+PING_LOG_SECONDS = 300
+
+# ─── Routes ──────────────────────────────────────────────────────────────────
+async def home(request):
+    logger.info("✅ Ping received on root route.", extra=sampled(PING_LOG_SECONDS))
+    return web.Response(text="Bot is alive!")
+
+async def status(request):
     now = datetime.datetime.utcnow().isoformat() + "Z"
-    logging.info("📡 Status check at %s", now)
-    return jsonify({"status": "alive", "timestamp": now}), 200
+    logger.info("📡 Status check at %s", now, extra=sampled(PING_LOG_SECONDS))
+    return web.json_response({"status": "alive", "timestamp": now})
+
+async def health(request):
+    # Readiness, not liveness: 503 until the gateway is up and every background loop runs
+    ready, checks = request.app["health"]()
+    return web.json_response({"ready": ready, **checks}, status=200 if ready else 503)
+
+async def prometheus_metrics(request):
+    return web.Response(body=metrics.render().encode(), headers={"Content-Type": METRICS_CONTENT_TYPE})
+
+def create_app(health_check) -> web.Application:
+    """`health_check()` returns (ready, {check: detail}) for `/health`."""
+    app = web.Application()
+    app["health"] = health_check
+    app.router.add_get("/", home)
+    app.router.add_get("/status", status)
+    app.router.add_get("/health", health)
+    app.router.add_get("/metrics", prometheus_metrics)
+    return app
 
-def run():
+# ─── Server ──────────────────────────────────────────────────────────────────
+async def keep_alive(health_check, port: int = PORT) -> web.AppRunner:
+    """Serve the keep-alive routes on the running event loop; `await runner.cleanup()` stops it."""
+    runner = web.AppRunner(create_app(health_check), access_log=None)
+    await runner.setup()
     try:
-        logging.info("🚀 Starting keep-alive server on port 8080")
-        app.run(host="0.0.0.0", port=8080, threaded=True)
-    except Exception as e:
-        logging.error(f"❌ Keep-alive server failed: {e}")
-
-def keep_alive():
-    t = Thread(target=run)
-    t.daemon = True  # Ensure thread exits on shutdown
-    t.start()
+        await web.TCPSite(runner, "0.0.0.0", port).start()
+        logger.info("🚀 Keep-alive server listening on port %s", port)
+    except OSError as e:
+        logger.error("❌ Keep-alive server failed: %s", e)
+    return runner
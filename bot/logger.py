@@ -1,20 +1,126 @@
+import atexit
+import contextvars
+import datetime
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+import time
+
+from dotenv import load_dotenv
+
+# Loggers are created while bot.config_loader is still importing, so read .env here too
+load_dotenv()
+
+# LOG_LEVEL sets the default level (discord.py included); LOG_LEVELS overrides it per
+# logger, e.g. "dispatcher=DEBUG,storage=WARNING,discord.gateway=WARNING"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").strip().upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+# "text" (default) or "json": one JSON object per line, with guild and command when known
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").strip().lower()
+
+TEXT_FORMAT = "[%(asctime)s] [%(levelname)s] %(name)s: %(message)s"
+
+# Guild and command of the code running in the current task, attached to its records
+_context = contextvars.ContextVar("log_context", default={})
+
+_listener = None
+
+# ─── Record Context ──────────────────────────────────────────────────────────
+def log_context(**fields):
+    """Tag every record logged from the current task, e.g. `log_context(guild=..., command=...)`."""
+    _context.set({**_context.get(), **fields})
+
+def sampled(seconds: float) -> dict:
+    """`extra=` for a noisy call site: log it at most once per `seconds`, counting what was dropped."""
+    return {"sample_seconds": seconds}
+
+
+class ContextFilter(logging.Filter):
+    """Copies the task's log context onto the record; runs in the logging thread, not the listener."""
+
+    def filter(self, record):
+        for key, value in _context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Drops records from a `sampled()` call site logged again within its interval."""
+
+    def __init__(self):
+        super().__init__()
+        self.sites = {}  # (logger, file, line) -> [last emitted, suppressed since]
+
+    def filter(self, record):
+        seconds = getattr(record, "sample_seconds", None)
+        if seconds is None:
+            return True
+        now = time.monotonic()
+        site = self.sites.setdefault((record.name, record.pathname, record.lineno), [None, 0])
+        if site[0] is not None and now - site[0] < seconds:
+            site[1] += 1
+            return False
+        if site[1]:
+            record.msg = f"{record.msg} ({site[1]} similar in the last {now - site[0]:.0f}s)"
+        site[0], site[1] = now, 0
+        return True
+
+# ─── Formatters ──────────────────────────────────────────────────────────────
+class JsonFormatter(logging.Formatter):
+    # The message already carries any traceback: QueueHandler formats it before enqueueing
+    FIELDS = ("guild", "command")
+
+    def format(self, record):
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in self.FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = str(value)
+        return json.dumps(entry, ensure_ascii=False)
+
+# ─── Pipeline ────────────────────────────────────────────────────────────────
+def _configure():
+    """Route every logger through one queue; a listener thread does the formatting and writing."""
+    global _listener
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if LOG_FORMAT == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT, datefmt="%H:%M:%S"))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter())
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(LOG_LEVEL)
+    for part in filter(None, (p.strip() for p in LOG_LEVELS.split(","))):
+        name, _, level = part.partition("=")
+        logging.getLogger(name.strip()).setLevel(level.strip().upper())
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    # Stopping drains the queue, so records logged just before exit still get written
+    atexit.register(_listener.stop)
 
 def setup_logging(name="discord_bot"):
+    if _listener is None:
+        _configure()
     logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
 
-    # Avoid duplicate handlers if reloaded
+    # Avoid duplicate handlers if reloaded; records propagate to the root's queue handler
     if logger.hasHandlers():
         logger.handlers.clear()
-
-    stream_handler = logging.StreamHandler(sys.stdout)
-    stream_handler.setLevel(logging.DEBUG)
-    stream_formatter = logging.Formatter(
-        "[%(asctime)s] [%(levelname)s] %(name)s: %(message)s", datefmt="%H:%M:%S"
-    )
-    stream_handler.setFormatter(stream_formatter)
-
-    logger.addHandler(stream_handler)
+    logger.propagate = True
     return logger
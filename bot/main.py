@@ -1,45 +1,136 @@
 ﻿import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import asyncio
+import signal
+import time
 import discord
-from discord.ext import commands
-import os
-from keep_alive import keep_alive
-from bot.config_loader import TOKEN
-from bot.logger import setup_logging
+from discord.ext import commands, tasks
+from keep_alive import keep_alive, PORT
+from bot.config_loader import (
+    TOKEN, MAX_RATELIMIT_TIMEOUT, SHARDED, SHARD_COUNT, SHARD_IDS, SHARD_LABEL, PREFIX_COMMANDS, SYNC_COMMANDS,
+    SLOW_COMMAND_SECONDS, WORKER_PORT,
+)
+from bot.logger import setup_logging, log_context
+from bot.utils.persistence import flush_all
+from bot.utils.dispatcher import get_announcer
+from bot.utils.extensions import load_cogs
+from bot.utils import tracing
+from bot.utils.metrics import (
+    COMMAND_SECONDS, ANNOUNCEMENTS, GATEWAY_LATENCY_SECONDS, GUILDS,
+)
 
 
 
 logger = setup_logging("main")
 
 # ─── Intents and Bot ─────────────────────────────────────────────────────────
+# Slash commands need no message content; without it only messages that mention the bot carry text
 intents = discord.Intents.default()
-intents.message_content = True
-bot = commands.Bot(command_prefix="!", intents=intents, help_command=None)
-
-# ─── Dynamic Cog Loader ──────────────────────────────────────────────────────
-async def load_cogs():
-    for filename in os.listdir("./bot/cogs"):
-        if filename.endswith(".py") and not filename.startswith("_"):
-            extension = f"bot.cogs.{filename[:-3]}"
-            try:
-                await bot.load_extension(extension)
-                logger.info(f"✅ Loaded cog: {extension}")
-            except Exception as e:
-                logger.error(f"❌ Failed to load {extension}: {e}")
+intents.message_content = PREFIX_COMMANDS
+bot_options = dict(
+    command_prefix=commands.when_mentioned_or("!") if PREFIX_COMMANDS else commands.when_mentioned,
+    intents=intents, help_command=None,
+    max_ratelimit_timeout=MAX_RATELIMIT_TIMEOUT,  # longer 429s surface to the Announcer
+    http_trace=tracing.http_trace_config()  # Discord round-trips count towards the running command
+)
+if SHARDED:
+    # SHARD_IDS is only set for bot/cluster.py workers; otherwise this process runs every shard
+    bot = commands.AutoShardedBot(shard_count=SHARD_COUNT, shard_ids=SHARD_IDS, **bot_options)
+else:
+    bot = commands.Bot(**bot_options)
+
+# ─── Command Timing ──────────────────────────────────────────────────────────
+async def begin_interaction_trace(interaction):
+    tracing.begin()
+    return True
+
+# Runs first for every slash command, before options are converted
+bot.tree.interaction_check = begin_interaction_trace
+
+@bot.before_invoke
+async def start_command_timer(ctx):
+    tracing.mark_invoked()
+    # Everything the command logs from here on carries its guild and name
+    log_context(guild=ctx.guild and ctx.guild.id, command=ctx.command.qualified_name)
+
+@bot.after_invoke
+async def record_command_time(ctx):
+    # Failures are counted in MiscCog.on_command_error
+    phases = tracing.current().phases(time.perf_counter())
+    name = ctx.command.qualified_name
+    COMMAND_SECONDS.observe(phases["total"], name)
+    if phases["total"] >= SLOW_COMMAND_SECONDS:
+        breakdown = ", ".join(f"{phase} {seconds * 1000:.0f}ms" for phase, seconds in phases.items())
+        logger.warning("🐢 Slow command %s (%s) in guild %s by %s (%s), args %s",
+                       name, breakdown, ctx.guild and ctx.guild.id, ctx.author, ctx.author.id, ctx.kwargs)
+
+# ─── Metrics ─────────────────────────────────────────────────────────────────
+def announcement_totals() -> dict:
+    announcer = get_announcer(bot)
+    return {"sent": announcer.sent, "failed": announcer.failed, "coalesced": announcer.saved}
+
+GATEWAY_LATENCY_SECONDS.set_function(lambda: bot.latency)
+GUILDS.set_function(lambda: len(bot.guilds))
+ANNOUNCEMENTS.set_function(announcement_totals)
+
+# ─── Slash Command Sync ──────────────────────────────────────────────────────
+async def sync_commands():
+    # Cluster workers share one command tree, so only the worker holding shard 0 syncs it
+    if not SYNC_COMMANDS or (SHARD_IDS is not None and 0 not in SHARD_IDS):
+        return
+    try:
+        synced = await bot.tree.sync()
+        logger.info("✅ Synced %s slash command(s)", len(synced))
+    except discord.HTTPException as e:
+        logger.error("❌ Failed to sync slash commands: %s", e)
+
+bot.setup_hook = sync_commands
+
+# ─── Health Check ────────────────────────────────────────────────────────────
+def health_check():
+    """Ready once the gateway is connected and every cog's background loop is running."""
+    loops = {}
+    for cog in bot.cogs.values():
+        for name, attr in vars(type(cog)).items():
+            if isinstance(attr, tasks.Loop):
+                loops[f"{cog.qualified_name}.{name}"] = getattr(cog, name).is_running()
+    gateway = bot.is_ready() and not bot.is_closed()
+    return gateway and all(loops.values()), {"gateway": gateway, "loops": loops}
 
 # ─── Bot Events ──────────────────────────────────────────────────────────────
 @bot.event
 async def on_ready():
-    logger.info(f"✅ Logged in as {bot.user} (ID: {bot.user.id})")
+    logger.info("✅ Logged in as %s (ID: %s)", bot.user, bot.user.id)
+    if SHARDED:
+        logger.info("🧩 Running shards %s with %s guild(s)", SHARD_LABEL, len(bot.guilds))
     logger.info("Bot is ready and running.")
 
+@bot.event
+async def on_message(message):
+    # Without the message-content intent most messages arrive empty; drop them before command parsing
+    if message.author.bot or not message.content:
+        return
+    tracing.begin()
+    await bot.process_commands(message)
+
 # ─── Main Entry ──────────────────────────────────────────────────────────────
 async def main():
-    await load_cogs()
-    await bot.start(TOKEN)
+    await load_cogs(bot)
+    try:
+        # Stop cleanly on SIGTERM (e.g. from bot/cluster.py) so pending saves are flushed
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, lambda: asyncio.ensure_future(bot.close()))
+    except NotImplementedError:
+        pass  # Windows
+    # Cluster workers serve their own shards' metrics on the port the launcher gave them
+    port = PORT if SHARD_IDS is None else WORKER_PORT
+    server = await keep_alive(health_check, port) if port else None
+    try:
+        await bot.start(TOKEN)
+    finally:
+        if server:
+            await server.cleanup()
+        await flush_all()
 
 if __name__ == "__main__":
-    import asyncio
-    keep_alive()
     asyncio.run(main())
@@ -0,0 +1,286 @@
+# Discrete-event replay of the event and tip schedulers on a simulated clock:
+#     python bot/simulate.py --guilds 2000 --events 40 --days 7 --restarts 2 --out sim.json
+# Synthetic guilds are generated into a scratch data directory, then EventsCog and
+# TipsCog run on a SimulatedClock that jumps straight to each next due instant, so
+# a week replays in seconds. Every announcement is checked against the schedule
+# the state implies: early, late, duplicate, unexpected and missed fires, tip
+# deliveries and auto-deletes, plus the outbound sends it took. Announcements are
+# coalesced on the simulated clock too, so a fire goes out when its batch's
+# window closes and lag is measured against that window. Exits 1 on any
+# scheduling error so it can gate a deploy.
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import argparse
+import asyncio
+import collections
+import datetime
+import json
+import logging
+import random
+import shutil
+import time
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Replay the schedulers over simulated days and check every fire.")
+    parser.add_argument("--guilds", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=40, help="events per guild")
+    parser.add_argument("--tips", type=int, default=5, help="tips per guild")
+    parser.add_argument("--days", type=float, default=7, help="simulated days")
+    parser.add_argument("--start", default="2025-01-06T00:00:00+00:00", help="simulated start instant (ISO 8601)")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="up to this many seconds of loop lag added to each wake-up")
+    parser.add_argument("--late-after", type=float, default=1.0,
+                        help="fires more than this many seconds past due, beyond the coalesce window, count as late")
+    parser.add_argument("--restarts", type=int, default=0,
+                        help="reload the cogs from storage this many times, evenly spread over the run")
+    parser.add_argument("--backend", choices=("json", "sqlite"), default="json")
+    parser.add_argument("--cache-size", type=int, default=256, help="GUILD_CACHE_SIZE for the cogs")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    parser.add_argument("--keep-data", action="store_true", help="keep the scratch data directory")
+    return parser.parse_args()
+
+# ─── Scratch Environment ─────────────────────────────────────────────────────
+ARGS = parse_args()
+if ARGS.out:
+    ARGS.out = os.path.abspath(ARGS.out)
+START_DIR = os.getcwd()
+
+# Write-behind saves are flushed every this many simulated seconds; their real-time
+# delay is pushed out of reach so a fast replay doesn't write on every wake-up
+FLUSH_EVERY = 24 * 60 * 60
+
+from bot.utils.synthetic import use_scratch_environment, StubBot, generate_state, run_metadata
+SCRATCH_DIR = use_scratch_environment(ARGS.backend, ARGS.cache_size, save_delay=FLUSH_EVERY)
+
+from bot.config_loader import FIRE_GRACE, ANNOUNCE_COALESCE_WINDOW
+from bot.utils.clock import SimulatedClock
+from bot.utils.models import MINUTES_PER_WEEK, next_daily_epoch
+from bot.utils.storage import get_guild_events
+from bot.utils.persistence import flush_all
+from bot.cogs.events import EventsCog, AUTO_DELETE_AFTER
+from bot.cogs.tips import TipsCog, default_tip_minute
+
+# Only failures are worth seeing; the cogs log every fire and save at INFO
+logging.disable(logging.WARNING)
+
+WEEK = MINUTES_PER_WEEK * 60
+DAY = 24 * 60 * 60
+
+# ─── Expected Schedule ───────────────────────────────────────────────────────
+def expected_fires(config, events, start, end) -> dict:
+    """{(guild, event id, occurrence): auto-delete deadline or None} for every occurrence in (start, end]."""
+    expected = {}
+    for gid, guild_events in events.items():
+        offset = config["server_offsets"].get(gid, 0)
+        for e in guild_events:
+            at = e.next_fire_epoch(start, offset)
+            while at is not None and start < at <= end:
+                expected[(gid, e.id, at)] = at + AUTO_DELETE_AFTER if e.auto_delete else None
+                # Countdowns fire once, and auto-delete events are gone a day after their first fire
+                if e.is_countdown or e.auto_delete:
+                    break
+                at += WEEK
+    return expected
+
+def expected_tips(config, tips, start, end) -> set:
+    expected = set()
+    for gid, guild_tips in tips.items():
+        if not guild_tips or config["channels"].get(gid) is None:
+            continue
+        minute = config["tip_times"].get(gid, default_tip_minute(gid))
+        at = next_daily_epoch(start, minute, config["server_offsets"].get(gid, 0))
+        while at <= end:
+            expected.add((gid, at))
+            at += DAY
+    return expected
+
+def accuracy(sent: list, expected, late_after: float) -> dict:
+    """Classify (key, due, sent_at) records against the expected keys."""
+    counts = collections.Counter(key for key, _, _ in sent)
+    lags = sorted(sent_at - due for _, due, sent_at in sent)
+    return {
+        "expected": len(expected),
+        "sent": len(sent),
+        "early": sum(lag < 0 for lag in lags),
+        "late": sum(lag > late_after for lag in lags),
+        "duplicate": sum(n - 1 for n in counts.values() if n > 1),
+        "unexpected": sum(1 for key in counts if key not in expected),
+        "missed": sum(1 for key in expected if key not in counts),
+        "lag_seconds": {
+            "p50": lags[len(lags) // 2] if lags else None,
+            "p99": lags[min(len(lags) - 1, int(len(lags) * 0.99))] if lags else None,
+            "max": lags[-1] if lags else None,
+        },
+    }
+
+# ─── Simulation ──────────────────────────────────────────────────────────────
+class Recorder:
+    """Loads the cogs onto the stub bot and records what they announce, and when."""
+
+    def __init__(self, bot, clock):
+        self.bot = bot
+        self.clock = clock
+        self.fires = []
+        self.tips = []
+        self.events_cog = self.tips_cog = None
+        self.page_ins = collections.Counter()
+
+    def load(self):
+        self.events_cog = EventsCog(self.bot)
+        self.tips_cog = TipsCog(self.bot)
+        on_event_fired, on_tip_sent = self.events_cog.on_event_fired, self.tips_cog.on_tip_sent
+
+        def record_fire(gid, e):
+            # Called once delivered; the ledger already holds the occurrence that was sent
+            self.fires.append(((gid, e.id, e.last_fired), e.last_fired, self.clock.time()))
+            on_event_fired(gid, e)
+
+        def record_tip(guild_id, due_at):
+            self.tips.append(((guild_id, due_at), due_at, self.clock.time()))
+            on_tip_sent(guild_id, due_at)
+
+        self.events_cog.on_event_fired = record_fire
+        self.tips_cog.on_tip_sent = record_tip
+
+    async def unload(self):
+        for name, cache in (("events", self.events_cog.all_events), ("tips", self.tips_cog.all_tips)):
+            self.page_ins[f"{name}_hits"] += cache.hits
+            self.page_ins[f"{name}_misses"] += cache.misses
+        self.events_cog.cog_unload()
+        self.tips_cog.cog_unload()
+        await self.bot.announcer.drain()
+        await flush_all()
+
+async def settle(announcer):
+    """Let the sends the announcer has started finish before the clock moves on."""
+    while announcer.pending:
+        await asyncio.gather(*announcer.pending, return_exceptions=True)
+
+async def simulate(expected: dict, tips_expected: set, start, end, rng) -> dict:
+    clock = SimulatedClock(start)
+    bot = StubBot(clock)
+    recorder = Recorder(bot, clock)
+    recorder.load()
+    restarts = [start + (end - start) * (i + 1) / (ARGS.restarts + 1) for i in range(ARGS.restarts)]
+    next_flush = start + FLUSH_EVERY
+    wakeups = 0
+
+    while True:
+        cogs = (recorder.events_cog, recorder.tips_cog)
+        due = [at for at in (cog.queue.peek() for cog in cogs) if at is not None and at <= end]
+        # Coalesce windows still open past the end are waited out, so their fires count
+        flush_at = clock.next_timer()
+        if not due and flush_at is None:
+            break
+        next_at = min(due + [flush_at] if flush_at is not None else due)
+
+        # Restarts and flushes happen between wake-ups; a restart has no downtime, so
+        # whatever is due at its instant is handled first, by the outgoing cogs
+        if restarts and restarts[0] < next_at:
+            clock.advance_to(restarts.pop(0))
+            await recorder.unload()
+            recorder.load()
+            continue
+        if next_flush <= next_at:
+            clock.advance_to(next_flush)
+            await flush_all()
+            next_flush += FLUSH_EVERY
+            continue
+
+        wake_at = min(due) + (rng.uniform(0, ARGS.jitter) if ARGS.jitter else 0) if due else None
+        if flush_at is not None and (wake_at is None or flush_at <= wake_at):
+            # A batch's window closes: Announcer._flush_batch fires on its timer and sends
+            clock.advance_to(flush_at)
+            await settle(bot.announcer)
+            continue
+
+        clock.advance_to(wake_at)
+        # Only the cogs with something due run, so neither waits and moves the clock on
+        for cog, iteration in ((cogs[0], cogs[0].check_events), (cogs[1], cogs[1].send_daily_tips)):
+            at = cog.queue.peek()
+            if at is not None and at <= clock.time():
+                await iteration()
+                wakeups += 1
+
+    await recorder.unload()
+
+    # Auto-delete events whose day after firing has passed must be gone
+    deleted = expected_deletes = 0
+    for (gid, event_id, _), deadline in expected.items():
+        if deadline is not None and deadline <= end:
+            expected_deletes += 1
+            deleted += get_guild_events(recorder.events_cog.all_events, gid).get(event_id) is None
+
+    per_minute = collections.Counter(int(at // 60) for at in bot.sent_at)
+    return {
+        # A fire waits out its batch's coalesce window before it is sent
+        "events": accuracy(recorder.fires, expected, ANNOUNCE_COALESCE_WINDOW + ARGS.late_after),
+        "tips": accuracy(recorder.tips, tips_expected, ANNOUNCE_COALESCE_WINDOW + ARGS.late_after),
+        "auto_delete": {"expected": expected_deletes, "deleted": deleted, "overdue": expected_deletes - deleted},
+        "sends": {
+            "messages": bot.messages,
+            "embeds": bot.embeds,
+            "coalesced": bot.announcer.saved,
+            "failed": bot.announcer.failed,
+            "peak_per_minute": max(per_minute.values(), default=0),
+        },
+        "scheduler_wakeups": wakeups,
+        # Misses are guilds paged in from storage; raise --cache-size to see the cost of thrashing
+        "guild_cache": dict(recorder.page_ins),
+    }
+
+# ─── Entry ───────────────────────────────────────────────────────────────────
+def main():
+    random.seed(ARGS.seed)  # tip rotations shuffle with the module-level generator
+    rng = random.Random(ARGS.seed)
+    start = datetime.datetime.fromisoformat(ARGS.start).timestamp()
+    end = start + ARGS.days * DAY
+    try:
+        config, events, tips = generate_state(rng, ARGS.guilds, ARGS.events, ARGS.tips, 0, start,
+                                              countdown_span=ARGS.days * DAY)
+        expected = expected_fires(config, events, start, end)
+        tips_expected = expected_tips(config, tips, start, end)
+        del events, tips  # the cogs page guilds in from storage, as in production
+
+        started = time.perf_counter()
+        outcome = asyncio.run(simulate(expected, tips_expected, start, end, rng))
+        elapsed = time.perf_counter() - started
+    finally:
+        os.chdir(START_DIR)
+        if ARGS.keep_data:
+            print(f"Scratch data kept in {SCRATCH_DIR}", file=sys.stderr)
+        else:
+            shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
+
+    problems = {
+        f"{kind}.{check}": outcome[kind][check]
+        for kind in ("events", "tips") for check in ("early", "duplicate", "unexpected", "missed")
+        if outcome[kind][check]
+    }
+    if outcome["auto_delete"]["overdue"]:
+        problems["auto_delete.overdue"] = outcome["auto_delete"]["overdue"]
+    report = {
+        **run_metadata(),
+        "params": {k: v for k, v in vars(ARGS).items() if k not in ("out", "keep_data")},
+        "fire_grace_seconds": FIRE_GRACE,
+        "coalesce_window_seconds": ANNOUNCE_COALESCE_WINDOW,
+        "simulated_seconds": end - start,
+        "wall_seconds": elapsed,
+        **outcome,
+        "problems": problems,
+    }
+    print(f"Simulated {ARGS.days:g} day(s) of {ARGS.guilds} guild(s) in {elapsed:.1f}s: "
+          f"{outcome['events']['sent']} event fire(s), {outcome['tips']['sent']} tip(s), "
+          f"{outcome['sends']['messages']} message(s); problems: {problems or 'none'}", file=sys.stderr)
+    if ARGS.out:
+        with open(ARGS.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    sys.exit(1 if problems else 0)
+
+if __name__ == "__main__":
+    main()
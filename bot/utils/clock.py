@@ -0,0 +1,88 @@
+import asyncio
+import datetime
+import heapq
+import itertools
+import time
+
+# ─── Wall Clock ──────────────────────────────────────────────────────────────
+class Clock:
+    """The time source of the schedulers and time-sensitive commands.
+
+    Cogs read it through `get_clock(bot)`, so a simulation can install a
+    SimulatedClock on the bot before they load and replay days in seconds.
+    """
+
+    def time(self) -> float:
+        return time.time()
+
+    def utcnow(self) -> datetime.datetime:
+        """Naive UTC, like datetime.datetime.utcnow()."""
+        return datetime.datetime.utcfromtimestamp(self.time())
+
+    async def wait(self, event: asyncio.Event, timeout: float):
+        """Sleep `timeout` seconds of this clock's time, or until `event` is set."""
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def call_later(self, delay: float, callback, *args):
+        """Run `callback(*args)` after `delay` seconds of this clock's time; returns a cancellable handle."""
+        return asyncio.get_running_loop().call_later(delay, callback, *args)
+
+
+class _Timer:
+    """A SimulatedClock callback; `cancel()` stops it from running."""
+
+    __slots__ = ("callback", "args", "cancelled")
+
+    def __init__(self, callback, args):
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class SimulatedClock(Clock):
+    """A clock that only moves when advanced; waiting on it jumps ahead instead of sleeping."""
+
+    def __init__(self, start: float):
+        self.now = start
+        self.timers = []  # heap of (when, sequence, _Timer)
+        self._sequence = itertools.count()
+
+    def time(self) -> float:
+        return self.now
+
+    def next_timer(self):
+        """The instant the earliest pending `call_later` callback is due, or None."""
+        while self.timers and self.timers[0][2].cancelled:
+            heapq.heappop(self.timers)
+        return self.timers[0][0] if self.timers else None
+
+    def advance_to(self, ts: float):
+        """Move to `ts`, running each timer due on the way at its own instant."""
+        while (when := self.next_timer()) is not None and when <= ts:
+            timer = heapq.heappop(self.timers)[2]
+            self.now = max(self.now, when)
+            timer.callback(*timer.args)
+        self.now = max(self.now, ts)
+
+    async def wait(self, event: asyncio.Event, timeout: float):
+        await asyncio.sleep(0)
+        if not event.is_set():
+            self.advance_to(self.now + max(timeout, 0))
+
+    def call_later(self, delay: float, callback, *args) -> _Timer:
+        timer = _Timer(callback, args)
+        heapq.heappush(self.timers, (self.now + max(delay, 0), next(self._sequence), timer))
+        return timer
+
+
+def get_clock(bot) -> Clock:
+    """Return the clock shared by every cog, defaulting to the wall clock."""
+    if getattr(bot, "clock", None) is None:
+        bot.clock = Clock()
+    return bot.clock
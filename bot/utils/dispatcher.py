@@ -0,0 +1,185 @@
+import asyncio
+import time
+
+import aiohttp
+import discord
+
+from bot.config_loader import ANNOUNCE_CONCURRENCY, ANNOUNCE_COALESCE_WINDOW, FIRE_GRACE
+from bot.utils.metrics import ANNOUNCE_LATENCY_SECONDS
+from bot.utils.clock import Clock, get_clock
+from bot.logger import setup_logging
+
+logger = setup_logging("dispatcher")
+
+# Fire lag (seconds past the due instant) above which a send is logged as late
+LATE_SEND_WARNING = 5
+# Discord's limit on embeds in one message
+MAX_EMBEDS_PER_MESSAGE = 10
+# Seconds between retries of a send that failed on Discord's side or in transit, doubling up to the cap
+RETRY_BACKOFF = 1
+MAX_RETRY_BACKOFF = 60
+# A send still failing this long after it was queued is dropped: a restart wouldn't announce it either
+RETRY_TIMEOUT = FIRE_GRACE
+
+class _Batch:
+    """Embeds waiting to go out to one channel as a single message."""
+
+    __slots__ = ("channel", "embeds", "callbacks", "due_at", "mention", "handle")
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.embeds = []
+        self.callbacks = []
+        self.due_at = None
+        self.mention = None
+        self.handle = None
+
+# ─── Announcement Dispatcher ─────────────────────────────────────────────────
+class Announcer:
+    """Fans announcements out concurrently with a global in-flight limit.
+
+    Sends to the same channel are serialised on a per-route lock, taken
+    before a concurrency slot so one rate-limited channel can't starve the
+    rest. A 429 that outlasts discord.py's own wait blocks only that route.
+
+    `announce` coalesces: embeds queued for a channel within
+    `coalesce_window` seconds are sent together, up to ten per message,
+    with the mention only on the first. `saved` counts the sends avoided.
+    """
+
+    def __init__(self, concurrency: int = ANNOUNCE_CONCURRENCY, coalesce_window: float = ANNOUNCE_COALESCE_WINDOW,
+                 clock: Clock = None):
+        self.clock = clock or Clock()  # due instants are on the cogs' clock
+        self.limit = asyncio.Semaphore(concurrency)
+        self.coalesce_window = coalesce_window
+        self.routes = {}
+        self.blocked_until = {}
+        self.batches = {}
+        self.pending = set()
+        self.sent = 0
+        self.failed = 0
+        self.saved = 0
+
+    async def send(self, channel, due_at: float = None, **kwargs) -> bool:
+        route = channel.id
+        # Counted from now, so sends queued behind a failing one on the same route give up with it
+        deadline = time.monotonic() + RETRY_TIMEOUT
+        lock = self.routes.setdefault(route, asyncio.Lock())
+        async with lock:
+            started = time.perf_counter()
+            delivered = await self._deliver(channel, route, kwargs, deadline)
+            elapsed = time.perf_counter() - started
+
+        if not delivered:
+            self.failed += 1
+            return False
+
+        self.sent += 1
+        lag = self.clock.time() - due_at if due_at is not None else 0.0
+        if due_at is not None:
+            ANNOUNCE_LATENCY_SECONDS.observe(max(lag, 0.0))
+        logger.debug("📨 Sent to channel %s in %.0fms (%.2fs after due)", route, elapsed * 1000, lag)
+        if lag > LATE_SEND_WARNING:
+            logger.warning("🐢 Announcement for channel %s went out %.1fs late", route, lag)
+        return True
+
+    async def _deliver(self, channel, route, kwargs, deadline: float) -> bool:
+        """Send, retrying rate limits and transient failures until `deadline` (monotonic).
+
+        The fire ledger already holds the occurrence by now, so a send
+        dropped here is never made again; a permanent error, e.g. a deleted
+        channel or lost permission, gives up at once. Waits between attempts
+        hold the route's lock but not a concurrency slot.
+        """
+        backoff = RETRY_BACKOFF
+        while True:
+            wait = self.blocked_until.get(route, 0) - time.monotonic()
+            if wait > 0:
+                if time.monotonic() + wait > deadline:
+                    logger.error("❌ Gave up on channel %s: rate limited past the %.0fs retry window",
+                                 route, RETRY_TIMEOUT)
+                    return False
+                await asyncio.sleep(wait)
+
+            async with self.limit:
+                try:
+                    await channel.send(**kwargs)
+                    return True
+                except discord.RateLimited as ex:
+                    self.blocked_until[route] = time.monotonic() + ex.retry_after
+                    logger.warning("⏳ Route %s rate limited for %.1fs", route, ex.retry_after)
+                    continue
+                except (discord.DiscordServerError, aiohttp.ClientError, asyncio.TimeoutError) as ex:
+                    error = ex
+                except discord.HTTPException as ex:
+                    logger.error("❌ Failed to send to channel %s: %s", route, ex)
+                    return False
+
+            if time.monotonic() + backoff > deadline:
+                logger.error("❌ Gave up on channel %s after %.0fs of failed sends: %s", route, RETRY_TIMEOUT, error)
+                return False
+            logger.warning("⚠️ Send to channel %s failed (%s), retrying in %ds", route, error, backoff)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, MAX_RETRY_BACKOFF)
+
+    def submit(self, channel, due_at: float = None, on_sent=None, **kwargs) -> asyncio.Task:
+        """Send in the background; `on_sent()` runs only if delivery succeeded."""
+        async def run():
+            try:
+                if await self.send(channel, due_at=due_at, **kwargs) and on_sent:
+                    on_sent()
+            except Exception as ex:
+                self.failed += 1
+                logger.error("❌ Announcement to channel %s failed: %s", channel.id, ex)
+
+        task = asyncio.create_task(run())
+        self.pending.add(task)
+        task.add_done_callback(self.pending.discard)
+        return task
+
+    def announce(self, channel, embed, due_at: float = None, mention: str = None, on_sent=None):
+        """Queue `embed` for `channel`, to be sent with whatever else arrives within the window."""
+        batch = self.batches.get(channel.id)
+        if batch is None:
+            batch = self.batches[channel.id] = _Batch(channel)
+            batch.handle = self.clock.call_later(self.coalesce_window, self._flush_batch, channel.id)
+        batch.embeds.append(embed)
+        batch.callbacks.append(on_sent)
+        if due_at is not None and (batch.due_at is None or due_at < batch.due_at):
+            batch.due_at = due_at
+        batch.mention = batch.mention or mention
+
+    def _flush_batch(self, route):
+        batch = self.batches.pop(route, None)
+        if batch is None:
+            return
+        batch.handle.cancel()
+        chunks = range(0, len(batch.embeds), MAX_EMBEDS_PER_MESSAGE)
+        for i in chunks:
+            def on_sent(callbacks=[cb for cb in batch.callbacks[i:i + MAX_EMBEDS_PER_MESSAGE] if cb]):
+                for cb in callbacks:
+                    cb()
+
+            self.submit(
+                batch.channel, due_at=batch.due_at, on_sent=on_sent,
+                content=batch.mention if i == 0 else None,
+                embeds=batch.embeds[i:i + MAX_EMBEDS_PER_MESSAGE]
+            )
+        saved = len(batch.embeds) - len(chunks)
+        if saved:
+            self.saved += saved
+            logger.info("📦 Coalesced %d announcements into %d message(s) for channel %s, %d send(s) saved so far",
+                        len(batch.embeds), len(chunks), route, self.saved)
+
+    async def drain(self):
+        for route in list(self.batches):
+            self._flush_batch(route)
+        if self.pending:
+            await asyncio.gather(*self.pending, return_exceptions=True)
+
+
+def get_announcer(bot) -> Announcer:
+    """Return the dispatcher shared by every cog, creating it on first use."""
+    if getattr(bot, "announcer", None) is None:
+        bot.announcer = Announcer(clock=get_clock(bot))
+    return bot.announcer
@@ -0,0 +1,205 @@
+import csv
+import datetime
+import io
+import json
+
+from bot.utils.helpers import get_zone
+
+# Formats /importevents reads and /exportevents writes, by file extension
+FORMATS = ("json", "csv", "ics")
+# Columns of a CSV file, and keys of each JSON object; a row gives day and time, or a duration or at time
+COLUMNS = ("type", "name", "info", "day", "time", "duration", "at", "autodelete")
+EXPORT_COLUMNS = ("type", "name", "info", "day", "time", "at", "autodelete")
+TRUE_VALUES = ("1", "true", "yes", "y", "x")
+ICS_PRODID = "-//MMORTS Discord Bot//Events//EN"
+
+# ─── Reading ─────────────────────────────────────────────────────────────────
+def detect_format(filename: str, text: str) -> str:
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if extension in FORMATS:
+        return extension
+    if extension == "ical":
+        return "ics"
+    head = text.lstrip()[:15]
+    if head.startswith(("{", "[")):
+        return "json"
+    return "ics" if head.upper().startswith("BEGIN:VCALENDAR") else "csv"
+
+def parse_event_file(filename: str, text: str) -> tuple[str, list]:
+    """Return the file's format and one row dict per event, keyed like COLUMNS plus `row`.
+
+    `row` numbers JSON and ICS entries from 1 and CSV rows by file line. A
+    file that can't be read at all raises ValueError; row-level problems
+    are left for the caller's validation, which reports them per row.
+    """
+    fmt = detect_format(filename, text)
+    parse = {"json": _parse_json, "csv": _parse_csv, "ics": _parse_ics}[fmt]
+    return fmt, parse(text)
+
+def _truthy(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+def _row(number: int, fields: dict) -> dict:
+    row = {"row": number}
+    for key in COLUMNS:
+        value = fields.get(key)
+        row[key] = str(value).strip() or None if value is not None and key != "autodelete" else None
+    row["type"] = row["type"] and row["type"].lower()
+    row["info"] = row["info"] or ""
+    row["autodelete"] = _truthy(fields.get("autodelete", False))
+    return row
+
+def _parse_json(text: str) -> list:
+    data = json.loads(text)
+    if isinstance(data, dict):
+        data = data.get("events")
+    if not isinstance(data, list) or not all(isinstance(entry, dict) for entry in data):
+        raise ValueError('expected a list of event objects, or {"events": [...]}')
+    return [_row(i, {k.lower(): v for k, v in entry.items()}) for i, entry in enumerate(data, 1)]
+
+def _parse_csv(text: str) -> list:
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames or "name" not in (f.strip().lower() for f in reader.fieldnames):
+        raise ValueError(f"expected a header row with a `name` column and some of: {', '.join(COLUMNS)}")
+    rows = []
+    for fields in reader:
+        fields = {(k or "").strip().lower(): v for k, v in fields.items()}
+        if any(v and v.strip() for v in fields.values() if isinstance(v, str)):  # skip blank lines
+            rows.append(_row(reader.line_num, fields))
+    return rows
+
+# ─── iCalendar ───────────────────────────────────────────────────────────────
+def _unescape(value: str) -> str:
+    out, chars = [], iter(value)
+    for c in chars:
+        if c == "\\":
+            c = next(chars, "")
+            c = "\n" if c in ("n", "N") else c
+        out.append(c)
+    return "".join(out)
+
+def _ics_datetime(value: str, params: dict):
+    """DTSTART as a datetime: aware for UTC ("Z") or TZID times, naive (server time) when floating."""
+    if params.get("VALUE") == "DATE" or "T" not in value:
+        raise ValueError("all-day events have no start time")
+    utc = value.endswith("Z")
+    moment = datetime.datetime.strptime(value.rstrip("Z")[:15], "%Y%m%dT%H%M%S")
+    if utc:
+        return moment.replace(tzinfo=datetime.timezone.utc)
+    if "TZID" in params:
+        zone = get_zone(params["TZID"].strip('"'))
+        if zone is None:
+            raise ValueError(f"unknown TZID `{params['TZID']}`")
+        return zone.localize(moment)
+    return moment
+
+def _parse_ics(text: str) -> list:
+    # Long lines are folded onto continuation lines that start with a space or tab
+    lines = []
+    for line in text.splitlines():
+        if line[:1] in (" ", "\t") and lines:
+            lines[-1] += line[1:]
+        else:
+            lines.append(line)
+
+    rows, event = [], None
+    for line in lines:
+        if line.upper() == "BEGIN:VEVENT":
+            event = {}
+        elif line.upper() == "END:VEVENT" and event is not None:
+            rows.append(_ics_row(len(rows) + 1, event))
+            event = None
+        elif event is not None and ":" in line:
+            key, _, value = line.partition(":")
+            name, *params = key.split(";")
+            event[name.upper()] = (value, dict(p.split("=", 1) for p in params if "=" in p))
+    if not rows and "BEGIN:VCALENDAR" not in text.upper():
+        raise ValueError("no BEGIN:VCALENDAR found")
+    return rows
+
+def _ics_row(number: int, event: dict) -> dict:
+    row = _row(number, {
+        "name": _unescape(event.get("SUMMARY", ("", {}))[0]),
+        "info": _unescape(event.get("DESCRIPTION", ("", {}))[0]),
+        "autodelete": event.get("X-AUTO-DELETE", ("", {}))[0],
+    })
+    rrule = dict(part.split("=", 1) for part in event.get("RRULE", ("", {}))[0].upper().split(";") if "=" in part)
+    row["type"] = "weekly" if rrule else "countdown"
+    try:
+        if "DTSTART" not in event:
+            raise ValueError("missing DTSTART")
+        row["at"] = _ics_datetime(*event["DTSTART"])
+        if rrule and (rrule.get("FREQ") != "WEEKLY" or rrule.get("INTERVAL", "1") != "1"):
+            raise ValueError("only plain weekly recurrence (RRULE:FREQ=WEEKLY) is supported")
+        if "," in rrule.get("BYDAY", ""):
+            raise ValueError("use one event per weekday, not a BYDAY list")
+    except ValueError as e:
+        message = str(e)
+        row["error"] = message[:1].upper() + message[1:]  # not capitalize(): it lowercases DTSTART, RRULE...
+    return row
+
+# ─── Writing ─────────────────────────────────────────────────────────────────
+def _export_row(e) -> dict:
+    if e.is_countdown:
+        at = datetime.datetime.fromtimestamp(e.fire_epoch, datetime.timezone.utc).isoformat()
+        return {"type": "countdown", "name": e.name, "info": e.info or "", "at": at, "autodelete": e.auto_delete}
+    return {"type": "weekly", "name": e.name, "info": e.info or "", "day": e.day.capitalize(), "time": e.time,
+            "autodelete": e.auto_delete}
+
+def exportable_events(events, now_ts: float) -> list:
+    """The events an export writes: countdowns as /listevents shows them, since one already fired
+    would be rejected on re-import, and no events with unreadable times."""
+    return [e for e in events if (e.fire_epoch is not None and e.fire_epoch >= now_ts if e.is_countdown
+                                  else e.minute_of_week is not None)]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+def _fold(line: str) -> str:
+    """Split a content line into 75-octet pieces without breaking a UTF-8 character."""
+    pieces, current, size = [], "", 0
+    for c in line:
+        width = len(c.encode())
+        if size + width > 75:
+            pieces.append(current)
+            current, size = " ", 1
+        current += c
+        size += width
+    pieces.append(current)
+    return "\r\n".join(pieces)
+
+def _ics_time(epoch: float) -> str:
+    return datetime.datetime.fromtimestamp(epoch, datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+def export_events(events, fmt: str, guild_id: str, offset: int, now_ts: float) -> bytes:
+    """Serialise the `exportable_events` of a guild's schedule.
+
+    Weekly events become an RRULE starting at their next occurrence, so a
+    calendar app shows them at the right instant and re-importing gives
+    back the same server-time day and time.
+    """
+    events = exportable_events(events, now_ts)
+    if fmt == "json":
+        return json.dumps({"events": [_export_row(e) for e in events]}, indent=2, ensure_ascii=False).encode()
+    if fmt == "csv":
+        out = io.StringIO()
+        writer = csv.DictWriter(out, EXPORT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(_export_row(e) for e in events)
+        return out.getvalue().encode("utf-8-sig")  # Excel needs the BOM to read UTF-8
+
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{ICS_PRODID}", "CALSCALE:GREGORIAN"]
+    for e in events:
+        lines += ["BEGIN:VEVENT", f"UID:{guild_id}-{e.id}@mmorts-discord-bot", f"DTSTAMP:{_ics_time(now_ts)}"]
+        if e.is_countdown:
+            lines.append(f"DTSTART:{_ics_time(e.fire_epoch)}")
+        else:
+            lines += [f"DTSTART:{_ics_time(e.next_fire_epoch(now_ts, offset))}", "RRULE:FREQ=WEEKLY"]
+        lines += [f"SUMMARY:{_escape(e.name)}", f"DESCRIPTION:{_escape(e.info or '')}"]
+        if e.auto_delete:
+            lines.append("X-AUTO-DELETE:TRUE")
+        lines.append("END:VEVENT")
+    lines.append("END:VCALENDAR")
+    return ("\r\n".join(map(_fold, lines)) + "\r\n").encode()
@@ -0,0 +1,105 @@
+import os
+import time
+
+from bot.utils.metrics import COG_LOAD_SECONDS
+from bot.logger import setup_logging
+
+logger = setup_logging("extensions")
+
+# Found next to this package rather than from the working directory, so the bot starts from anywhere
+COG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cogs")
+COG_PACKAGE = "bot.cogs"
+
+# {extension: {"import", "init", "total"} seconds} from each extension's last (re)load
+load_times = {}
+COG_LOAD_SECONDS.set_function(lambda: {ext: times["total"] for ext, times in load_times.items() if "total" in times})
+
+def cog_extensions() -> list:
+    return sorted(
+        f"{COG_PACKAGE}.{filename[:-3]}" for filename in os.listdir(COG_DIR)
+        if filename.endswith(".py") and not filename.startswith("_")
+    )
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.0f}ms"
+
+def describe(times: dict) -> str:
+    return f"{_ms(times['total'])} (import {_ms(times['import'])}, init {_ms(times['init'])})"
+
+# ─── Timed Loading ───────────────────────────────────────────────────────────
+async def setup_cog(bot, cog_class):
+    """Construct and add a cog from its extension's setup(); the time is the extension's init phase."""
+    started = time.perf_counter()
+    await bot.add_cog(cog_class(bot))
+    times = load_times.setdefault(cog_class.__module__, {"init": 0.0})
+    times["init"] += time.perf_counter() - started
+
+async def load_extension(bot, extension: str, reload: bool = False) -> dict:
+    """(Re)load one extension and return its timings; import is whatever setup_cog didn't account for."""
+    times = load_times[extension] = {"init": 0.0}
+    started = time.perf_counter()
+    try:
+        if reload:
+            await bot.reload_extension(extension)
+        else:
+            await bot.load_extension(extension)
+    except Exception:
+        del load_times[extension]
+        raise
+    times["total"] = time.perf_counter() - started
+    times["import"] = max(times["total"] - times["init"], 0.0)
+    return times
+
+async def load_cogs(bot):
+    """Load every cog in turn; one failing leaves the rest.
+
+    Loading is synchronous import and setup work on the loop thread, so
+    there is nothing to overlap; the per-phase timings show what to trim.
+    """
+    started = time.perf_counter()
+    for extension in cog_extensions():
+        try:
+            times = await load_extension(bot, extension)
+            logger.info("✅ Loaded cog: %s in %s", extension, describe(times))
+        except Exception as e:
+            logger.error("❌ Failed to load %s: %s", extension, e)
+    logger.info("🧩 Loaded %s cog(s) in %s", len(bot.extensions), _ms(time.perf_counter() - started))
+
+# ─── State Handover ──────────────────────────────────────────────────────────
+def hand_over(bot, extension: str) -> list:
+    """Stash each of the extension's cogs' HANDOVER attributes for the instance replacing it.
+
+    The objects themselves are handed on, not copies, so callbacks still
+    held by the outgoing instance (e.g. announcements in flight) update the
+    state its successor now owns. Returns the names of the cogs stashed.
+    """
+    if getattr(bot, "cog_handover", None) is None:
+        bot.cog_handover = {}
+    for cog in bot.cogs.values():
+        attributes = getattr(cog, "HANDOVER", ())
+        if type(cog).__module__ == extension and attributes:
+            bot.cog_handover[cog.qualified_name] = {attr: getattr(cog, attr) for attr in attributes}
+    return list(bot.cog_handover)
+
+def take_over(cog) -> bool:
+    """Adopt the state stashed for this cog by hand_over(); False means a cold start."""
+    state = (getattr(cog.bot, "cog_handover", None) or {}).pop(cog.qualified_name, None)
+    if not state:
+        return False
+    for attr, value in state.items():
+        setattr(cog, attr, value)
+    return True
+
+async def reload_extension(bot, extension: str) -> tuple[dict, list]:
+    """Reload an extension in place, its cogs picking up where the old instances left off.
+
+    Returns the timings and the cogs whose state was handed over. If the
+    new code fails to load, discord.py restores the old module, and its
+    cogs take the state back the same way.
+    """
+    handed_over = hand_over(bot, extension)
+    try:
+        return await load_extension(bot, extension, reload=True), handed_over
+    finally:
+        # Anything not taken would otherwise be picked up by some later cold load
+        bot.cog_handover.clear()
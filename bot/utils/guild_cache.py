@@ -0,0 +1,57 @@
+from collections import OrderedDict
+
+# ─── Per-Guild LRU Cache ─────────────────────────────────────────────────────
+class GuildCache:
+    """Dict-like LRU of per-guild lists, loaded on first access.
+
+    `loader(gid)` pages a guild in; once more than `capacity` guilds are
+    resident the least recently used one is dropped, unless `is_pinned(gid)`
+    says it still has unsaved changes, in which case it is skipped for now.
+    """
+
+    def __init__(self, loader, capacity: int, is_pinned=None):
+        self.loader = loader
+        self.capacity = max(1, capacity)
+        self.is_pinned = is_pinned or (lambda gid: False)
+        self.shards = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.shards)
+
+    def __contains__(self, gid):
+        return gid in self.shards
+
+    def __getitem__(self, gid) -> list:
+        shard = self.shards.get(gid)
+        if shard is not None:
+            self.hits += 1
+            self.shards.move_to_end(gid)
+            return shard
+        self.misses += 1
+        shard = self.loader(gid)
+        self[gid] = shard
+        return shard
+
+    def __setitem__(self, gid, shard: list):
+        self.shards[gid] = shard
+        self.shards.move_to_end(gid)
+        self._evict()
+
+    def setdefault(self, gid, default=None) -> list:
+        return self[gid]
+
+    def resident(self):
+        return self.shards.items()
+
+    def _evict(self):
+        excess = len(self.shards) - self.capacity
+        if excess <= 0:
+            return
+        for gid in list(self.shards)[:-1]:
+            if not self.is_pinned(gid):
+                del self.shards[gid]
+                excess -= 1
+                if excess == 0:
+                    return
@@ -1,8 +1,12 @@
 ﻿import discord
+from discord import app_commands
 import datetime
-import calendar
+import functools
+import pytz
 from calendar import day_name
 
+from bot.utils.models import MINUTES_PER_DAY, MINUTES_PER_WEEK
+
 # ─── Embed Generator ─────────────────────────────────────────────────────────
 def make_embed(
     title=None,
@@ -23,6 +27,11 @@ def make_embed(
         embed.set_footer(text=footer)
     return embed
 
+# ─── Autocomplete Choices ────────────────────────────────────────────────────
+def make_choices(values) -> list[app_commands.Choice[str]]:
+    # Discord rejects choice values over 100 characters
+    return [app_commands.Choice(name=value, value=value) for value in values if len(value) <= 100]
+
 # ─── Duration Parser ─────────────────────────────────────────────────────────
 def parse_duration_string(duration_str):
     parts = duration_str.strip().lower().split()
@@ -40,14 +49,38 @@ def parse_duration_string(duration_str):
 
 # ─── Next Weekly Event Calculation ───────────────────────────────────────────
 def next_event_datetime(event, server_now):
-    target_weekday = list(calendar.day_name).index(event["day"])
-    h, m = map(int, event["time"].split(":"))
-    candidate = server_now.replace(hour=h, minute=m, second=0, microsecond=0)
-    days_ahead = (target_weekday - server_now.weekday()) % 7
-    candidate += datetime.timedelta(days=days_ahead)
-    if candidate <= server_now:
-        candidate += datetime.timedelta(days=7)
-    return candidate
+    now_minute = server_now.weekday() * MINUTES_PER_DAY + server_now.hour * 60 + server_now.minute
+    ahead = (event.minute_of_week - now_minute) % MINUTES_PER_WEEK or MINUTES_PER_WEEK
+    return server_now.replace(second=0, microsecond=0) + datetime.timedelta(minutes=ahead)
+
+# ─── Timezones ───────────────────────────────────────────────────────────────
+# Zone transitions fall on quarter hours, so one UTC offset holds for a whole bucket
+_OFFSET_BUCKET = 15 * 60
+
+@functools.lru_cache(maxsize=1024)
+def get_zone(name: str):
+    """Return the pytz zone called `name`, built once and reused; None if unknown."""
+    try:
+        return pytz.timezone(name)
+    except pytz.UnknownTimeZoneError:
+        return None
+
+def local_datetimes(epochs, zone) -> list[datetime.datetime]:
+    """Convert a batch of UTC epoch seconds to aware datetimes in `zone`.
+
+    The zone is consulted once per quarter hour touched rather than once per
+    epoch, so a listing costs a handful of lookups however many events it has.
+    """
+    offsets = {}
+    result = []
+    for ts in epochs:
+        bucket = int(ts // _OFFSET_BUCKET)
+        probe = offsets.get(bucket)
+        if probe is None:
+            probe = offsets[bucket] = datetime.datetime.fromtimestamp(bucket * _OFFSET_BUCKET, zone)
+        local = datetime.datetime.utcfromtimestamp(ts) + probe.utcoffset()
+        result.append(local.replace(tzinfo=probe.tzinfo))
+    return result
 
 # ─── Day Validator ───────────────────────────────────────────────────────────
 def validate_event_day(day):
@@ -0,0 +1,157 @@
+import math
+import time
+from bisect import bisect_left
+
+# Upper bounds (seconds) shared by the latency histograms
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+_metrics = []
+
+# ─── Metric Types ────────────────────────────────────────────────────────────
+# Updates are plain dict/list arithmetic with no locks: every observation is
+# made on the event loop thread, and a scrape only ever reads.
+class Counter:
+    def __init__(self, name, help, label=None):
+        self.name = name
+        self.help = help
+        self.label = label
+        self.series = {}
+        _metrics.append(self)
+
+    def inc(self, label_value=None, amount: float = 1):
+        self.series[label_value] = self.series.get(label_value, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for value, total in tuple(self.series.items()):
+            lines.append(f"{self.name}{_labels(self.label, value)} {_number(total)}")
+        return lines
+
+
+class Gauge:
+    """A value read at scrape time from `fn()`, which returns a number or {label value: number}.
+
+    `kind="counter"` exposes totals that are kept elsewhere, e.g. on the Announcer.
+    """
+
+    def __init__(self, name, help, label=None, kind="gauge"):
+        self.name = name
+        self.help = help
+        self.label = label
+        self.kind = kind
+        self.fn = None
+        _metrics.append(self)
+
+    def set_function(self, fn):
+        self.fn = fn
+
+    def render(self) -> list:
+        if self.fn is None:
+            return []
+        try:
+            value = self.fn()
+        except Exception:
+            return []
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        values = value.items() if isinstance(value, dict) else [(None, value)]
+        for label_value, number in values:
+            lines.append(f"{self.name}{_labels(self.label, label_value)} {_number(number)}")
+        return lines
+
+
+class Histogram:
+    """Bucketed observations; each series is [per-bucket counts..., +Inf count, sum]."""
+
+    def __init__(self, name, help, label=None, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label = label
+        self.buckets = tuple(buckets)
+        self.series = {}
+        _metrics.append(self)
+
+    def observe(self, value: float, label_value=None):
+        series = self.series.get(label_value)
+        if series is None:
+            series = self.series[label_value] = [0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def time(self, label_value=None) -> "_Timer":
+        """`with histogram.time(): ...` observes the block's wall time."""
+        return _Timer(self, label_value)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for label_value, series in tuple(self.series.items()):
+            series = list(series)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), series):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else _number(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.label, label_value, le=le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label, label_value)} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.label, label_value)} {cumulative}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ("histogram", "label_value", "started")
+
+    def __init__(self, histogram, label_value):
+        self.histogram = histogram
+        self.label_value = label_value
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, self.label_value)
+
+# ─── Exposition ──────────────────────────────────────────────────────────────
+def _labels(label, value, le=None) -> str:
+    pairs = []
+    if label is not None and value is not None:
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{label}="{escaped}"')
+    if le is not None:
+        pairs.append(f'le="{le}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def render() -> str:
+    """Every metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+# ─── Bot Metrics ─────────────────────────────────────────────────────────────
+SCHEDULER_TICK_SECONDS = Histogram(
+    "bot_scheduler_tick_seconds", "Time check_events spends handling the guilds due in one tick.")
+SCHEDULER_LAG_SECONDS = Histogram(
+    "bot_scheduler_lag_seconds", "How long after its due instant each guild was picked up by check_events.")
+ANNOUNCE_LATENCY_SECONDS = Histogram(
+    "bot_announce_latency_seconds", "Time from an event's or tip's due instant until its message was delivered.")
+COMMAND_SECONDS = Histogram(
+    "bot_command_seconds", "Command run time, by command.", label="command")
+COMMAND_ERRORS = Counter(
+    "bot_command_errors_total", "Commands that failed, by command.", label="command")
+PERSISTENCE_WRITE_SECONDS = Histogram(
+    "bot_persistence_write_seconds", "Duration of storage writes, by target.", label="target")
+ANNOUNCEMENTS = Gauge(
+    "bot_announcements_total", "Announcer messages by outcome since start.", label="outcome", kind="counter")
+GATEWAY_LATENCY_SECONDS = Gauge(
+    "bot_gateway_latency_seconds", "Heartbeat latency to the Discord gateway.")
+GUILDS = Gauge(
+    "bot_guilds", "Guilds this process is connected to.")
+EVENTS_RESIDENT = Gauge(
+    "bot_events_resident", "Events held in memory across resident guilds.")
+SCHEDULED_GUILDS = Gauge(
+    "bot_scheduled_guilds", "Guilds with a pending entry in the event scheduler.")
+COG_LOAD_SECONDS = Gauge(
+    "bot_cog_load_seconds", "Time each cog extension took to import and initialise at its last (re)load.",
+    label="cog")
@@ -0,0 +1,337 @@
+import calendar
+import datetime
+import math
+import random
+from bisect import bisect_left, bisect_right
+
+from bot.utils.prefix_index import PrefixIndex
+
+DAY_INDEX = {name: i for i, name in enumerate(calendar.day_name)}
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+# 1970-01-01 was a Thursday, so epoch minute 0 sits this far into the week
+EPOCH_WEEK_OFFSET = DAY_INDEX["Thursday"] * MINUTES_PER_DAY
+
+def server_week_minute(now_ts: float, offset_minutes: int = 0) -> int:
+    """Return the current minute-of-week (Monday 00:00 = 0) in server time."""
+    return (int(now_ts // 60) + offset_minutes + EPOCH_WEEK_OFFSET) % MINUTES_PER_WEEK
+
+def next_daily_epoch(now_ts: float, minute_of_day: int, offset_minutes: int = 0) -> float:
+    """Return the UTC epoch second of the next `minute_of_day` (server time) strictly after `now_ts`."""
+    server_minute = int(now_ts // 60) + offset_minutes
+    ahead = (minute_of_day - server_minute) % MINUTES_PER_DAY
+    return (server_minute + (ahead or MINUTES_PER_DAY) - offset_minutes) * 60
+
+# Keys written back to events.json, in the order the commands create them
+_FIELDS = ("id", "guild_id", "type", "day", "time", "timestamp", "name", "info", "auto_delete", "last_trigger",
+           "last_fired")
+
+# ─── Event Record ────────────────────────────────────────────────────────────
+class Event:
+    """One weekly or countdown event, parsed once when loaded or edited.
+
+    Raw fields mirror the events.json schema; `weekday`, `minute_of_week`
+    and `fire_epoch` are derived from them so the scheduler and the listing
+    commands never re-parse strings. Unknown keys survive in `extra`.
+
+    `last_fired` is the fire ledger: the UTC epoch of the latest occurrence
+    already handled, so each occurrence is announced at most once.
+    """
+
+    __slots__ = _FIELDS + ("extra", "weekday", "minute_of_week", "fire_epoch", "row_id")
+
+    def __init__(self, name, info="", type="normal", day=None, time=None, timestamp=None,
+                 guild_id=None, auto_delete=False, last_trigger=None, last_fired=None, extra=None,
+                 id=None):
+        self.id = id
+        self.guild_id = guild_id
+        self.type = type
+        self.name = name
+        self.info = info
+        self.auto_delete = auto_delete
+        self.last_trigger = last_trigger
+        self.last_fired = last_fired
+        self.extra = extra
+        self.row_id = None  # SQLite backend row, never written to JSON
+        self.day = day
+        self.time = time
+        self.timestamp = timestamp
+        self._parse()
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Event":
+        kwargs = {k: data[k] for k in _FIELDS if k in data}
+        kwargs.setdefault("type", None)  # legacy rows without a type are weekly
+        extra = {k: v for k, v in data.items() if k not in _FIELDS} or None
+        return cls(**kwargs, extra=extra)
+
+    def to_dict(self) -> dict:
+        data = {}
+        for key in _FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                data[key] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __repr__(self):
+        return f"Event({self.name!r}, id={self.id!r}, kind={self.kind!r}, guild_id={self.guild_id!r})"
+
+    # ─── Derived Fields ──────────────────────────────────────────────────────
+    @property
+    def kind(self) -> str:
+        return self.type or "normal"
+
+    @property
+    def is_countdown(self) -> bool:
+        return self.type == "countdown"
+
+    @property
+    def hour(self) -> int:
+        return self.minute_of_week % MINUTES_PER_DAY // 60
+
+    @property
+    def minute(self) -> int:
+        return self.minute_of_week % 60
+
+    def _parse(self):
+        self.weekday = self.minute_of_week = self.fire_epoch = None
+        if self.is_countdown:
+            try:
+                fire = datetime.datetime.fromisoformat(self.timestamp)
+                if fire.tzinfo is None:
+                    fire = fire.replace(tzinfo=datetime.timezone.utc)
+                self.fire_epoch = fire.timestamp()
+            except (TypeError, ValueError):
+                pass
+            return
+
+        self.weekday = DAY_INDEX.get((self.day or "").capitalize())
+        try:
+            h, m = map(int, self.time.split(":"))
+        except (AttributeError, ValueError):
+            return
+        if self.weekday is not None and 0 <= h < 24 and 0 <= m < 60:
+            self.minute_of_week = self.weekday * MINUTES_PER_DAY + h * 60 + m
+
+    # ─── Mutators ────────────────────────────────────────────────────────────
+    def set_weekly(self, day: str, h: int, m: int):
+        self.day = day
+        self.time = f"{h:02d}:{m:02d}"
+        self._parse()
+
+    def set_timestamp(self, fire_at_utc: datetime.datetime):
+        self.timestamp = fire_at_utc.isoformat()
+        self._parse()
+
+    # ─── Scheduling ──────────────────────────────────────────────────────────
+    def next_fire_epoch(self, now_ts: float, offset_minutes: int = 0):
+        """Return the UTC epoch second of the next occurrence after `now_ts`.
+
+        Weekly times are in server time, i.e. UTC shifted by `offset_minutes`.
+        Countdowns return their fixed instant, even if it is already past.
+        """
+        if self.is_countdown:
+            return self.fire_epoch
+        if self.minute_of_week is None:
+            return None
+        server_minute = int(now_ts // 60) + offset_minutes
+        ahead = (self.minute_of_week - (server_minute + EPOCH_WEEK_OFFSET)) % MINUTES_PER_WEEK
+        return (server_minute + (ahead or MINUTES_PER_WEEK) - offset_minutes) * 60
+
+    def last_fire_epoch(self, now_ts: float, offset_minutes: int = 0):
+        """Return the UTC epoch second of the latest occurrence at or before `now_ts`, or None."""
+        if self.is_countdown:
+            return self.fire_epoch if self.fire_epoch is not None and self.fire_epoch <= now_ts else None
+        if self.minute_of_week is None:
+            return None
+        server_minute = int(now_ts // 60) + offset_minutes
+        behind = (server_minute + EPOCH_WEEK_OFFSET - self.minute_of_week) % MINUTES_PER_WEEK
+        return (server_minute - behind - offset_minutes) * 60
+
+# ─── Per-Guild Event Collection ──────────────────────────────────────────────
+class GuildEvents:
+    """One guild's events in ID order, indexed by ID and by case-folded name.
+
+    IDs are assigned from a per-guild counter that only ever grows, so an
+    ID keeps naming the same event after others are deleted. Legacy rows
+    without an ID are numbered in file order, matching their old positions.
+
+    Weekly events are also kept sorted by minute-of-week and countdowns by
+    fire time, each beside a parallel list of (time, id) keys to bisect.
+    Edits that move an event must go through `set_weekly`/`set_timestamp`
+    here so those lists stay sorted. `version` counts those changes, so
+    rendered listings know when to refresh. `names` serves name autocomplete.
+    """
+
+    __slots__ = ("by_id", "by_name", "next_id", "weekly", "weekly_keys", "countdowns", "countdown_keys",
+                 "version", "names")
+
+    def __init__(self, events=(), next_id: int = 1):
+        events = list(events)
+        self.by_id = {}
+        self.by_name = {}
+        self.weekly = []
+        self.weekly_keys = []
+        self.countdowns = []
+        self.countdown_keys = []
+        self.version = 0
+        self.names = PrefixIndex()
+        # Start past every stored ID so rows missing one can't collide with later rows
+        self.next_id = max([next_id] + [e.id + 1 for e in events if isinstance(e.id, int)])
+        for e in events:
+            self.add(e)
+
+    def __iter__(self):
+        return iter(self.by_id.values())
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __repr__(self):
+        return f"GuildEvents({len(self)} events, next_id={self.next_id})"
+
+    def get(self, event_id: int):
+        return self.by_id.get(event_id)
+
+    def named(self, name: str) -> list:
+        return self.by_name.get(name.casefold(), [])
+
+    def add(self, e: Event) -> Event:
+        if not isinstance(e.id, int) or e.id in self.by_id:
+            e.id = self.next_id
+        self.next_id = max(self.next_id, e.id + 1)
+        self.by_id[e.id] = e
+        same_name = self.by_name.setdefault(e.name.casefold(), [])
+        if not same_name:
+            self.names.add(e.name, e.name)
+        same_name.append(e)
+        self._index(e)
+        return e
+
+    def remove(self, e: Event):
+        self._unindex(e)
+        del self.by_id[e.id]
+        key = e.name.casefold()
+        same_name = self.by_name[key]
+        same_name.remove(e)
+        if not same_name:
+            del self.by_name[key]
+            self.names.remove(key)
+
+    def remove_where(self, predicate) -> list:
+        removed = [e for e in self.by_id.values() if predicate(e)]
+        for e in removed:
+            self.remove(e)
+        return removed
+
+    def set_weekly(self, e: Event, day: str, h: int, m: int):
+        self._unindex(e)
+        e.set_weekly(day, h, m)
+        self._index(e)
+
+    def set_timestamp(self, e: Event, fire_at_utc: datetime.datetime):
+        self._unindex(e)
+        e.set_timestamp(fire_at_utc)
+        self._index(e)
+
+    # ─── Sorted Views ────────────────────────────────────────────────────────
+    def weekly_between(self, start: int, end: int) -> list:
+        """Weekly events with `start <= minute_of_week < end`, in time order."""
+        return self.weekly[bisect_left(self.weekly_keys, (start,)):bisect_left(self.weekly_keys, (end,))]
+
+    def weekly_after(self, minute: int) -> list:
+        """Every weekly event, ordered by its next occurrence after `minute`."""
+        i = bisect_right(self.weekly_keys, (minute, math.inf))
+        return self.weekly[i:] + self.weekly[:i]
+
+    def next_weekly(self, minute: int):
+        if not self.weekly:
+            return None
+        i = bisect_right(self.weekly_keys, (minute, math.inf))
+        return self.weekly[i % len(self.weekly)]
+
+    def countdowns_between(self, start_ts: float, end_ts: float = math.inf) -> list:
+        """Countdowns with `start_ts <= fire_epoch < end_ts`, in time order."""
+        return self.countdowns[bisect_left(self.countdown_keys, (start_ts,)):
+                               bisect_left(self.countdown_keys, (end_ts,))]
+
+    def next_countdown(self, now_ts: float):
+        i = bisect_right(self.countdown_keys, (now_ts, math.inf))
+        return self.countdowns[i] if i < len(self.countdowns) else None
+
+    def _sorted(self, e: Event):
+        if e.is_countdown:
+            return self.countdown_keys, self.countdowns, e.fire_epoch
+        return self.weekly_keys, self.weekly, e.minute_of_week
+
+    def _index(self, e: Event):
+        self.version += 1
+        keys, items, at = self._sorted(e)
+        if at is not None:
+            i = bisect_right(keys, (at, e.id))
+            keys.insert(i, (at, e.id))
+            items.insert(i, e)
+
+    def _unindex(self, e: Event):
+        self.version += 1
+        keys, items, at = self._sorted(e)
+        if at is not None:
+            i = bisect_left(keys, (at, e.id))
+            del keys[i]
+            del items[i]
+
+# ─── Per-Guild Tips ──────────────────────────────────────────────────────────
+class GuildTips(list):
+    """One guild's tips in display order, plus the shuffle bag for daily tips.
+
+    `bag` is a shuffled permutation of tip positions and its first `served`
+    entries already went out this cycle, so `next_tip` is O(1) and every
+    tip is sent once before any repeats. Tips must be added and removed
+    through `add`/`remove_at` so the bag keeps pointing at the right ones.
+    """
+
+    __slots__ = ("bag", "served")
+
+    def __init__(self, tips=(), bag=None, served=0):
+        super().__init__(tips)
+        if bag is not None and sorted(bag) == list(range(len(self))):
+            self.bag = list(bag)
+            self.served = min(served, len(self))
+        else:
+            # Unknown or stale rotation: start a fresh cycle on the next pick
+            self.bag = list(range(len(self)))
+            self.served = len(self)
+
+    def rotation(self) -> dict:
+        return {"bag": list(self.bag), "served": self.served}
+
+    def add(self, tip: str):
+        self.append(tip)
+        # A new tip joins the unserved part of the current cycle at a random spot
+        self.bag.insert(random.randint(self.served, len(self.bag)), len(self) - 1)
+
+    def remove_at(self, index: int) -> str:
+        tip = self.pop(index)
+        i = self.bag.index(index)
+        del self.bag[i]
+        if i < self.served:
+            self.served -= 1
+        self.bag = [j - (j > index) for j in self.bag]
+        return tip
+
+    def next_tip(self):
+        if not self:
+            return None
+        if self.served >= len(self.bag):
+            last = self.bag[-1]
+            random.shuffle(self.bag)
+            self.served = 0
+            # Don't open the new cycle with the tip that closed the last one
+            if len(self.bag) > 1 and self.bag[0] == last:
+                j = random.randrange(1, len(self.bag))
+                self.bag[0], self.bag[j] = self.bag[j], self.bag[0]
+        tip = self[self.bag[self.served]]
+        self.served += 1
+        return tip
@@ -0,0 +1,72 @@
+import discord
+
+# Seconds without a button press before the buttons are removed
+PAGINATOR_TIMEOUT = 180
+# Items shown per page by the listing commands
+PAGE_SIZE = 10
+
+# ─── Button Paginator ────────────────────────────────────────────────────────
+class Paginator(discord.ui.View):
+    """One message that shows a long listing a page at a time.
+
+    `render(page, total)` builds the embed for a 0-based page and
+    `count()` returns the number of pages. Pages are rendered only when
+    first shown and kept until `version()` changes, i.e. until the data
+    behind them does. Only the member who ran the command can turn pages.
+    """
+
+    def __init__(self, author, render, count, version=lambda: None, timeout: float = PAGINATOR_TIMEOUT):
+        super().__init__(timeout=timeout)
+        self.author = author
+        self.render = render
+        self.count = count
+        self.version = version
+        self.seen = version()
+        self.pages = {}
+        self.page = 0
+        self.message = None
+
+    def current(self) -> discord.Embed:
+        version = self.version()
+        if version != self.seen:
+            self.pages.clear()
+            self.seen = version
+        total = max(self.count(), 1)
+        self.page = min(self.page, total - 1)
+        if self.page not in self.pages:
+            self.pages[self.page] = self.render(self.page, total)
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= total - 1
+        return self.pages[self.page]
+
+    async def send(self, ctx):
+        embed = self.current()
+        if self.count() <= 1:
+            self.stop()
+            return await ctx.send(embed=embed)
+        self.message = await ctx.send(embed=embed, view=self)
+        return self.message
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id == self.author.id:
+            return True
+        await interaction.response.send_message("Run the command yourself to browse this list.", ephemeral=True)
+        return False
+
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = max(self.page - 1, 0)
+        await interaction.response.edit_message(embed=self.current(), view=self)
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        await interaction.response.edit_message(embed=self.current(), view=self)
+
+    async def on_timeout(self):
+        self.pages.clear()
+        if self.message:
+            try:
+                await self.message.edit(view=None)
+            except discord.HTTPException:
+                pass
@@ -0,0 +1,180 @@
+import abc
+import asyncio
+import atexit
+import json
+import os
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, a single process is assumed
+    fcntl = None
+
+from bot.logger import setup_logging
+from bot.utils.metrics import PERSISTENCE_WRITE_SECONDS
+
+logger = setup_logging("persistence")
+
+_writers = []
+
+# ─── Atomic File Write ───────────────────────────────────────────────────────
+def atomic_write_json(path, data):
+    """Write `data` to a temp file beside `path`, fsync it, then rename over `path`."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+# ─── Cross-Process Update ────────────────────────────────────────────────────
+def locked_update_json(path, update):
+    """Re-read `path` under an exclusive lock, apply `update(data)` and write it back atomically.
+
+    Used for files several processes write, so none of them overwrites the
+    others' entries with a stale copy.
+    """
+    with open(path + ".lock", "a") as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        update(data)
+        atomic_write_json(path, data)
+
+# ─── Write-Behind Writers ────────────────────────────────────────────────────
+class WriteBehind(abc.ABC):
+    """Coalesces saves into a single delayed write; subclasses implement `_write`.
+
+    `mark_dirty(snapshot)` only records how to snapshot the state. After
+    `delay` seconds the snapshot is taken on the event loop and written,
+    in a worker thread when `offload` is set; saves made meanwhile ride
+    along with it. Without a running loop (scripts, shutdown) the write
+    happens inline.
+    """
+
+    offload = True
+
+    def __init__(self, name, delay: float, target=None):
+        self.name = name
+        self.target = target or name  # metrics label; per-guild shards share their directory's
+        self.delay = delay
+        self.snapshot = None
+        self.dirty = False
+        self.handle = None
+        self.task = None
+        self.io_lock = threading.Lock()
+        _writers.append(self)
+
+    @property
+    def pending(self) -> bool:
+        """True while a save is queued or being written."""
+        return self.dirty or self.handle is not None or (self.task is not None and not self.task.done())
+
+    def mark_dirty(self, snapshot):
+        self.snapshot = snapshot
+        self.dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush_sync()
+            return
+        if self.handle is None and (self.task is None or self.task.done()):
+            self.handle = loop.call_later(self.delay, self._start_flush)
+
+    def _start_flush(self):
+        self.handle = None
+        self.task = asyncio.ensure_future(self.flush())
+
+    async def flush(self):
+        if self.handle is not None:
+            self.handle.cancel()
+            self.handle = None
+        while self.dirty:
+            self.dirty = False
+            try:
+                data = self.snapshot()
+                with PERSISTENCE_WRITE_SECONDS.time(self.target):
+                    if self.offload:
+                        await asyncio.to_thread(self._write, data)
+                    else:
+                        self._write(data)
+            except Exception as e:
+                logger.error("❌ Failed to save %s: %s", self.name, e)
+
+    def flush_sync(self):
+        if not self.dirty:
+            return
+        self.dirty = False
+        try:
+            data = self.snapshot()
+            with PERSISTENCE_WRITE_SECONDS.time(self.target):
+                self._write(data)
+        except Exception as e:
+            logger.error("❌ Failed to save %s: %s", self.name, e)
+
+    @abc.abstractmethod
+    def _write(self, data):
+        """Persist one snapshot; an exception is logged by the caller, not retried."""
+
+
+class JsonWriter(WriteBehind):
+    """Write-behind saves of one JSON file, serialised and written off the loop.
+
+    With `merge(current, snapshot)` the snapshot is a set of changes instead,
+    folded into the file's current contents under `locked_update_json`.
+    """
+
+    def __init__(self, path, delay: float, merge=None, target=None):
+        super().__init__(os.path.basename(path), delay, target)
+        self.path = path
+        self.merge = merge
+
+    def _write(self, data):
+        with self.io_lock:
+            if self.merge:
+                locked_update_json(self.path, lambda current: self.merge(current, data))
+            else:
+                atomic_write_json(self.path, data)
+        logger.info("💾 Saved %s", self.name)
+
+
+class BatchWriter(WriteBehind):
+    """Write-behind for `write(batch)` callables that must stay on the loop thread, e.g. SQLite."""
+
+    offload = False
+
+    def __init__(self, name, delay: float, write):
+        super().__init__(name, delay)
+        self.write = write
+
+    def _write(self, data):
+        self.write(data)
+
+# ─── Shutdown ────────────────────────────────────────────────────────────────
+async def flush_all():
+    """Write out every pending save; call before the event loop stops."""
+    for writer in _writers:
+        if writer.task is not None and not writer.task.done():
+            await writer.task
+        await writer.flush()
+
+def flush_all_sync():
+    for writer in _writers:
+        writer.flush_sync()
+
+# Last resort for saves still pending when the interpreter exits
+atexit.register(flush_all_sync)
@@ -0,0 +1,47 @@
+from bisect import bisect_left, insort
+
+# Discord shows at most this many autocomplete choices
+MAX_CHOICES = 25
+
+# ─── Prefix Index ────────────────────────────────────────────────────────────
+class PrefixIndex:
+    """Case-insensitive prefix lookup over (key, value) pairs kept in one sorted list.
+
+    Every key starting with a prefix sits in one contiguous run, so a
+    search is a bisect to the run plus a scan of at most `limit` matches,
+    fast enough for autocomplete over thousands of entries. A value may be
+    filed under several keys (e.g. "Asia/Tokyo" under "tokyo" too).
+    """
+
+    __slots__ = ("entries",)
+
+    def __init__(self, items=()):
+        self.entries = sorted((key.casefold(), value) for key, value in items)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, key: str, value: str):
+        insort(self.entries, (key.casefold(), value))
+
+    def remove(self, key: str):
+        """Drop every value filed under exactly `key`."""
+        key = key.casefold()
+        i = j = bisect_left(self.entries, (key,))
+        while j < len(self.entries) and self.entries[j][0] == key:
+            j += 1
+        del self.entries[i:j]
+
+    def search(self, prefix: str, limit: int = MAX_CHOICES) -> list:
+        """Up to `limit` distinct values with a key starting with `prefix`, in key order."""
+        prefix = prefix.casefold()
+        found = []
+        seen = set()
+        for i in range(bisect_left(self.entries, (prefix,)), len(self.entries)):
+            key, value = self.entries[i]
+            if not key.startswith(prefix) or len(found) >= limit:
+                break
+            if value not in seen:
+                seen.add(value)
+                found.append(value)
+        return found
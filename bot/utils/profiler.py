@@ -0,0 +1,64 @@
+import asyncio
+import collections
+import os
+import sys
+import threading
+import time
+
+# Frames of the selector wait: the loop is idle while these are on top
+_IDLE_FUNCTIONS = {"select", "poll", "epoll", "kqueue", "_run_once"}
+
+# ─── Event Loop Sampler ──────────────────────────────────────────────────────
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+def _sample(thread_id: int, duration: float, interval: float) -> collections.Counter:
+    """Poll `thread_id`'s Python stack every `interval` seconds, root first."""
+    stacks = collections.Counter()
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        frame = sys._current_frames().get(thread_id)
+        stack = []
+        while frame is not None:
+            stack.append(_frame_label(frame))
+            frame = frame.f_back
+        if stack:
+            stacks[tuple(reversed(stack))] += 1
+        time.sleep(interval)
+    return stacks
+
+class LoopProfile:
+    """Stacks sampled from the event loop thread, aggregated by count."""
+
+    def __init__(self, stacks: collections.Counter, duration: float, interval: float):
+        self.stacks = stacks
+        self.duration = duration
+        self.interval = interval
+        self.samples = sum(stacks.values())
+        self.idle = sum(n for stack, n in stacks.items() if stack[-1].split(" ")[0] in _IDLE_FUNCTIONS)
+
+    @property
+    def busy_ratio(self) -> float:
+        return (self.samples - self.idle) / self.samples if self.samples else 0.0
+
+    def top_functions(self, limit: int = 10) -> list:
+        """(function, samples) with the most busy samples on top of the stack."""
+        leaves = collections.Counter()
+        for stack, n in self.stacks.items():
+            if stack[-1].split(" ")[0] not in _IDLE_FUNCTIONS:
+                leaves[stack[-1]] += n
+        return leaves.most_common(limit)
+
+    def collapsed(self) -> str:
+        """Folded stacks ("root;...;leaf count"), as read by flamegraph.pl and speedscope."""
+        return "\n".join(f"{';'.join(stack)} {n}" for stack, n in self.stacks.most_common()) + "\n"
+
+async def profile_loop(duration: float, interval: float = 0.005) -> LoopProfile:
+    """Sample the running event loop's stack from a helper thread for `duration` seconds.
+
+    Call from the loop itself; it keeps running normally while it is sampled.
+    """
+    thread_id = threading.get_ident()
+    stacks = await asyncio.to_thread(_sample, thread_id, duration, interval)
+    return LoopProfile(stacks, duration, interval)
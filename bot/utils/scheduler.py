@@ -0,0 +1,65 @@
+import heapq
+import itertools
+
+# ─── Due-Time Priority Queue ─────────────────────────────────────────────────
+class DueQueue:
+    """Min-heap of keys ordered by their next fire instant (epoch seconds).
+
+    Rescheduling or cancelling a key marks its old heap entry as removed
+    instead of searching the heap, so every operation stays O(log n).
+    """
+
+    _REMOVED = object()
+
+    def __init__(self):
+        self._heap = []
+        self._entries = {}
+        self._removed = 0
+        self._counter = itertools.count()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def schedule(self, key, fire_at: float):
+        self.cancel(key)
+        entry = [fire_at, next(self._counter), key]
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+
+    def cancel(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        entry[2] = self._REMOVED
+        self._removed += 1
+        # Rebuild once stale entries dominate so the heap can't grow unbounded
+        if self._removed > 64 and self._removed > len(self._entries):
+            self._heap = [e for e in self._heap if e[2] is not self._REMOVED]
+            heapq.heapify(self._heap)
+            self._removed = 0
+
+    def when(self, key):
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def peek(self):
+        """Return the earliest fire instant, or None if nothing is scheduled."""
+        while self._heap and self._heap[0][2] is self._REMOVED:
+            heapq.heappop(self._heap)
+            self._removed -= 1
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> list:
+        """Pop every key due at or before `now` as (key, fire_at) pairs."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            fire_at, _, key = heapq.heappop(self._heap)
+            if key is self._REMOVED:
+                self._removed -= 1
+                continue
+            del self._entries[key]
+            due.append((key, fire_at))
+        return due
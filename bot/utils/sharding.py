@@ -0,0 +1,15 @@
+from bot.config_loader import SHARD_COUNT, SHARD_IDS
+
+_owned = frozenset(SHARD_IDS or ())
+
+# ─── Guild Ownership ─────────────────────────────────────────────────────────
+def shard_for(guild_id, shard_count: int) -> int:
+    """Return the shard Discord routes `guild_id` to."""
+    try:
+        return (int(guild_id) >> 22) % shard_count
+    except ValueError:
+        return 0  # legacy "default" bucket
+
+def owns_guild(guild_id) -> bool:
+    """True if this process's shards include `guild_id` (always, outside cluster mode)."""
+    return SHARD_IDS is None or shard_for(guild_id, SHARD_COUNT) in _owned
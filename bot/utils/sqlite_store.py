@@ -0,0 +1,315 @@
+import json
+import sqlite3
+
+from bot.utils.models import Event, GuildEvents, GuildTips, MINUTES_PER_WEEK
+from bot.logger import setup_logging
+
+logger = setup_logging("sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    row_id         INTEGER PRIMARY KEY,
+    guild_id       TEXT NOT NULL,
+    name_key       TEXT NOT NULL,
+    type           TEXT,
+    minute_of_week INTEGER,
+    utc_minute     INTEGER,
+    fire_epoch     REAL,
+    data           TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_guild_name ON events (guild_id, name_key);
+CREATE INDEX IF NOT EXISTS idx_events_utc_minute ON events (utc_minute);
+CREATE INDEX IF NOT EXISTS idx_events_fire_epoch ON events (fire_epoch);
+
+CREATE TABLE IF NOT EXISTS event_ids (
+    guild_id TEXT PRIMARY KEY,
+    next_id  INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tips (
+    row_id   INTEGER PRIMARY KEY,
+    guild_id TEXT NOT NULL,
+    text     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tips_guild ON tips (guild_id, row_id);
+
+CREATE TABLE IF NOT EXISTS tip_rotation (
+    guild_id TEXT PRIMARY KEY,
+    bag      TEXT NOT NULL,
+    served   INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS guild_due (
+    guild_id TEXT PRIMARY KEY,
+    next_due REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_guild_due_next ON guild_due (next_due);
+
+CREATE TABLE IF NOT EXISTS due_scopes (
+    scope TEXT PRIMARY KEY
+);
+
+CREATE TABLE IF NOT EXISTS config (
+    section TEXT NOT NULL,
+    key     TEXT NOT NULL,
+    value   TEXT NOT NULL,
+    PRIMARY KEY (section, key)
+);
+"""
+
+_stores = {}
+# Seconds a write waits for another process's transaction before failing
+BUSY_TIMEOUT = 30
+
+# ─── SQLite Store ────────────────────────────────────────────────────────────
+class SqliteStore:
+    """Row-level storage for events, tips and config in one SQLite file.
+
+    Every event row keeps its full JSON record in `data` so it round-trips
+    exactly like events.json; the other columns only exist to be indexed.
+    Weekly rows also carry `utc_minute`, their minute-of-week in UTC, which
+    is recomputed when the guild's server offset changes. `event_ids` keeps
+    each guild's next event ID so deleted IDs are never handed out again.
+
+    Cluster workers each open their own connection; they write disjoint
+    guilds, and WAL plus the busy timeout serialise their commits.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT)
+        # WAL + NORMAL commits without an fsync per transaction
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        logger.info("✅ Opened %s", path)
+
+    def close(self):
+        self.conn.close()
+
+    # ─── Events ──────────────────────────────────────────────────────────────
+    def load_events(self) -> dict:
+        rows = {}
+        for row_id, gid, data in self.conn.execute("SELECT row_id, guild_id, data FROM events ORDER BY row_id"):
+            e = Event.from_dict(json.loads(data))
+            e.row_id = row_id
+            rows.setdefault(gid, []).append(e)
+        next_ids = dict(self.conn.execute("SELECT guild_id, next_id FROM event_ids"))
+        return {gid: GuildEvents(events, next_ids.get(gid, 1)) for gid, events in rows.items()}
+
+    def load_guild_events(self, gid) -> GuildEvents:
+        events = []
+        for row_id, data in self.conn.execute(
+                "SELECT row_id, data FROM events WHERE guild_id = ? ORDER BY row_id", (gid,)):
+            e = Event.from_dict(json.loads(data))
+            e.row_id = row_id
+            events.append(e)
+        row = self.conn.execute("SELECT next_id FROM event_ids WHERE guild_id = ?", (gid,)).fetchone()
+        return GuildEvents(events, row[0] if row else 1)
+
+    def list_event_guilds(self) -> list:
+        return [gid for (gid,) in self.conn.execute("SELECT DISTINCT guild_id FROM events")]
+
+    def _event_row(self, gid, e, offset):
+        utc_minute = None
+        if e.minute_of_week is not None:
+            utc_minute = (e.minute_of_week - offset) % MINUTES_PER_WEEK
+        return (gid, e.name.casefold(), e.type, e.minute_of_week, utc_minute, e.fire_epoch,
+                json.dumps(e.to_dict(), separators=(",", ":")))
+
+    def save_event(self, gid, e, next_id: int):
+        row = self._event_row(gid, e, self.get_offset(gid))
+        with self.conn:
+            self._set_next_id(gid, next_id)
+            if e.row_id is None:
+                cur = self.conn.execute(
+                    "INSERT INTO events (guild_id, name_key, type, minute_of_week, utc_minute, fire_epoch, data)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)", row)
+                e.row_id = cur.lastrowid
+            else:
+                self.conn.execute(
+                    "UPDATE events SET guild_id = ?, name_key = ?, type = ?, minute_of_week = ?, utc_minute = ?,"
+                    " fire_epoch = ?, data = ? WHERE row_id = ?", row + (e.row_id,))
+
+    def insert_events(self, gid, events, next_id: int):
+        """Add a batch of new events to one guild in a single transaction."""
+        offset = self.get_offset(gid)
+        with self.conn:
+            self._set_next_id(gid, next_id)
+            for e in events:
+                cur = self.conn.execute(
+                    "INSERT INTO events (guild_id, name_key, type, minute_of_week, utc_minute, fire_epoch, data)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)", self._event_row(gid, e, offset))
+                e.row_id = cur.lastrowid
+
+    def update_event_data(self, events):
+        """Rewrite just the JSON record of already-stored events, in one transaction."""
+        with self.conn:
+            self.conn.executemany("UPDATE events SET data = ? WHERE row_id = ?", [
+                (json.dumps(e.to_dict(), separators=(",", ":")), e.row_id) for e in events if e.row_id is not None])
+
+    def delete_events(self, events):
+        with self.conn:
+            self.conn.executemany("DELETE FROM events WHERE row_id = ?",
+                                  [(e.row_id,) for e in events if e.row_id is not None])
+        for e in events:
+            e.row_id = None
+
+    def replace_all_events(self, events_dict):
+        with self.conn:
+            self.conn.execute("DELETE FROM events")
+            self.conn.execute("DELETE FROM event_ids")
+            for gid, events in events_dict.items():
+                self._set_next_id(gid, events.next_id)
+                offset = self.get_offset(gid)
+                for e in events:
+                    cur = self.conn.execute(
+                        "INSERT INTO events (guild_id, name_key, type, minute_of_week, utc_minute, fire_epoch, data)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?)", self._event_row(gid, e, offset))
+                    e.row_id = cur.lastrowid
+
+    def _set_next_id(self, gid, next_id: int):
+        self.conn.execute(
+            "INSERT INTO event_ids (guild_id, next_id) VALUES (?, ?)"
+            " ON CONFLICT (guild_id) DO UPDATE SET next_id = max(next_id, excluded.next_id)", (gid, next_id))
+
+    # ─── Tips ────────────────────────────────────────────────────────────────
+    def load_tips(self) -> dict:
+        texts = {}
+        for gid, text in self.conn.execute("SELECT guild_id, text FROM tips ORDER BY row_id"):
+            texts.setdefault(gid, []).append(text)
+        rotations = {gid: (json.loads(bag), served)
+                     for gid, bag, served in self.conn.execute("SELECT guild_id, bag, served FROM tip_rotation")}
+        return {gid: GuildTips(tips, *rotations.get(gid, (None, 0))) for gid, tips in texts.items()}
+
+    def load_guild_tips(self, gid) -> GuildTips:
+        tips = [text for (text,) in self.conn.execute(
+            "SELECT text FROM tips WHERE guild_id = ? ORDER BY row_id", (gid,))]
+        row = self.conn.execute("SELECT bag, served FROM tip_rotation WHERE guild_id = ?", (gid,)).fetchone()
+        return GuildTips(tips, json.loads(row[0]), row[1]) if row else GuildTips(tips)
+
+    def add_tip(self, gid, tip, rotation):
+        with self.conn:
+            self.conn.execute("INSERT INTO tips (guild_id, text) VALUES (?, ?)", (gid, tip))
+            self._set_tip_rotation(gid, rotation)
+
+    def remove_tip(self, gid, index, rotation):
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM tips WHERE row_id = "
+                "(SELECT row_id FROM tips WHERE guild_id = ? ORDER BY row_id LIMIT 1 OFFSET ?)", (gid, index))
+            self._set_tip_rotation(gid, rotation)
+
+    def set_tip_rotation(self, gid, rotation):
+        with self.conn:
+            self._set_tip_rotation(gid, rotation)
+
+    def replace_all_tips(self, tip_dict):
+        with self.conn:
+            self.conn.execute("DELETE FROM tips")
+            self.conn.execute("DELETE FROM tip_rotation")
+            self.conn.executemany("INSERT INTO tips (guild_id, text) VALUES (?, ?)",
+                                  [(gid, tip) for gid, tips in tip_dict.items() for tip in tips])
+            for gid, tips in tip_dict.items():
+                if isinstance(tips, GuildTips):
+                    self._set_tip_rotation(gid, tips.rotation())
+
+    def _set_tip_rotation(self, gid, rotation):
+        self.conn.execute(
+            "INSERT INTO tip_rotation (guild_id, bag, served) VALUES (?, ?, ?)"
+            " ON CONFLICT (guild_id) DO UPDATE SET bag = excluded.bag, served = excluded.served",
+            (gid, json.dumps(rotation["bag"]), rotation["served"]))
+
+    # ─── Next-Due Index ──────────────────────────────────────────────────────
+    def load_due_index(self, scope):
+        """Return {guild_id: next_due}, or None if `scope`'s guilds were never indexed."""
+        if not self.conn.execute("SELECT 1 FROM due_scopes WHERE scope = ?", (scope,)).fetchone():
+            return None
+        return dict(self.conn.execute("SELECT guild_id, next_due FROM guild_due"))
+
+    def update_due_index(self, dues: dict, scopes=()):
+        """Write {guild_id: next_due or None} and then mark `scopes` indexed, in one transaction."""
+        with self.conn:
+            self.conn.executemany("DELETE FROM guild_due WHERE guild_id = ?",
+                                  [(gid,) for gid, due in dues.items() if due is None])
+            self.conn.executemany(
+                "INSERT INTO guild_due (guild_id, next_due) VALUES (?, ?)"
+                " ON CONFLICT (guild_id) DO UPDATE SET next_due = excluded.next_due",
+                [(gid, due) for gid, due in dues.items() if due is not None])
+            self.conn.executemany("INSERT OR IGNORE INTO due_scopes (scope) VALUES (?)", [(s,) for s in scopes])
+
+    # ─── Config ──────────────────────────────────────────────────────────────
+    def load_config(self) -> dict:
+        config = {"channels": {}, "server_offsets": {}, "user_timezones": {}}
+        for section, key, value in self.conn.execute("SELECT section, key, value FROM config"):
+            config.setdefault(section, {})[key] = json.loads(value)
+        return config
+
+    def data_version(self) -> int:
+        """Changes whenever another connection commits, e.g. another cluster worker."""
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def get_offset(self, gid) -> int:
+        row = self.conn.execute(
+            "SELECT value FROM config WHERE section = 'server_offsets' AND key = ?", (gid,)).fetchone()
+        return json.loads(row[0]) if row else 0
+
+    def set_config_value(self, section, key, value):
+        with self.conn:
+            self._set_config_value(section, key, value)
+
+    def replace_config(self, config):
+        with self.conn:
+            self.conn.execute("DELETE FROM config")
+            for section, values in config.items():
+                if isinstance(values, dict):
+                    for key, value in values.items():
+                        self._set_config_value(section, key, value)
+
+    def _set_config_value(self, section, key, value):
+        self.conn.execute(
+            "INSERT INTO config (section, key, value) VALUES (?, ?, ?)"
+            " ON CONFLICT (section, key) DO UPDATE SET value = excluded.value",
+            (section, key, json.dumps(value)))
+        if section == "server_offsets":
+            self.conn.execute(
+                "UPDATE events SET utc_minute = (minute_of_week - ? + ?) % ?"
+                " WHERE guild_id = ? AND minute_of_week IS NOT NULL",
+                (value, MINUTES_PER_WEEK, MINUTES_PER_WEEK, key))
+
+
+def get_store(path) -> SqliteStore:
+    """Return the process-wide store for `path`, opening it on first use."""
+    if path not in _stores:
+        _stores[path] = SqliteStore(path)
+    return _stores[path]
+
+# ─── One-Shot Migration From JSON ────────────────────────────────────────────
+def migrate_from_json(store: SqliteStore):
+    """Copy the JSON config, events and tips into `store`, replacing its contents."""
+    from bot.config_loader import CONFIG_PATH
+    from bot.utils.storage import load_json_events, load_json_tips
+
+    try:
+        with open(CONFIG_PATH, "r") as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        logger.warning("⚠️ %s not found, skipping", CONFIG_PATH)
+        config = {}
+    events = load_json_events()
+    tips = load_json_tips()
+
+    # Config first so weekly rows get their guild's offset
+    store.replace_config(config)
+    store.replace_all_events(events)
+    store.replace_all_tips(tips)
+    with store.conn:
+        # Rebuilt by the scheduler on next start
+        store.conn.execute("DELETE FROM guild_due")
+        store.conn.execute("DELETE FROM due_scopes")
+    logger.info("✅ Migrated %s events and %s tips into %s",
+                sum(map(len, events.values())), sum(map(len, tips.values())), store.path)
+
+if __name__ == "__main__":
+    from bot.config_loader import SQLITE_PATH
+    migrate_from_json(get_store(SQLITE_PATH))
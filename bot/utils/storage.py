@@ -1,57 +1,319 @@
 ﻿import json
-from bot.config_loader import EVENTS_PATH, TIPS_PATH
-from bot.utils.helpers import validate_event_day
+import os
+from bot.config_loader import (
+    EVENTS_PATH, TIPS_PATH, EVENTS_DIR, TIPS_DIR, DUE_INDEX_PATH, SAVE_DELAY, SHARD_LABEL, get_db,
+)
+from bot.utils.models import Event, GuildEvents, GuildTips
+from bot.utils.persistence import JsonWriter, BatchWriter, atomic_write_json
+from bot.utils.metrics import PERSISTENCE_WRITE_SECONDS
+from bot.utils.tracing import storage_call
 from bot.logger import setup_logging
 
 logger = setup_logging("storage")
 
+# One write-behind writer per shard file, created on first save
+_writers = {}
+_due_writer = JsonWriter(DUE_INDEX_PATH, SAVE_DELAY)
+_sharded = set()
+# Events whose fire ledger changed since the last SQLite batch, by row id, and their guilds,
+# which stay pinned in the guild cache until the batch is written
+_fired_rows = {}
+_fired_guilds = set()
+
+def _take_fired_rows() -> list:
+    events = list(_fired_rows.values())
+    _fired_rows.clear()
+    _fired_guilds.clear()
+    return events
+
+_ledger_writer = BatchWriter("fire ledger", SAVE_DELAY, lambda events: get_db().update_event_data(events))
+
+# Next-due changes not yet written to SQLite, and the scope to mark indexed once they are
+_due_changes = {}
+_due_scopes = set()
+
+def _take_due_changes() -> tuple:
+    batch = (dict(_due_changes), set(_due_scopes))
+    _due_changes.clear()
+    _due_scopes.clear()
+    return batch
+
+_due_batch_writer = BatchWriter("due index", SAVE_DELAY, lambda batch: get_db().update_due_index(*batch))
+
+def _writer(path) -> JsonWriter:
+    if path not in _writers:
+        _writers[path] = JsonWriter(path, SAVE_DELAY, target=os.path.basename(os.path.dirname(path)))
+    return _writers[path]
+
+def _shard_path(directory, guild_id: str) -> str:
+    return os.path.join(directory, f"{guild_id}.json")
+
+def _read_json(path, default):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+# ─── Legacy Single-File Migration ────────────────────────────────────────────
+def _ensure_shards(directory, legacy_path):
+    """Split a legacy whole-bot JSON file into per-guild shards, once."""
+    if directory in _sharded:
+        return
+    _sharded.add(directory)
+    if os.path.isdir(directory):
+        return
+    try:
+        data = _read_json(legacy_path, {})
+    except Exception as e:
+        logger.error("❌ Failed to load %s: %s", legacy_path, e)
+        data = {}
+    if isinstance(data, list):
+        logger.warning("⚠️ %s is in legacy format (list).", legacy_path)
+        data = {"default": data}
+
+    # Build the shards beside the target and rename, so a crash can't leave half a split
+    staging = directory + ".tmp"
+    os.makedirs(staging, exist_ok=True)
+    for gid, rows in data.items():
+        atomic_write_json(_shard_path(staging, gid), rows)
+    os.replace(staging, directory)
+    logger.info("📦 Split %s into %s guild shard(s) under %s", legacy_path, len(data), directory)
+
+def prepare_storage():
+    """Run one-time storage migrations up front, before worker processes share the files."""
+    if get_db():
+        return
+    _ensure_shards(EVENTS_DIR, EVENTS_PATH)
+    _ensure_shards(TIPS_DIR, TIPS_PATH)
+
+def load_json_events() -> dict:
+    """Read every JSON event shard, regardless of the configured backend."""
+    _ensure_shards(EVENTS_DIR, EVENTS_PATH)
+    return {gid: _load_json_guild_events(gid) for gid in _json_guilds(EVENTS_DIR)}
+
+def load_json_tips() -> dict:
+    _ensure_shards(TIPS_DIR, TIPS_PATH)
+    return {gid: _load_json_guild_tips(gid) for gid in _json_guilds(TIPS_DIR)}
+
+def _json_guilds(directory) -> list:
+    return [name[:-5] for name in os.listdir(directory) if name.endswith(".json")]
+
+def _load_json_guild_events(guild_id: str) -> GuildEvents:
+    data = _read_json(_shard_path(EVENTS_DIR, guild_id), [])
+    # Shards split from the legacy file are bare lists without an ID counter
+    if isinstance(data, list):
+        data = {"events": data}
+    events = map(Event.from_dict, data.get("events", []))
+    # Drop legacy weekly rows whose day never parsed
+    return GuildEvents((e for e in events if e.type != "normal" or e.weekday is not None),
+                       data.get("next_id", 1))
+
+def _load_json_guild_tips(guild_id: str) -> GuildTips:
+    data = _read_json(_shard_path(TIPS_DIR, guild_id), [])
+    # Shards written before the daily-tip rotation are bare lists
+    if isinstance(data, list):
+        data = {"tips": data}
+    return GuildTips(data.get("tips", []), data.get("bag"), data.get("served", 0))
+
 # ─── Event Handling ──────────────────────────────────────────────────────────
+@storage_call
+def load_guild_events(guild_id: str) -> GuildEvents:
+    """Page one guild's events in from storage."""
+    db = get_db()
+    if db:
+        return db.load_guild_events(guild_id)
+    _ensure_shards(EVENTS_DIR, EVENTS_PATH)
+    try:
+        return _load_json_guild_events(guild_id)
+    except Exception as e:
+        logger.error("❌ Failed to load events for guild %s: %s", guild_id, e)
+        return GuildEvents()
+
+def list_event_guilds() -> list:
+    db = get_db()
+    if db:
+        return db.list_event_guilds()
+    _ensure_shards(EVENTS_DIR, EVENTS_PATH)
+    return _json_guilds(EVENTS_DIR)
+
+def events_pending(guild_id: str) -> bool:
+    """True while the guild has unsaved changes, so paging it out and back in would lose them."""
+    if guild_id in _fired_guilds:
+        return True
+    writer = _writers.get(_shard_path(EVENTS_DIR, guild_id))
+    return writer is not None and writer.pending
+
 def load_all_events():
+    db = get_db()
+    if db:
+        return db.load_events()
     try:
-        with open(EVENTS_PATH, "r") as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                logger.warning("⚠️ events.json is in legacy format (list).")
-                return {"default": data}
-            return data
+        return load_json_events()
     except Exception as e:
-        logger.error(f"❌ Failed to load events.json: {e}")
+        logger.error("❌ Failed to load events: %s", e)
         return {}
 
 def save_all_events(events):
+    db = get_db()
+    if db:
+        with PERSISTENCE_WRITE_SECONDS.time("events"):
+            return db.replace_all_events(events)
+    for gid, guild_events in events.items():
+        _save_guild_shard(gid, guild_events)
+
+def _save_guild_shard(guild_id: str, events: GuildEvents):
+    _writer(_shard_path(EVENTS_DIR, guild_id)).mark_dirty(
+        lambda: {"next_id": events.next_id, "events": [e.to_dict() for e in events]})
+
+@storage_call
+def save_event(events_dict, guild_id: str, event):
+    """Persist one added or edited event (a single row on SQLite)."""
+    db = get_db()
+    if db:
+        return db.save_event(guild_id, event, get_guild_events(events_dict, guild_id).next_id)
+    _save_guild_shard(guild_id, get_guild_events(events_dict, guild_id))
+
+@storage_call
+def add_events(events_dict, guild_id: str, added: list):
+    """Persist a batch of new events in one write (one transaction on SQLite)."""
+    if not added:
+        return
+    db = get_db()
+    if db:
+        return db.insert_events(guild_id, added, get_guild_events(events_dict, guild_id).next_id)
+    _save_guild_shard(guild_id, get_guild_events(events_dict, guild_id))
+
+@storage_call
+def delete_events(events_dict, guild_id: str, removed: list):
+    """Persist the removal of events already dropped from `events_dict`."""
+    if not removed:
+        return
+    db = get_db()
+    if db:
+        return db.delete_events(removed)
+    _save_guild_shard(guild_id, get_guild_events(events_dict, guild_id))
+
+@storage_call
+def record_fires(events_dict, guild_id: str, events: list):
+    """Persist the fire ledger (`last_fired`) of `events`, batched with other saves."""
+    if not events:
+        return
+    if get_db():
+        for e in events:
+            _fired_rows[e.row_id] = e
+        _fired_guilds.add(guild_id)
+        return _ledger_writer.mark_dirty(_take_fired_rows)
+    _save_guild_shard(guild_id, get_guild_events(events_dict, guild_id))
+
+def get_guild_events(events_dict, guild_id: str) -> GuildEvents:
+    try:
+        return events_dict[guild_id]
+    except KeyError:
+        return events_dict.setdefault(guild_id, GuildEvents())
+
+# ─── Next-Due Index ──────────────────────────────────────────────────────────
+def load_due_index():
+    """Return {guild_id: next due epoch}, or None if it was never built for this process's shards."""
+    db = get_db()
+    if db:
+        return db.load_due_index(SHARD_LABEL)
     try:
-        with open(EVENTS_PATH, "w") as f:
-            json.dump(events, f, indent=4)
-        logger.info("💾 Saved events.json")
+        return _read_json(DUE_INDEX_PATH, None)
     except Exception as e:
-        logger.error(f"❌ Failed to save events.json: {e}")
+        logger.error("❌ Failed to load due index: %s", e)
+        return None
 
-def get_guild_events(events_dict, guild_id: str) -> list:
-    return events_dict.setdefault(guild_id, [])
+def save_due_index(due_index: dict):
+    """Record that `due_index` now covers every guild this process owns."""
+    if get_db():
+        _due_scopes.add(SHARD_LABEL)
+        return _due_batch_writer.mark_dirty(_take_due_changes)
+    _due_writer.mark_dirty(lambda: dict(due_index))
+
+@storage_call
+def set_guild_due(due_index: dict, guild_id: str, due):
+    """Update one guild's next due instant; written behind, batched with other changes."""
+    if due is None:
+        due_index.pop(guild_id, None)
+    else:
+        due_index[guild_id] = due
+    if get_db():
+        _due_changes[guild_id] = due
+        return _due_batch_writer.mark_dirty(_take_due_changes)
+    _due_writer.mark_dirty(lambda: dict(due_index))
 
 # ─── Tip Handling ────────────────────────────────────────────────────────────
+@storage_call
+def load_guild_tips(guild_id: str) -> GuildTips:
+    db = get_db()
+    if db:
+        return db.load_guild_tips(guild_id)
+    _ensure_shards(TIPS_DIR, TIPS_PATH)
+    try:
+        return _load_json_guild_tips(guild_id)
+    except Exception as e:
+        logger.warning("⚠️ Failed to load tips for guild %s: %s", guild_id, e)
+        return GuildTips()
+
+def tips_pending(guild_id: str) -> bool:
+    writer = _writers.get(_shard_path(TIPS_DIR, guild_id))
+    return writer is not None and writer.pending
+
 def load_all_tips():
+    db = get_db()
+    if db:
+        return db.load_tips()
     try:
-        with open(TIPS_PATH, "r") as f:
-            return json.load(f)
+        return load_json_tips()
     except Exception as e:
-        logger.warning(f"⚠️ Failed to load tips.json: {e}")
+        logger.warning("⚠️ Failed to load tips: %s", e)
         return {}
 
 def save_all_tips(tip_dict):
-    try:
-        with open(TIPS_PATH, "w") as f:
-            json.dump(tip_dict, f, indent=4)
-        logger.info("💾 Saved tips.json")
-    except Exception as e:
-        logger.error(f"❌ Failed to save tips.json: {e}")
+    db = get_db()
+    if db:
+        with PERSISTENCE_WRITE_SECONDS.time("tips"):
+            return db.replace_all_tips(tip_dict)
+    for gid, tips in tip_dict.items():
+        _save_tip_shard(gid, tips if isinstance(tips, GuildTips) else GuildTips(tips))
+
+def _save_tip_shard(guild_id: str, tips: GuildTips):
+    _writer(_shard_path(TIPS_DIR, guild_id)).mark_dirty(lambda: {"tips": list(tips), **tips.rotation()})
+
+def get_guild_tips(tip_dict, guild_id: str) -> GuildTips:
+    return tip_dict.setdefault(guild_id, GuildTips())
+
+@storage_call
+def add_tip(tip_dict, guild_id: str, tip: str):
+    tips = get_guild_tips(tip_dict, guild_id)
+    tips.add(tip)
+    db = get_db()
+    if db:
+        return db.add_tip(guild_id, tip, tips.rotation())
+    _save_tip_shard(guild_id, tips)
 
-def get_guild_tips(tip_dict, guild_id: str) -> list:
-    return tip_dict.setdefault(guild_id, [])
+@storage_call
+def remove_tip(tip_dict, guild_id: str, index: int) -> str:
+    tips = get_guild_tips(tip_dict, guild_id)
+    removed = tips.remove_at(index)
+    db = get_db()
+    if db:
+        db.remove_tip(guild_id, index, tips.rotation())
+    else:
+        _save_tip_shard(guild_id, tips)
+    return removed
 
-# ─── Cleanup Legacy ──────────────────────────────────────────────────────────
-def cleanup_invalid_event_days(events_dict):
-    for gid, events in events_dict.items():
-        events_dict[gid] = [
-            e for e in events if e.get("type") != "normal" or validate_event_day(e.get("day", ""))
-        ]
+@storage_call
+def next_daily_tip(tip_dict, guild_id: str):
+    """Draw the guild's next tip from its rotation and persist the rotation, or None without tips."""
+    tips = get_guild_tips(tip_dict, guild_id)
+    tip = tips.next_tip()
+    if tip is None:
+        return None
+    db = get_db()
+    if db:
+        db.set_tip_rotation(guild_id, tips.rotation())
+    else:
+        _save_tip_shard(guild_id, tips)
+    return tip
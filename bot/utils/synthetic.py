@@ -0,0 +1,157 @@
+import asyncio
+import calendar
+import datetime
+import os
+import platform
+import subprocess
+import tempfile
+from types import SimpleNamespace
+
+try:
+    import resource
+except ImportError:  # Windows: peak memory is not reported
+    resource = None
+
+import pytz
+
+from bot.utils.models import Event, GuildEvents, GuildTips
+
+# Synthetic IDs live in their own range so they can't be mistaken for real ones
+FIRST_GUILD_ID = 900000000000000000
+FIRST_CHANNEL_ID = 910000000000000000
+FIRST_USER_ID = 920000000000000000
+EVENT_WORDS = ("Raid", "Siege", "Boss", "Harvest", "Tournament", "Convoy", "Arena", "Expedition", "Rally", "Market")
+COUNTDOWN_SHARE = 0.2
+AUTO_DELETE_SHARE = 0.1
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# ─── Scratch Environment ─────────────────────────────────────────────────────
+def use_scratch_environment(backend: str, cache_size: int, save_delay: float = None) -> str:
+    """Point storage at a new temp directory and make it the working directory.
+
+    Storage paths are read from the environment and the working directory
+    when bot.config_loader is imported, so call this before anything
+    imports it. Returns the directory, which the caller removes.
+    """
+    scratch = tempfile.mkdtemp(prefix="bot-synthetic-")
+    os.environ.update(
+        DATA_DIR=os.path.join(scratch, "data"),
+        STORAGE_BACKEND=backend,
+        SQLITE_PATH=os.path.join(scratch, "bot.db"),
+        GUILD_CACHE_SIZE=str(cache_size),
+        SHARD_COUNT="",
+        SHARD_IDS="",
+    )
+    if save_delay is not None:
+        os.environ["SAVE_DELAY"] = str(save_delay)
+    os.chdir(scratch)
+    return scratch
+
+# ─── Stub Discord Objects ────────────────────────────────────────────────────
+class StubChannel:
+    def __init__(self, bot, channel_id):
+        self.bot = bot
+        self.id = channel_id
+
+    async def send(self, content=None, embed=None, embeds=None, **kwargs):
+        self.bot.messages += 1
+        self.bot.embeds += len(embeds) if embeds else 1
+        if self.bot.clock is not None:
+            self.bot.sent_at.append(self.bot.clock.time())
+
+
+class StubBot:
+    """Just enough of commands.Bot for the cogs: channels, readiness and shared services."""
+
+    def __init__(self, clock=None):
+        self.settings = None
+        self.announcer = None
+        self.clock = clock
+        self.channels = {}
+        self.messages = 0
+        self.embeds = 0
+        self.sent_at = []
+
+    def get_channel(self, channel_id):
+        if channel_id is None:
+            return None
+        if channel_id not in self.channels:
+            self.channels[channel_id] = StubChannel(self, channel_id)
+        return self.channels[channel_id]
+
+    async def wait_until_ready(self):
+        # The cogs' own loops never start; the caller drives their iterations
+        await asyncio.Event().wait()
+
+
+class StubContext:
+    def __init__(self, guild_id, author_id):
+        self.guild = SimpleNamespace(id=guild_id)
+        self.author = SimpleNamespace(id=author_id, name=f"user{author_id}")
+        self.replies = 0
+
+    async def send(self, *args, **kwargs):
+        self.replies += 1
+
+# ─── Synthetic State ─────────────────────────────────────────────────────────
+def guild_ids(count: int) -> list:
+    return [str(FIRST_GUILD_ID + i) for i in range(count)]
+
+def make_event(rng, gid, i, now_ts, countdown_span: float) -> Event:
+    """A weekly event, or a countdown firing within `countdown_span` seconds of `now_ts`."""
+    name = f"{rng.choice(EVENT_WORDS)} {i}"
+    info = f"Synthetic event {i} for guild {gid}"
+    auto = rng.random() < AUTO_DELETE_SHARE
+    if rng.random() < COUNTDOWN_SHARE:
+        fire_at = datetime.datetime.fromtimestamp(now_ts + rng.randrange(60, int(countdown_span)), pytz.utc)
+        return Event(name, info, type="countdown", timestamp=fire_at.isoformat(), guild_id=gid, auto_delete=auto)
+    return Event(name, info, day=rng.choice(calendar.day_name), time=f"{rng.randrange(24):02d}:{rng.randrange(60):02d}",
+                 guild_id=gid, auto_delete=auto, last_fired=now_ts)  # created at now_ts, like /addevent
+
+def generate_state(rng, guilds: int, events: int, tips: int, users: int, now_ts: float,
+                   countdown_span: float = 14 * 86400) -> tuple[dict, dict, dict]:
+    """Write config, events and tips for `guilds` synthetic guilds through the configured backend.
+
+    Returns the (config, events, tips) written, for callers that check results against them.
+    """
+    from bot.config_loader import save_config
+    from bot.utils.storage import save_all_events, save_all_tips
+
+    gids = guild_ids(guilds)
+    config = {
+        "channels": {gid: FIRST_CHANNEL_ID + i for i, gid in enumerate(gids)},
+        "server_offsets": {gid: rng.randrange(-12 * 60, 14 * 60 + 1, 30) for gid in gids},
+        "user_timezones": {str(FIRST_USER_ID + u): rng.choice(pytz.common_timezones) for u in range(0, users, 2)},
+        "tip_times": {gid: rng.randrange(24 * 60) for gid in gids if rng.random() < 0.5},
+    }
+    # Config first so SQLite weekly rows get their guild's offset
+    save_config(config)
+
+    all_events = {gid: GuildEvents(make_event(rng, gid, i, now_ts, countdown_span) for i in range(events))
+                  for gid in gids}
+    save_all_events(all_events)
+    all_tips = {gid: GuildTips(f"Tip {i} for guild {gid}: {rng.choice(EVENT_WORDS)} early." for i in range(tips))
+                for gid in gids}
+    save_all_tips(all_tips)
+    return config, all_events, all_tips
+
+# ─── Report Metadata ─────────────────────────────────────────────────────────
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_metadata() -> dict:
+    """What a JSON report needs to be compared with one from another release or machine."""
+    return {
+        "format": 1,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        # Linux reports KiB
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else None,
+    }
@@ -0,0 +1,90 @@
+import contextvars
+import functools
+import time
+
+import aiohttp
+
+# The trace of the command running in the current task, or None outside commands
+_current = contextvars.ContextVar("command_trace", default=None)
+
+# ─── Command Trace ───────────────────────────────────────────────────────────
+class Trace:
+    """Wall time of one command invocation, split by where it was spent.
+
+    `parse` runs from receipt of the message or interaction to the
+    before-invoke hook (prefix lookup, checks, argument conversion);
+    `storage` and `discord` accumulate inside the command; `other` is
+    whatever is left, mostly the command's own Python.
+    """
+
+    __slots__ = ("started", "invoked", "storage", "discord", "depth")
+
+    def __init__(self, started: float = None):
+        self.started = time.perf_counter() if started is None else started
+        self.invoked = None
+        self.storage = 0.0
+        self.discord = 0.0
+        self.depth = 0
+
+    def phases(self, finished: float) -> dict:
+        total = finished - self.started
+        parse = (self.invoked or self.started) - self.started
+        return {
+            "total": total,
+            "parse": parse,
+            "storage": self.storage,
+            "discord": self.discord,
+            "other": max(total - parse - self.storage - self.discord, 0.0),
+        }
+
+def begin(started: float = None) -> Trace:
+    """Start tracing the current task, e.g. when its message or interaction arrives."""
+    trace = Trace(started)
+    _current.set(trace)
+    return trace
+
+def current() -> Trace:
+    return _current.get()
+
+def mark_invoked():
+    """Called from before_invoke; starts a trace if the message hook didn't."""
+    trace = _current.get() or begin()
+    trace.invoked = time.perf_counter()
+    return trace
+
+# ─── Phase Timers ────────────────────────────────────────────────────────────
+def storage_call(func):
+    """Decorator adding the wrapped call's time to the running command's storage phase."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        trace = _current.get()
+        if trace is None or trace.depth:
+            return func(*args, **kwargs)
+        trace.depth += 1
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            trace.depth -= 1
+            trace.storage += time.perf_counter() - started
+    return wrapper
+
+def http_trace_config() -> aiohttp.TraceConfig:
+    """aiohttp hooks timing every Discord HTTP request into the running command's trace.
+
+    aiohttp calls them in the task that made the request, so the context
+    variable still points at that command's trace.
+    """
+    async def on_request_start(session, context, params):
+        context.started = time.perf_counter()
+
+    async def on_request_end(session, context, params):
+        trace = _current.get()
+        if trace is not None:
+            trace.discord += time.perf_counter() - context.started
+
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(on_request_start)
+    config.on_request_end.append(on_request_end)
+    config.on_request_exception.append(on_request_end)
+    return config
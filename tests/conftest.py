@@ -0,0 +1,15 @@
+import os
+import tempfile
+
+# Storage paths are read when bot.config_loader is imported, so point them at a scratch
+# directory before any test imports the bot; nothing here touches the repo's own data
+_scratch = tempfile.mkdtemp(prefix="bot-tests-")
+os.environ.update(
+    DATA_DIR=os.path.join(_scratch, "data"),
+    SQLITE_PATH=os.path.join(_scratch, "bot.db"),
+    STORAGE_BACKEND="json",
+    SAVE_DELAY="60",
+    SHARD_COUNT="",
+    SHARD_IDS="",
+    LOG_LEVEL="WARNING",
+)
@@ -0,0 +1,36 @@
+from bot import config_loader
+from bot.utils.persistence import atomic_write_json, locked_update_json
+
+
+def test_cluster_worker_sees_timezone_set_by_another_worker(tmp_path, monkeypatch):
+    path = str(tmp_path / "config.json")
+    atomic_write_json(path, {"channels": {}, "server_offsets": {}, "user_timezones": {}})
+    monkeypatch.setattr(config_loader, "CONFIG_PATH", path)
+    monkeypatch.setattr(config_loader, "CLUSTER_MODE", True)
+    monkeypatch.setattr(config_loader, "CONFIG_RELOAD_SECONDS", 0)
+
+    config = config_loader.BotConfig()
+    channels = config.channels
+    assert config.user_timezone("42") is None
+
+    # Another worker merges its own changes into the shared file
+    changes = {("user_timezones", "42"): "Europe/Berlin", ("channels", "7"): 99}
+    locked_update_json(path, lambda data: config_loader._apply_config_changes(data, changes))
+
+    assert config.user_timezone("42") == "Europe/Berlin"
+    assert channels == {"7": 99}
+
+
+def test_cluster_worker_keeps_its_unwritten_changes(tmp_path, monkeypatch):
+    path = str(tmp_path / "config.json")
+    atomic_write_json(path, {"user_timezones": {}})
+    monkeypatch.setattr(config_loader, "CONFIG_PATH", path)
+    monkeypatch.setattr(config_loader, "CLUSTER_MODE", True)
+    monkeypatch.setattr(config_loader, "CONFIG_RELOAD_SECONDS", 0)
+    monkeypatch.setattr(config_loader, "_config_changes", {("user_timezones", "1"): "Asia/Tokyo"})
+
+    config = config_loader.BotConfig()
+    config.data["user_timezones"]["1"] = "Asia/Tokyo"
+    locked_update_json(path, lambda data: config_loader._apply_config_changes(data, {("user_timezones", "2"): "UTC"}))
+
+    assert config.user_timezone("1") == "Asia/Tokyo"
@@ -0,0 +1,90 @@
+import asyncio
+
+import aiohttp
+import discord
+
+from bot.utils import dispatcher
+from bot.utils.clock import SimulatedClock
+
+
+class FlakyChannel:
+    id = 1
+
+    def __init__(self, failures):
+        self.failures = list(failures)
+        self.attempts = 0
+        self.sent = []
+
+    async def send(self, **kwargs):
+        self.attempts += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        self.sent.append(kwargs)
+
+
+def test_transient_failures_are_retried_until_delivered(monkeypatch):
+    monkeypatch.setattr(dispatcher, "RETRY_BACKOFF", 0.01)
+    channel = FlakyChannel([discord.RateLimited(0.01), aiohttp.ClientError("reset"), asyncio.TimeoutError()])
+
+    async def run():
+        announcer = dispatcher.Announcer()
+        assert await announcer.send(channel, content="hi")
+        return announcer
+
+    announcer = asyncio.run(run())
+    assert channel.attempts == 4 and channel.sent == [{"content": "hi"}]
+    assert (announcer.sent, announcer.failed) == (1, 0)
+
+
+def test_sends_give_up_once_the_retry_window_is_spent(monkeypatch):
+    monkeypatch.setattr(dispatcher, "RETRY_BACKOFF", 0.01)
+    monkeypatch.setattr(dispatcher, "RETRY_TIMEOUT", 0.05)
+    channel = FlakyChannel([aiohttp.ClientError("down")] * 1000)
+
+    async def run():
+        announcer = dispatcher.Announcer()
+        delivered = []
+        announcer.submit(channel, content="first", on_sent=lambda: delivered.append("first"))
+        announcer.submit(channel, content="second", on_sent=lambda: delivered.append("second"))
+        await asyncio.wait_for(announcer.drain(), 1)
+        return announcer, delivered
+
+    announcer, delivered = asyncio.run(run())
+    assert delivered == [] and announcer.failed == 2
+    assert 1 < channel.attempts < 1000
+
+
+def test_permanent_errors_are_not_retried():
+    class Response:
+        status = 403
+        reason = "Forbidden"
+
+    channel = FlakyChannel([discord.Forbidden(Response(), "Missing Access")])
+
+    async def run():
+        return await dispatcher.Announcer().send(channel, content="hi")
+
+    assert asyncio.run(run()) is False
+    assert channel.attempts == 1
+
+
+def test_batches_go_out_when_the_coalesce_window_closes_on_the_simulated_clock():
+    channel = FlakyChannel([])
+    clock = SimulatedClock(1000)
+
+    async def run():
+        announcer = dispatcher.Announcer(coalesce_window=2, clock=clock)
+        sent_at = []
+        announcer.announce(channel, "a", due_at=1000, on_sent=lambda: sent_at.append(clock.time()))
+        clock.advance_to(1001)
+        announcer.announce(channel, "b", due_at=1001)
+        await asyncio.sleep(0)
+        assert channel.sent == []
+
+        clock.advance_to(clock.next_timer())
+        await asyncio.gather(*announcer.pending)
+        return announcer, sent_at
+
+    announcer, sent_at = asyncio.run(run())
+    assert channel.sent == [{"content": None, "embeds": ["a", "b"]}]
+    assert sent_at == [1002] and announcer.saved == 1
@@ -0,0 +1,108 @@
+import csv
+import datetime
+import io
+import json
+
+import pytest
+
+from bot.utils.event_files import export_events, exportable_events, parse_event_file
+from bot.utils.models import Event
+
+# Monday 2024-01-01 00:00 UTC
+MONDAY = 1704067200
+
+
+def schedule():
+    countdown_at = datetime.datetime.fromtimestamp(MONDAY + 3600, datetime.timezone.utc).isoformat()
+    fired_at = datetime.datetime.fromtimestamp(MONDAY - 3600, datetime.timezone.utc).isoformat()
+    return [
+        Event("Raid, big", info="Bring\npotions", day="Wednesday", time="20:00", id=1, guild_id="9",
+              auto_delete=True),
+        Event("Boss", type="countdown", timestamp=countdown_at, id=2, guild_id="9"),
+        Event("Gone", type="countdown", timestamp=fired_at, id=3, guild_id="9"),
+        Event("Broken", day="Funday", time="10:00", id=4, guild_id="9"),
+    ]
+
+# ─── Reading ─────────────────────────────────────────────────────────────────
+def test_json_accepts_a_list_or_an_events_object():
+    fmt, rows = parse_event_file("x.json", '[{"Name": " Raid ", "day": "monday", "time": "20:00", "autodelete": true}]')
+
+    assert fmt == "json"
+    assert rows[0]["row"] == 1 and rows[0]["name"] == "Raid" and rows[0]["autodelete"] is True
+    assert rows[0]["info"] == "" and rows[0]["duration"] is None
+    assert parse_event_file("x.json", '{"events": []}') == ("json", [])
+    with pytest.raises(ValueError):
+        parse_event_file("x.json", '{"name": "Raid"}')
+
+
+def test_csv_rows_are_numbered_by_line_and_blank_lines_skipped():
+    text = "Type,Name,Duration,AutoDelete\ncountdown,Boss,1d 02:30,yes\n,,,\nweekly,Raid,,no\n"
+    fmt, rows = parse_event_file("x.csv", text)
+
+    assert fmt == "csv"
+    assert [(r["row"], r["type"], r["name"], r["autodelete"]) for r in rows] == [
+        (2, "countdown", "Boss", True), (4, "weekly", "Raid", False)]
+    with pytest.raises(ValueError):
+        parse_event_file("x.csv", "day,time\nMonday,10:00\n")
+
+
+def test_format_is_sniffed_when_the_extension_is_unknown():
+    assert parse_event_file("upload", "[]")[0] == "json"
+    assert parse_event_file("upload.txt", "BEGIN:VCALENDAR\r\nEND:VCALENDAR\r\n")[0] == "ics"
+    assert parse_event_file("upload", "name\nRaid\n")[0] == "csv"
+
+
+def test_ics_reads_unfolded_escaped_lines_and_rejects_what_it_cannot_schedule():
+    text = ("BEGIN:VCALENDAR\r\n"
+            "BEGIN:VEVENT\r\nDTSTART;TZID=Europe/Berlin:20240101T180000\r\nRRULE:FREQ=WEEKLY\r\n"
+            "SUMMARY:Harvest\\, \r\n big\r\nDESCRIPTION:one\\ntwo\r\nX-AUTO-DELETE:TRUE\r\nEND:VEVENT\r\n"
+            "BEGIN:VEVENT\r\nDTSTART;VALUE=DATE:20240101\r\nSUMMARY:All day\r\nEND:VEVENT\r\n"
+            "BEGIN:VEVENT\r\nDTSTART:20240101T180000Z\r\nRRULE:FREQ=DAILY\r\nSUMMARY:Daily\r\nEND:VEVENT\r\n"
+            "END:VCALENDAR\r\n")
+    fmt, (weekly, all_day, daily) = parse_event_file("cal.ics", text)
+
+    assert fmt == "ics"
+    assert weekly["type"] == "weekly" and weekly["name"] == "Harvest, big" and weekly["info"] == "one\ntwo"
+    assert weekly["autodelete"] is True
+    assert weekly["at"] == datetime.datetime(2024, 1, 1, 17, tzinfo=datetime.timezone.utc)
+    assert all_day["error"] == "All-day events have no start time"
+    assert daily["error"] == "Only plain weekly recurrence (RRULE:FREQ=WEEKLY) is supported"
+
+# ─── Writing ─────────────────────────────────────────────────────────────────
+def test_json_export_round_trips_and_skips_fired_and_unreadable_events():
+    data = json.loads(export_events(schedule(), "json", "9", 0, MONDAY))
+
+    assert [e["name"] for e in data["events"]] == ["Raid, big", "Boss"]
+    fmt, rows = parse_event_file("x.json", json.dumps(data))
+    raid, boss = rows
+    assert (raid["type"], raid["day"], raid["time"], raid["info"], raid["autodelete"]) == (
+        "weekly", "Wednesday", "20:00", "Bring\npotions", True)
+    assert datetime.datetime.fromisoformat(boss["at"]).timestamp() == MONDAY + 3600
+
+
+def test_csv_export_has_a_bom_for_excel_and_round_trips():
+    data = export_events(schedule(), "csv", "9", 0, MONDAY)
+
+    assert data.startswith("﻿".encode())
+    text = data.decode("utf-8-sig")
+    assert next(csv.reader(io.StringIO(text))) == ["type", "name", "info", "day", "time", "at", "autodelete"]
+    _, rows = parse_event_file("x.csv", text)
+    assert [(r["type"], r["name"], r["day"], r["autodelete"]) for r in rows] == [
+        ("weekly", "Raid, big", "Wednesday", True), ("countdown", "Boss", None, False)]
+
+
+def test_ics_export_starts_weekly_events_at_their_next_occurrence_in_server_time():
+    data = export_events(schedule(), "ics", "9", 60, MONDAY).decode()
+
+    assert all(len(line.encode()) <= 75 for line in data.split("\r\n"))
+    assert "UID:9-1@mmorts-discord-bot" in data and "UID:9-3@" not in data
+    _, (raid, boss) = parse_event_file("x.ics", data)
+    # Wednesday 20:00 at UTC+1 is 19:00 UTC
+    assert raid["type"] == "weekly" and raid["at"] == datetime.datetime(2024, 1, 3, 19, tzinfo=datetime.timezone.utc)
+    assert (raid["name"], raid["info"], raid["autodelete"]) == ("Raid, big", "Bring\npotions", True)
+    assert boss["type"] == "countdown" and boss["at"].timestamp() == MONDAY + 3600
+
+
+def test_exportable_events_are_the_ones_written():
+    assert [e.name for e in exportable_events(schedule(), MONDAY)] == ["Raid, big", "Boss"]
+    assert [e.name for e in exportable_events(schedule(), MONDAY + 7200)] == ["Raid, big"]
@@ -0,0 +1,140 @@
+import datetime
+import random
+
+from bot.utils.models import Event, GuildEvents, GuildTips, MINUTES_PER_WEEK
+
+# Monday 2024-01-01 00:00 UTC
+MONDAY = 1704067200
+WEEK = MINUTES_PER_WEEK * 60
+
+
+def countdown(name, epoch, **kwargs):
+    at = datetime.datetime.fromtimestamp(epoch, datetime.timezone.utc)
+    return Event(name, type="countdown", timestamp=at.isoformat(), **kwargs)
+
+# ─── Event ───────────────────────────────────────────────────────────────────
+def test_event_round_trips_through_dict_with_unknown_keys():
+    data = {"id": 3, "guild_id": "1", "type": "normal", "day": "Monday", "time": "20:00", "name": "Raid",
+            "info": "Big", "auto_delete": True, "last_fired": 123.0, "colour": "red"}
+    e = Event.from_dict(data)
+
+    assert e.to_dict() == data
+    assert e.minute_of_week == 20 * 60 and (e.hour, e.minute) == (20, 0)
+
+
+def test_legacy_rows_without_a_type_are_weekly():
+    e = Event.from_dict({"name": "Raid", "day": "tuesday", "time": "07:05"})
+
+    assert e.kind == "normal" and not e.is_countdown
+    assert e.minute_of_week == 24 * 60 + 7 * 60 + 5
+    assert "type" not in e.to_dict()
+
+
+def test_unreadable_times_leave_derived_fields_empty():
+    assert Event("x", day="Funday", time="10:00").minute_of_week is None
+    assert Event("x", day="Monday", time="25:00").minute_of_week is None
+    assert Event("x", type="countdown", timestamp="soon").fire_epoch is None
+
+
+def test_weekly_next_and_last_fire_in_server_time():
+    e = Event("Raid", day="Monday", time="20:00")
+
+    assert e.next_fire_epoch(MONDAY) == MONDAY + 20 * 3600
+    assert e.last_fire_epoch(MONDAY) == MONDAY + 20 * 3600 - WEEK
+    # Server time one hour ahead of UTC: Monday 20:00 there is 19:00 UTC
+    assert e.next_fire_epoch(MONDAY, 60) == MONDAY + 19 * 3600
+
+
+def test_weekly_occurrence_is_last_at_its_instant_and_next_a_week_on():
+    e = Event("Raid", day="Monday", time="20:00")
+    at = MONDAY + 20 * 3600
+
+    assert e.last_fire_epoch(at) == at
+    assert e.next_fire_epoch(at) == at + WEEK
+
+
+def test_countdown_fire_epochs():
+    e = countdown("Boss", MONDAY + 90)
+
+    assert e.next_fire_epoch(MONDAY + 1000) == MONDAY + 90
+    assert e.last_fire_epoch(MONDAY) is None
+    assert e.last_fire_epoch(MONDAY + 90) == MONDAY + 90
+
+# ─── GuildEvents ─────────────────────────────────────────────────────────────
+def test_ids_are_assigned_past_every_stored_id_and_never_reused():
+    events = GuildEvents([Event("a", id=5, day="Monday", time="10:00"), Event("b", day="Monday", time="11:00")])
+
+    assert [e.id for e in events] == [5, 6]
+    events.remove(events.get(6))
+    assert events.add(Event("c", day="Monday", time="12:00")).id == 7
+
+
+def test_sorted_views_follow_edits():
+    events = GuildEvents([
+        Event("late", day="Sunday", time="23:00"),
+        Event("early", day="Monday", time="01:00"),
+        Event("mid", day="Wednesday", time="12:00"),
+        countdown("second", MONDAY + 200),
+        countdown("first", MONDAY + 100),
+    ])
+    names = lambda items: [e.name for e in items]
+
+    assert names(events.weekly) == ["early", "mid", "late"]
+    assert names(events.weekly_between(0, 3 * 24 * 60)) == ["early", "mid"]
+    assert names(events.weekly_after(24 * 60)) == ["mid", "late", "early"]
+    assert events.next_weekly(MINUTES_PER_WEEK - 1).name == "early"
+    assert names(events.countdowns_between(MONDAY + 150)) == ["second"]
+    assert events.next_countdown(MONDAY + 100).name == "second"
+
+    version = events.version
+    events.set_weekly(events.named("EARLY")[0], "Saturday", 9, 30)
+    assert names(events.weekly) == ["mid", "early", "late"]
+    events.set_timestamp(events.named("first")[0], datetime.datetime.fromtimestamp(MONDAY + 300, datetime.timezone.utc))
+    assert names(events.countdowns) == ["second", "first"]
+    assert events.version > version
+
+
+def test_removal_updates_name_index_and_autocomplete():
+    events = GuildEvents([Event("Raid", day="Monday", time="10:00"), Event("raid", day="Friday", time="10:00")])
+
+    assert len(events.named("RAID")) == 2
+    removed = events.remove_where(lambda e: e.day == "Monday")
+    assert [e.name for e in removed] == ["Raid"]
+    assert events.names.search("ra") == ["Raid"]
+    events.remove(events.named("raid")[0])
+    assert events.named("raid") == [] and events.names.search("ra") == []
+
+# ─── GuildTips ───────────────────────────────────────────────────────────────
+def test_every_tip_goes_out_once_per_cycle_without_back_to_back_repeats():
+    random.seed(1)
+    tips = GuildTips(["a", "b", "c", "d"])
+    served = [tips.next_tip() for _ in range(40)]
+
+    for cycle in range(0, 40, 4):
+        assert sorted(served[cycle:cycle + 4]) == ["a", "b", "c", "d"]
+    assert all(x != y for x, y in zip(served, served[1:]))
+
+
+def test_tip_added_mid_cycle_is_served_in_that_cycle():
+    random.seed(2)
+    tips = GuildTips(["a", "b", "c"])
+    first = [tips.next_tip(), tips.next_tip()]
+    tips.add("d")
+
+    assert sorted(first + [tips.next_tip(), tips.next_tip()]) == ["a", "b", "c", "d"]
+
+
+def test_removing_a_tip_keeps_the_rotation_pointing_at_the_rest():
+    tips = GuildTips(["a", "b", "c", "d"], bag=[2, 0, 3, 1], served=2)  # c and a already went out
+
+    assert tips.remove_at(0) == "a"
+    assert tips.rotation() == {"bag": [1, 2, 0], "served": 1}
+    assert [tips.next_tip(), tips.next_tip()] == ["d", "b"]
+
+
+def test_stale_rotation_starts_a_fresh_cycle():
+    tips = GuildTips(["a", "b"], bag=[0, 1, 2], served=1)
+
+    assert tips.served == len(tips)
+    assert {tips.next_tip(), tips.next_tip()} == {"a", "b"}
+    assert GuildTips().next_tip() is None
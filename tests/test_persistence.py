@@ -0,0 +1,113 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from bot.utils.persistence import BatchWriter, JsonWriter, WriteBehind, atomic_write_json, locked_update_json
+
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+# ─── Atomic File Write ───────────────────────────────────────────────────────
+def test_atomic_write_replaces_the_file_and_leaves_no_temp_files(tmp_path):
+    path = str(tmp_path / "nested" / "data.json")
+    atomic_write_json(path, {"a": 1})
+    atomic_write_json(path, {"a": 2, "ü": "ß"})
+
+    assert read(path) == {"a": 2, "ü": "ß"}
+    assert os.listdir(tmp_path / "nested") == ["data.json"]
+
+
+def test_failed_atomic_write_keeps_the_old_contents(tmp_path):
+    path = str(tmp_path / "data.json")
+    atomic_write_json(path, {"a": 1})
+
+    with pytest.raises(TypeError):
+        atomic_write_json(path, {"a": object()})
+    assert read(path) == {"a": 1}
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_locked_update_merges_into_the_current_file(tmp_path):
+    path = str(tmp_path / "config.json")
+    locked_update_json(path, lambda data: data.update(a=1))
+    locked_update_json(path, lambda data: data.update(b=2))
+
+    assert read(path) == {"a": 1, "b": 2}
+
+# ─── Write-Behind Writers ────────────────────────────────────────────────────
+def test_without_a_loop_saves_are_written_inline(tmp_path):
+    path = str(tmp_path / "data.json")
+    writer = JsonWriter(path, 60)
+    writer.mark_dirty(lambda: {"a": 1})
+
+    assert read(path) == {"a": 1}
+    assert not writer.pending
+
+
+def test_saves_within_the_delay_coalesce_into_one_write_of_the_latest_state(tmp_path):
+    path = str(tmp_path / "data.json")
+    state = {"n": 0}
+    snapshots = []
+
+    def snapshot():
+        snapshots.append(dict(state))
+        return dict(state)
+
+    async def run():
+        writer = JsonWriter(path, 0.01)
+        for n in range(1, 4):
+            state["n"] = n
+            writer.mark_dirty(snapshot)
+        assert writer.pending and not os.path.exists(path)
+        await asyncio.sleep(0.05)
+        await writer.task
+        assert not writer.pending
+
+    asyncio.run(run())
+    assert snapshots == [{"n": 3}]
+    assert read(path) == {"n": 3}
+
+
+def test_merging_writer_folds_changes_into_the_file(tmp_path):
+    path = str(tmp_path / "config.json")
+    atomic_write_json(path, {"channels": {"1": 10}})
+
+    async def run():
+        writer = JsonWriter(path, 60, merge=lambda current, changes: current["channels"].update(changes))
+        writer.mark_dirty(lambda: {"2": 20})
+        await writer.flush()
+
+    asyncio.run(run())
+    assert read(path) == {"channels": {"1": 10, "2": 20}}
+
+
+def test_batch_writer_writes_on_the_loop_and_survives_failures():
+    batches = []
+
+    def write(batch):
+        if batch == "bad":
+            raise RuntimeError("disk full")
+        batches.append(batch)
+
+    async def run():
+        writer = BatchWriter("batch", 60, write)
+        writer.mark_dirty(lambda: "bad")
+        await writer.flush()
+        writer.mark_dirty(lambda: "good")
+        await writer.flush()
+        assert not writer.pending
+
+    asyncio.run(run())
+    assert batches == ["good"]
+
+
+def test_write_behind_subclasses_must_implement_write():
+    class NoWrite(WriteBehind):
+        pass
+
+    with pytest.raises(TypeError):
+        NoWrite("nothing", 1)
@@ -0,0 +1,27 @@
+from bot.utils.prefix_index import PrefixIndex
+
+
+def test_search_is_case_insensitive_and_in_key_order():
+    index = PrefixIndex([("Raid", "Raid"), ("rally", "Rally"), ("Boss", "Boss")])
+
+    assert index.search("RA") == ["Raid", "Rally"]
+    assert index.search("b") == ["Boss"]
+    assert index.search("x") == []
+    assert index.search("") == ["Boss", "Raid", "Rally"]
+
+
+def test_search_returns_each_value_once_and_honours_the_limit():
+    index = PrefixIndex([("asia/tokyo", "Asia/Tokyo"), ("tokyo", "Asia/Tokyo"), ("asia/seoul", "Asia/Seoul")])
+    index.add("asia/shanghai", "Asia/Shanghai")
+
+    assert index.search("asia/") == ["Asia/Seoul", "Asia/Shanghai", "Asia/Tokyo"]
+    assert index.search("asia/", limit=2) == ["Asia/Seoul", "Asia/Shanghai"]
+    assert index.search("tok") == ["Asia/Tokyo"]
+
+
+def test_remove_drops_only_the_exact_key():
+    index = PrefixIndex([("raid", "Raid"), ("raid", "RAID"), ("raids", "Raids")])
+    index.remove("Raid")
+
+    assert len(index) == 1
+    assert index.search("raid") == ["Raids"]
@@ -0,0 +1,57 @@
+from bot.utils.scheduler import DueQueue
+
+
+def test_pop_due_returns_keys_in_fire_order():
+    queue = DueQueue()
+    queue.schedule("b", 20.0)
+    queue.schedule("a", 10.0)
+    queue.schedule("c", 30.0)
+
+    assert queue.peek() == 10.0
+    assert queue.pop_due(20.0) == [("a", 10.0), ("b", 20.0)]
+    assert len(queue) == 1 and "c" in queue
+    assert queue.pop_due(29.9) == []
+    assert queue.peek() == 30.0
+
+
+def test_keys_due_at_the_same_instant_pop_in_schedule_order():
+    queue = DueQueue()
+    for key in ("x", "y", "z"):
+        queue.schedule(key, 5.0)
+
+    assert [key for key, _ in queue.pop_due(5.0)] == ["x", "y", "z"]
+
+
+def test_rescheduling_replaces_the_old_entry():
+    queue = DueQueue()
+    queue.schedule("a", 10.0)
+    queue.schedule("a", 50.0)
+
+    assert len(queue) == 1
+    assert queue.when("a") == 50.0
+    assert queue.pop_due(10.0) == []
+    assert queue.pop_due(50.0) == [("a", 50.0)]
+
+
+def test_cancelled_keys_never_pop():
+    queue = DueQueue()
+    queue.schedule("a", 10.0)
+    queue.schedule("b", 20.0)
+    queue.cancel("a")
+    queue.cancel("missing")
+
+    assert "a" not in queue and queue.when("a") is None
+    assert queue.peek() == 20.0
+    assert queue.pop_due(100.0) == [("b", 20.0)]
+    assert queue.peek() is None and len(queue) == 0
+
+
+def test_heap_is_compacted_after_many_cancels():
+    queue = DueQueue()
+    for i in range(200):
+        queue.schedule(i, float(i))
+    for i in range(150):
+        queue.cancel(i)
+
+    assert len(queue._heap) < 200
+    assert queue.pop_due(1000.0) == [(i, float(i)) for i in range(150, 200)]
@@ -0,0 +1,62 @@
+import asyncio
+
+from bot.utils import storage
+from bot.utils.guild_cache import GuildCache
+from bot.utils.models import Event, GuildEvents
+
+
+class FakeDb:
+    def __init__(self):
+        self.ledger_writes = []
+        self.due_writes = []
+
+    def update_event_data(self, events):
+        self.ledger_writes.append([e.name for e in events])
+
+    def update_due_index(self, dues, scopes):
+        self.due_writes.append((dues, scopes))
+
+
+def test_guild_with_unwritten_fire_ledger_stays_resident(monkeypatch):
+    db = FakeDb()
+    monkeypatch.setattr(storage, "get_db", lambda: db)
+
+    async def run():
+        cache = GuildCache(lambda gid: GuildEvents(), 1, is_pinned=storage.events_pending)
+        fired = Event("Raid", day="Monday", time="20:00", guild_id="1", last_fired=1000.0)
+        fired.row_id = 7
+        cache["1"].add(fired)
+        storage.record_fires(cache, "1", [fired])
+        assert storage.events_pending("1")
+
+        # Paging another guild in must not drop the copy holding the newer last_fired
+        cache["2"]
+        assert "1" in cache and cache["1"].get(fired.id) is fired
+
+        await storage._ledger_writer.flush()
+        assert db.ledger_writes == [["Raid"]]
+        assert not storage.events_pending("1")
+        cache["3"]
+        assert "1" not in cache
+
+    asyncio.run(run())
+
+
+def test_due_index_changes_are_written_in_one_sqlite_batch(monkeypatch):
+    db = FakeDb()
+    monkeypatch.setattr(storage, "get_db", lambda: db)
+
+    async def run():
+        due_index = {"3": 50.0}
+        storage.set_guild_due(due_index, "1", 100.0)
+        storage.set_guild_due(due_index, "2", 200.0)
+        storage.set_guild_due(due_index, "1", 150.0)
+        storage.set_guild_due(due_index, "3", None)
+        storage.save_due_index(due_index)
+        assert due_index == {"1": 150.0, "2": 200.0}
+        assert db.due_writes == []  # nothing on the hot path
+
+        await storage._due_batch_writer.flush()
+        assert db.due_writes == [({"1": 150.0, "2": 200.0, "3": None}, {storage.SHARD_LABEL})]
+
+    asyncio.run(run())